@@ -23,12 +23,38 @@ SET mydir=%date:~10,4%-%date:~4,2%-%date:~7,2%-%hh%-%time:~3,2%-%time:~6,2%
 REM Path to the test cases or page objects directory
 SET REL_PATH=..\page_objects
 
+ECHO ============================================================
+ECHO === PREPARE: Precompile Locator / Test Data Index
+ECHO ============================================================
+
+call python ..\utils\locator_index.py
+
+ECHO ============================================================
+ECHO === PREPARE: Longest-First Suite Ordering From Past Runs
+ECHO ============================================================
+
+call python ..\utils\suite_scheduler.py order --processes 22 --output pabot_ordering.txt
+
+REM ============================================================
+REM === OPTIONAL: Headless Local Grid (set enabled = True in [local_grid] of config.ini)
+REM ============================================================
+REM start "local-grid" /B python ..\utils\local_grid.py start --nodes 22
+
+ECHO ============================================================
+ECHO === PREPARE: Test Run Record (per-suite / per-test results in MySQL)
+ECHO ============================================================
+
+SET TEST_RUN_ID=
+for /f %%i in ('python ..\utils\execution_listener.py start-run "OpenCart Regression"') do SET TEST_RUN_ID=%%i
+
 ECHO ============================================================
 ECHO === FIRST TEST ITERATION: Run All Test Cases
 ECHO ============================================================
 
 call pabot                                      ^
     --processes 22                              ^
+    --ordering pabot_ordering.txt               ^
+    --listener ..\utils\execution_listener.py   ^
     --log log_1.html                            ^
     --report NONE                               ^
     --output output_1.xml                       ^
@@ -50,6 +76,7 @@ call pabot
     --processes 22                                           ^
     --rerunfailed opencart-tests-reports%mydir%\output_1.xml ^
     --runemptysuite                                          ^
+    --listener ..\utils\execution_listener.py                ^
     --log log_2.html                                         ^
     --report NONE                                            ^
     --output output_2.xml                                    ^
@@ -76,6 +103,18 @@ call rebot                                     ^
     --merge                                    ^
     opencart-tests-reports%mydir%\output_*.xml
 
+IF DEFINED TEST_RUN_ID call python ..\utils\execution_listener.py end-run %TEST_RUN_ID%
+
+REM ============================================================
+REM === HISTORY: Record Suite/Test Durations For The Next Ordering
+REM ============================================================
+call python ..\utils\suite_scheduler.py record opencart-tests-reports%mydir%\output_1.xml
+
+REM ============================================================
+REM === OPTIONAL: Publish Artifacts (bucket / endpoint in [s3] of config.ini)
+REM ============================================================
+REM call python ..\test_results\s3_upload.py opencart-tests-reports%mydir%
+
 REM ============================================================
 REM === OPTIONAL: Clean Up Intermediate Output Files
 REM ============================================================
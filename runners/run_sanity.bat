@@ -16,6 +16,13 @@ set mydir=%date:~10,4%-%date:~4,2%-%date:~7,2%-%hh%-%time:~3,2%-%time:~6,2%
 
 SET REL_PATH=..\page_objects
 
+ECHO _
+ECHO ==========================================
+ECHO Precompiling locator / test data index...
+ECHO ==========================================
+
+call python ..\utils\locator_index.py
+
 ECHO _
 ECHO ========================
 ECHO First test iteration...
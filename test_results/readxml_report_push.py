@@ -0,0 +1,180 @@
+# test_results/readxml_report_push.py
+"""
+Push Robot Framework results from output.xml to the TestRunManager MySQL tables.
+
+The output is streamed with iterparse: each <test> is turned into a record as soon as its end
+tag is read, then removed from the tree, and records are inserted in batches. Memory therefore
+stays bounded by one test plus one batch, whatever the size of output.xml.
+
+Usage:
+    python test_results/readxml_report_push.py test_results/output.xml
+    python test_results/readxml_report_push.py output.xml --batch-size 1000 --run-id 42
+    python test_results/readxml_report_push.py output.xml --dry-run      # print records, no database
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+
+# Test case IDs written in documentation, e.g. "Test Case ID: TC_RF_001, TC_RF_002"
+TEST_CASE_ID_PATTERN = re.compile(r"\bTC_[A-Z0-9]+_\d+\b")
+
+DEFAULT_BATCH_SIZE = 500
+
+# Elements detached from the tree once their end tag has been processed
+_CONSUMED_TAGS = ("test", "kw", "suite", "for", "while", "if", "try", "group", "errors", "statistics")
+
+
+def _parse_time(value):
+    """Parse RF 7 ISO timestamps and RF <= 6 'YYYYMMDD HH:MM:SS.fff' timestamps."""
+    if not value or value == "N/A":
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y%m%d %H:%M:%S.%f")
+
+
+def _status_times(status):
+    """(status, start datetime, elapsed seconds) of a <status> element."""
+    start = _parse_time(status.get("start") or status.get("starttime"))
+    if status.get("elapsed") is not None:
+        elapsed = float(status.get("elapsed"))
+    else:
+        end = _parse_time(status.get("endtime"))
+        elapsed = (end - start).total_seconds() if start and end else None
+    return status.get("status"), start, elapsed
+
+
+def iter_test_records(output_xml):
+    """
+    Yield one record per test in output.xml, in execution order.
+
+    Yields:
+        dict: suite, name, long_name, status, start_time, elapsed_seconds, tags,
+              test_case_ids, message (kind == "test"). The top suite also yields a "run_start"
+              record when it opens and a "run" record with its status and timing when it ends.
+    """
+    elements = []     # open elements, so finished ones can be detached from their parent
+    suite_names = []  # names of the open suites
+
+    for event, element in ET.iterparse(output_xml, events=("start", "end")):
+        if event == "start":
+            # <statistics> also has <suite> elements; only executed suites count
+            is_suite = element.tag == "suite" and (not elements or elements[-1].tag in ("robot", "suite"))
+            elements.append(element)
+            if is_suite:
+                if not suite_names:
+                    yield {"kind": "run_start", "name": element.get("name", "")}
+                suite_names.append(element.get("name", ""))
+            continue
+
+        elements.pop()
+        parent = elements[-1] if elements else None
+
+        if element.tag == "test":
+            status, start, elapsed = _status_times(element.find("status"))
+            documentation = element.findtext("doc") or ""
+            tags = [tag.text for tag in element.findall("tag") + element.findall("tags/tag") if tag.text]
+            yield {
+                "kind": "test",
+                "suite": suite_names[-1] if suite_names else "",
+                "name": element.get("name", ""),
+                "long_name": ".".join(suite_names + [element.get("name", "")]),
+                "status": status,
+                "start_time": start,
+                "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+                "tags": tags,
+                "test_case_ids": sorted(set(TEST_CASE_ID_PATTERN.findall(documentation))),
+                "message": (element.find("status").text or "").strip(),
+            }
+        elif element.tag == "suite" and parent is not None and parent.tag in ("robot", "suite"):
+            name = suite_names.pop()
+            if not suite_names:
+                status, start, elapsed = _status_times(element.find("status"))
+                yield {
+                    "kind": "run",
+                    "name": name,
+                    "status": status,
+                    "start_time": start,
+                    "end_time": start + timedelta(seconds=elapsed) if start and elapsed is not None else None,
+                }
+
+        # Drop everything already consumed; suites keep only their still-open children
+        if parent is not None and element.tag in _CONSUMED_TAGS:
+            element.clear()
+            parent.remove(element)
+        elif parent is None:
+            element.clear()
+
+
+def push_results(output_xml, batch_size=DEFAULT_BATCH_SIZE, run_id=None, dry_run=False):
+    """
+    Stream output.xml and insert its test records in batches through TestRunManager.
+
+    Unless run_id is given, a test_execution_reports row is created when the top suite opens
+    and completed with the run's status and timing when it ends.
+
+    Returns:
+        dict: run_id plus test, pushed, passed, failed and skipped counts.
+    """
+    manager = None
+    if not dry_run:
+        from custom_library import TestRunManager
+        manager = TestRunManager()
+
+    create_run = run_id is None
+    counts = {"tests": 0, "pushed": 0, "PASS": 0, "FAIL": 0, "SKIP": 0}
+    batch = []
+
+    def flush():
+        if dry_run:
+            for record in batch:
+                print(json.dumps(record, default=str))
+        else:
+            counts["pushed"] += manager.save_test_results(run_id, batch)
+        batch.clear()
+
+    for record in iter_test_records(output_xml):
+        if record["kind"] == "run_start":
+            if create_run and not dry_run:
+                run_id = manager.insert_test_run(record["name"], status=manager.execution_status_start)
+            continue
+        if record["kind"] == "run":
+            if create_run and not dry_run:
+                manager.update_test_run(run_id, record["start_time"], record["end_time"], record["status"])
+            continue
+
+        counts["tests"] += 1
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+        batch.append(record)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    summary = {"run_id": run_id, "tests": counts["tests"], "pushed": counts["pushed"], "passed": counts["PASS"],
+               "failed": counts["FAIL"], "skipped": counts["SKIP"]}
+    print(f"Results summary: {summary}", file=sys.stderr if dry_run else sys.stdout)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream output.xml test results into MySQL.")
+    parser.add_argument("output_xml", nargs="?", default=os.path.join(os.path.dirname(__file__), "output.xml"))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--run-id", type=int, help="Attach results to an existing test_execution_reports id")
+    parser.add_argument("--dry-run", action="store_true", help="Print records as JSON lines instead of pushing")
+    options = parser.parse_args()
+
+    if not os.path.exists(options.output_xml) or not os.path.getsize(options.output_xml):
+        print(f"[ERROR] output.xml not found or empty: {options.output_xml}")
+        sys.exit(1)
+
+    push_results(options.output_xml, options.batch_size, options.run_id, options.dry_run)
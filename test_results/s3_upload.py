@@ -0,0 +1,203 @@
+# test_results/s3_upload.py
+"""
+Upload a run's artifacts (log.html, report.html, output.xml, screenshots) to S3 or any
+S3-compatible store (MinIO, Ceph, moto server, ...).
+
+    - Files are uploaded concurrently, and large files in parallel multipart chunks (TransferConfig).
+    - Text artifacts (.html, .xml, .json, ...) are gzip-compressed and stored with
+      Content-Encoding: gzip, so browsers still open log.html straight from the bucket.
+    - The SHA-256 of each file is stored in the object metadata; files whose hash matches the
+      object already in the bucket are skipped.
+
+Settings come from the [s3] section of configs/config.ini; credentials from the usual AWS
+chain (AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY in the environment or .env, ~/.aws, roles).
+
+Usage:
+    python test_results/s3_upload.py runners/opencart-tests-reports2025-06-01-10-00-00
+    python test_results/s3_upload.py results --prefix nightly/42 --endpoint-url http://localhost:9000
+    python test_results/s3_upload.py results --dry-run          # show what would be uploaded
+"""
+import os
+import sys
+import gzip
+import time
+import shutil
+import hashlib
+import argparse
+import mimetypes
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+
+from config_service import config_service
+
+MB = 1024 * 1024
+HASH_METADATA_KEY = "sha256"
+# Smaller files gain nothing from gzip (the header alone is ~20 bytes)
+MIN_COMPRESS_SIZE = 1024
+_READ_SIZE = MB
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_READ_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactUploader:
+    """Concurrent, hash-skipping uploader of a results directory to one bucket/prefix."""
+
+    def __init__(self, bucket=None, prefix=None, endpoint_url=None, config_file='config.ini'):
+        config_service.env()
+        settings = config_service.section("s3", config_file)
+
+        self.bucket = bucket or settings.get("bucket", "")
+        self.prefix = (prefix if prefix is not None else settings.get("prefix", "")).strip("/")
+        self.endpoint_url = endpoint_url or settings.get("endpoint_url") or None
+        self.file_workers = config_service.get_int("s3", "file_workers", fallback=4, name=config_file)
+        self.compress_extensions = {
+            extension.lower() if extension.startswith(".") else f".{extension.lower()}"
+            for extension in config_service.get_list("s3", "compress_extensions", fallback=[], name=config_file)
+        }
+        self.compress_level = config_service.get_int("s3", "compress_level", fallback=6, name=config_file)
+        if not self.bucket:
+            raise ValueError("No S3 bucket configured: set [s3] bucket in config.ini or pass --bucket")
+
+        max_concurrency = config_service.get_int("s3", "max_concurrency", fallback=8, name=config_file)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=config_service.get_int("s3", "multipart_threshold_mb", fallback=8, name=config_file) * MB,
+            multipart_chunksize=config_service.get_int("s3", "multipart_chunksize_mb", fallback=8, name=config_file) * MB,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+        # One client shared by all threads; enough pooled connections for every concurrent part
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            region_name=settings.get("region") or None,
+            config=Config(
+                max_pool_connections=self.file_workers * max_concurrency,
+                s3={"addressing_style": settings.get("addressing_style") or "auto"},
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            ),
+        )
+
+    def object_key(self, relative_path):
+        key = relative_path.replace(os.sep, "/")
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _remote_hash(self, key):
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["Metadata"].get(HASH_METADATA_KEY)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def _gzip_to_temp(self, path):
+        descriptor, temp_path = tempfile.mkstemp(suffix=".gz")
+        with os.fdopen(descriptor, "wb") as raw, open(path, "rb") as source:
+            # mtime=0 keeps the compressed bytes identical for identical input
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self.compress_level, mtime=0) as target:
+                shutil.copyfileobj(source, target, _READ_SIZE)
+        return temp_path
+
+    def upload_file(self, path, relative_path, dry_run=False):
+        """
+        Upload one file unless the bucket already holds the same content.
+
+        Returns:
+            dict: key, action ("uploaded", "skipped" or "dry-run"), size and sent bytes.
+        """
+        key = self.object_key(relative_path)
+        size = os.path.getsize(path)
+        sha256 = _file_sha256(path)
+        result = {"key": key, "size": size, "sent": 0}
+
+        if self._remote_hash(key) == sha256:
+            return {**result, "action": "skipped"}
+
+        compress = size >= MIN_COMPRESS_SIZE and os.path.splitext(path)[1].lower() in self.compress_extensions
+        extra_args = {
+            "Metadata": {HASH_METADATA_KEY: sha256},
+            "ContentType": mimetypes.guess_type(path)[0] or "application/octet-stream",
+        }
+        if compress:
+            extra_args["ContentEncoding"] = "gzip"
+        if dry_run:
+            return {**result, "action": "dry-run", "compress": compress}
+
+        upload_path = self._gzip_to_temp(path) if compress else path
+        try:
+            self.client.upload_file(upload_path, self.bucket, key, ExtraArgs=extra_args, Config=self.transfer_config)
+            return {**result, "action": "uploaded", "sent": os.path.getsize(upload_path)}
+        finally:
+            if compress:
+                os.remove(upload_path)
+
+    def upload_directory(self, results_dir, dry_run=False):
+        """
+        Upload every file under results_dir concurrently.
+
+        Returns:
+            dict: uploaded / skipped / failed counts, raw and sent bytes, elapsed seconds.
+        """
+        files = []
+        for root, _, names in os.walk(results_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                files.append((path, os.path.relpath(path, results_dir)))
+        # Largest first, so big multipart uploads do not start last
+        files.sort(key=lambda item: os.path.getsize(item[0]), reverse=True)
+
+        summary = {"files": len(files), "uploaded": 0, "skipped": 0, "failed": 0, "bytes": 0, "sent": 0}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.file_workers) as executor:
+            futures = {executor.submit(self.upload_file, path, relative, dry_run): relative for path, relative in files}
+            for future, relative in futures.items():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    summary["failed"] += 1
+                    print(f"[ERROR] {relative}: {e}")
+                    continue
+                summary["bytes"] += result["size"]
+                summary["sent"] += result["sent"]
+                summary["skipped" if result["action"] == "skipped" else "uploaded"] += 1
+                print(f"[{result['action'].upper()}] s3://{self.bucket}/{result['key']} "
+                      f"({result['size']} -> {result['sent']} bytes)")
+
+        summary["seconds"] = round(time.perf_counter() - started, 2)
+        return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload Robot Framework artifacts to S3 / an S3-compatible store.")
+    parser.add_argument("results_dir", help="Directory holding log.html, report.html, output.xml and screenshots")
+    parser.add_argument("--bucket", help="Overrides [s3] bucket")
+    parser.add_argument("--prefix", help="Overrides [s3] prefix; defaults to <prefix>/<results dir name>")
+    parser.add_argument("--endpoint-url", help="Overrides [s3] endpoint_url, e.g. http://localhost:9000 for MinIO")
+    parser.add_argument("--dry-run", action="store_true", help="Hash and compare only, do not upload")
+    options = parser.parse_args()
+
+    if not os.path.isdir(options.results_dir):
+        print(f"[ERROR] Results directory not found: {options.results_dir}")
+        sys.exit(1)
+
+    if options.prefix is None:
+        base_prefix = config_service.section("s3").get("prefix", "").strip("/")
+        run_name = os.path.basename(os.path.normpath(options.results_dir))
+        options.prefix = f"{base_prefix}/{run_name}" if base_prefix else run_name
+
+    uploader = ArtifactUploader(options.bucket, options.prefix, options.endpoint_url)
+    summary = uploader.upload_directory(options.results_dir, options.dry_run)
+    print(f"Upload summary: {summary}")
+    sys.exit(1 if summary["failed"] else 0)
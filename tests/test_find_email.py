@@ -0,0 +1,89 @@
+# tests/test_find_email.py
+"""
+Regression tests for the IMAP UID high-water mark of TestRunManager._find_email, run against
+the in-process mail sink (utils/mail_sink.py): a FETCH that fails must not hide the message it
+was meant to read from later lookups.
+
+Run:
+    python -m unittest discover -s tests
+"""
+import os
+import sys
+import smtplib
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+
+import mail_sink
+from imap_session import imap_sessions
+import custom_library
+
+ACCOUNT = "customer@example.com"
+LOGIN_LINK = "https://shop.example.com/index.php?route=account/login"
+REGISTRATION_EMAIL = (
+    f"From: shop@example.com\r\nTo: {ACCOUNT}\r\nSubject: Thank you for registering\r\n\r\n"
+    f"Your account has been created. Log in: {LOGIN_LINK}\r\n"
+)
+
+
+class FindEmailFailedFetchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.sink = mail_sink.MailSink().start()
+        environment = {"IMAP_SERVER": self.sink.imap_address, "IMAP_SSL": "False"}
+        patcher = mock.patch.dict(os.environ, environment)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.sink.stop)
+        self.addCleanup(imap_sessions.close_all)
+        self.addCleanup(custom_library.TestRunManager._imap_seen_uids.clear)
+
+        host, port = self.sink.smtp_address.split(":")
+        with smtplib.SMTP(host, int(port)) as smtp:
+            smtp.sendmail("shop@example.com", [ACCOUNT], REGISTRATION_EMAIL)
+        self.manager = custom_library.TestRunManager()
+
+    def _fail_first_fetch(self, failure):
+        """Make the sink's first UID FETCH fail: 'abort' drops the connection, 'no' answers NO."""
+        original = mail_sink._ImapHandler.do_UID
+        failures = []
+
+        def do_UID(handler, tag, args):
+            if str(args[0]).upper() == "FETCH" and not failures:
+                failures.append(tag)
+                if failure == "abort":
+                    return False
+                handler.send(f"{tag} NO FETCH failed\r\n")
+                return None
+            return original(handler, tag, args)
+
+        patcher = mock.patch.object(mail_sink._ImapHandler, "do_UID", do_UID)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return failures
+
+    def test_connection_abort_during_fetch_keeps_the_message(self):
+        failures = self._fail_first_fetch("abort")
+
+        self.assertIsNone(self.manager._find_email(ACCOUNT, "secret"))
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.manager._find_email(ACCOUNT, "secret")["link"], LOGIN_LINK)
+
+    def test_failed_fetch_keeps_the_message(self):
+        failures = self._fail_first_fetch("no")
+
+        self.assertIsNone(self.manager._find_email(ACCOUNT, "secret"))
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.manager._find_email(ACCOUNT, "secret")["link"], LOGIN_LINK)
+
+    def test_wait_for_email_finds_the_message_after_a_failed_fetch(self):
+        self._fail_first_fetch("abort")
+
+        result = self.manager.wait_for_email(ACCOUNT, "secret", timeout="10s")
+        self.assertTrue(result["found"])
+        self.assertEqual(result["link"], LOGIN_LINK)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,30 +3,40 @@
 # ================================
 import os
 import time
+import asyncio
 import re
 import email
 import random
 import urllib3
 import datetime
-import imaplib
 import requests
 import email.utils
 import logging
+import threading
+import urllib.parse
 from urllib.parse import urljoin
-from configparser import ConfigParser
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # ================================
 # Third-Party Library Imports
 # ================================
-from pymongo import MongoClient
+from requests.adapters import HTTPAdapter
 from robot.api.deco import keyword
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 
 # ================================
 # Custom Libraries
 # ================================
-from custom_library import TestRunManager
+from config_service import config_service
 from env_loader import EnvConfigLoader
+import imap_session
+from imap_session import imap_sessions
+from lazy_import import LazyModule, LazyInstance
+
+# Imported on first use, not when Robot loads this library
+_pymongo = LazyModule("pymongo")
 
 # ================================
 # Initialization
@@ -37,9 +47,146 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # Set up a logger (you can configure this globally in your project)
 logger = logging.getLogger(__name__)
 
-# Initialize .env config and test manager
-env_config_loader = EnvConfigLoader()
-before_run = TestRunManager()
+# .env config and test manager, constructed on first use
+env_config_loader = LazyInstance(EnvConfigLoader)
+
+
+def _build_test_run_manager():
+    from custom_library import TestRunManager
+    return TestRunManager()
+
+
+before_run = LazyInstance(_build_test_run_manager)
+
+
+# ================================
+# Pooled HTTP Session
+# ================================
+# One requests.Session per process: every OpenCartAPI instance in a suite shares it,
+# and each pabot worker (a separate process) builds its own on first use.
+_session_lock = threading.Lock()
+_shared_session = None
+_shared_session_pid = None
+_pool_stats = {"checkouts": 0, "new_connections": 0}
+
+DEFAULT_HTTP_SESSION_SETTINGS = {
+    "pool_connections": 10,
+    "pool_maxsize": 20,
+    "pool_block": False,
+    "max_retries": 3,
+    "backoff_factor": 0.3,
+    "status_forcelist": (429, 500, 502, 503, 504),
+    "connect_timeout": 5.0,
+    "read_timeout": 30.0,
+}
+
+
+# Storefront customers created over HTTP (see OpenCartAPI.provision_customers)
+DEFAULT_PROVISIONING_SETTINGS = {
+    "email_domain": "example.com",
+    "concurrency": 5,
+    "addresses": 1,
+    "cart_products": (),
+    "country_id": "222",
+    "zone_id": "3563",
+    "city": "London",
+    "postcode": "SW1A 1AA",
+    "address_1": "1 Automation Street",
+}
+
+SESSION_COOKIE = "OCSESSID"
+
+
+class _CountingPoolMixin:
+    """Counts connection checkouts and fresh connections to derive pool hits/misses."""
+
+    def _get_conn(self, timeout=None):
+        with _session_lock:
+            _pool_stats["checkouts"] += 1
+        return super()._get_conn(timeout=timeout)
+
+    def _new_conn(self):
+        with _session_lock:
+            _pool_stats["new_connections"] += 1
+        return super()._new_conn()
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pool manager uses the counting connection pools."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _build_http_session(settings=None):
+    """
+    Build a keep-alive requests.Session with a sized connection pool and retry/backoff adapter.
+
+    Args:
+        settings (dict): Overrides for DEFAULT_HTTP_SESSION_SETTINGS.
+
+    Returns:
+        requests.Session: Session with the pooled adapter mounted for http and https.
+    """
+    options = {**DEFAULT_HTTP_SESSION_SETTINGS, **(settings or {})}
+
+    retry = Retry(
+        total=options["max_retries"],
+        backoff_factor=options["backoff_factor"],
+        status_forcelist=options["status_forcelist"],
+        # urllib3's default idempotent methods only: a retried POST (register, add to cart) could create duplicates
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = PooledHTTPAdapter(
+        pool_connections=options["pool_connections"],
+        pool_maxsize=options["pool_maxsize"],
+        pool_block=options["pool_block"],
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.verify = False
+    session.headers.update({"Connection": "keep-alive"})
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_shared_session(settings=None):
+    """
+    Return the process-wide pooled session, creating it on first use.
+    A session inherited through fork (different PID) is discarded and rebuilt.
+    """
+    global _shared_session, _shared_session_pid
+    with _session_lock:
+        if _shared_session is None or _shared_session_pid != os.getpid():
+            _shared_session = _build_http_session(settings)
+            _shared_session_pid = os.getpid()
+            _pool_stats.update(checkouts=0, new_connections=0)
+        return _shared_session
+
+
+def _close_shared_session():
+    """Close the process-wide session and release all pooled connections."""
+    global _shared_session, _shared_session_pid
+    with _session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+        _shared_session = None
+        _shared_session_pid = None
 
 
 # ================================
@@ -64,6 +211,8 @@ class OpenCartAPI:
         self.content_type = None
         self.form_data_content_type = None
         self.user_data = None
+        self.http_session_settings = dict(DEFAULT_HTTP_SESSION_SETTINGS)
+        self.provisioning_settings = dict(DEFAULT_PROVISIONING_SETTINGS)
 
         self.reg_user = {}
         self.login_credentials = {}
@@ -74,6 +223,16 @@ class OpenCartAPI:
         self.load_config()
         self.load_endpoints()
 
+    @property
+    def session(self):
+        """Process-wide pooled requests.Session shared by every OpenCartAPI instance."""
+        return _get_shared_session(self.http_session_settings)
+
+    @property
+    def timeout(self):
+        """(connect, read) timeout tuple applied to every request."""
+        return self.http_session_settings["connect_timeout"], self.http_session_settings["read_timeout"]
+
     def load_config(self):
         """Reads general configurations from 'config.ini'."""
         try:
@@ -83,11 +242,8 @@ class OpenCartAPI:
             if not os.path.exists(config_path):
                 raise FileNotFoundError(f"Config file not found: {config_path}")
 
-            config = ConfigParser()
-
-            # Force UTF-8 encoding to prevent decoding issues
-            with open(config_path, 'r', encoding='utf-8') as config_file:
-                config.read_file(config_file)
+            # Parsed once per process and shared (re-read only when the file changes)
+            config = config_service.ini(config_path)
 
             # Base URLs
             self.base_url = config.get('rest_api', 'base_url', fallback=None)
@@ -131,6 +287,40 @@ class OpenCartAPI:
             # }
             # print(self.user_data)
 
+            # HTTP Session Pool
+            if config.has_section('http_session'):
+                self.http_session_settings.update({
+                    "pool_connections": config.getint('http_session', 'pool_connections', fallback=10),
+                    "pool_maxsize": config.getint('http_session', 'pool_maxsize', fallback=20),
+                    "pool_block": config.getboolean('http_session', 'pool_block', fallback=False),
+                    "max_retries": config.getint('http_session', 'max_retries', fallback=3),
+                    "backoff_factor": config.getfloat('http_session', 'backoff_factor', fallback=0.3),
+                    "status_forcelist": tuple(
+                        int(code) for code in
+                        config.get('http_session', 'status_forcelist', fallback='429, 500, 502, 503, 504').split(',')
+                        if code.strip()
+                    ),
+                    "connect_timeout": config.getfloat('http_session', 'connect_timeout', fallback=5.0),
+                    "read_timeout": config.getfloat('http_session', 'read_timeout', fallback=30.0),
+                })
+
+            # Storefront Provisioning
+            if config.has_section('provisioning'):
+                self.provisioning_settings.update({
+                    "email_domain": config.get('provisioning', 'email_domain', fallback='example.com'),
+                    "concurrency": config.getint('provisioning', 'concurrency', fallback=5),
+                    "addresses": config.getint('provisioning', 'addresses', fallback=1),
+                    "cart_products": tuple(
+                        product.strip() for product in
+                        config.get('provisioning', 'cart_products', fallback='').split(',') if product.strip()
+                    ),
+                    "country_id": config.get('provisioning', 'country_id', fallback='222'),
+                    "zone_id": config.get('provisioning', 'zone_id', fallback='3563'),
+                    "city": config.get('provisioning', 'city', fallback='London'),
+                    "postcode": config.get('provisioning', 'postcode', fallback='SW1A 1AA'),
+                    "address_1": config.get('provisioning', 'address_1', fallback='1 Automation Street'),
+                })
+
             # Credentials
             self.login_credentials = {
                 "email_address": config.get('users', 'email_address', fallback=None),
@@ -170,11 +360,8 @@ class OpenCartAPI:
             if not os.path.exists(config_path):
                 raise FileNotFoundError(f"Config file not found: {config_path}")
 
-            config = ConfigParser()
-
-            # Force UTF-8 encoding to prevent decoding issues
-            with open(config_path, "r", encoding="utf-8") as file:
-                config.read_file(file)
+            # Parsed once per process and shared (re-read only when the file changes)
+            config = config_service.ini(config_path)
 
             self.api_endpoints = {
                 "POST": {
@@ -200,6 +387,16 @@ class OpenCartAPI:
                 },
                 "PUT": {
                     "set_password": config.get('API_PUT', 'set_password_url', fallback=None),
+                },
+                # OpenCart storefront form routes, used to provision customers without the UI
+                "STOREFRONT": {
+                    "register": config.get('STOREFRONT', 'register_url',
+                                           fallback='/index.php?route=account/register'),
+                    "login": config.get('STOREFRONT', 'login_url', fallback='/index.php?route=account/login'),
+                    "add_address": config.get('STOREFRONT', 'add_address_url',
+                                              fallback='/index.php?route=account/address/add'),
+                    "add_to_cart": config.get('STOREFRONT', 'add_to_cart_url',
+                                              fallback='/index.php?route=checkout/cart/add'),
                 }
             }
 
@@ -237,7 +434,7 @@ class OpenCartAPI:
                 'user_name': email_address,
                 'password': password
             }
-            response = requests.post(full_url, data=payload, verify=False)
+            response = self.session.post(full_url, data=payload, timeout=self.timeout)
 
             if response is None:
                 print("Error: No response received from server.")
@@ -260,7 +457,7 @@ class OpenCartAPI:
             full_url = urljoin(self.base_url, end_url)
             print("GET Request URL:", full_url)
             headers = headers or {'Content-Type': self.content_type}
-            response = requests.get(full_url, headers=headers, verify=False)
+            response = self.session.get(full_url, headers=headers, timeout=self.timeout)
             print("Response:", response)
             return response
         except requests.exceptions.RequestException as e:
@@ -273,7 +470,7 @@ class OpenCartAPI:
             # url = self.base_url + end_url
             full_url = urljoin(self.base_url, end_url)
             print("PUT Request URL:", full_url)
-            response = requests.put(full_url, json=payload, verify=False)
+            response = self.session.put(full_url, json=payload, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             assert "data updated successfully" == data.get("message", "")
@@ -292,7 +489,7 @@ class OpenCartAPI:
         try:
             payload = {"user_name": user, "password": password}
             headers = {"Content-Type": self.content_type, "Authorization": access_token}
-            response = requests.post(end_url, json=payload, headers=headers, verify=False)  # Pass headers explicitly
+            response = self.session.post(end_url, json=payload, headers=headers, timeout=self.timeout)  # Pass headers explicitly
             return response
         except Exception as e:
             print("Error in post_with_auth:", e)
@@ -314,7 +511,7 @@ class OpenCartAPI:
             headers = headers or {"Content-Type": self.content_type}
 
             print(f"POST Request to {url} with Payload: {payload}")
-            response = requests.post(url, json=payload, headers=headers, files=files, verify=False)
+            response = self.session.post(url, json=payload, headers=headers, files=files, timeout=self.timeout)
 
             if response.ok:
                 print(f"Success [{response.status_code}]: {response.text}")
@@ -335,7 +532,7 @@ class OpenCartAPI:
             payload = {"old_email_address": old_email_address, "new_email_address": new_email_address}
             headers = {"Content-Type": self.content_type}
 
-            response = requests.post(update_url, json=payload, headers=headers, verify=False)
+            response = self.session.post(update_url, json=payload, headers=headers, timeout=self.timeout)
 
             if response.ok:
                 print(f"email_address successfully updated in DB: {old_email_address} → {new_email_address}")
@@ -352,7 +549,7 @@ class OpenCartAPI:
     def retrieve_user_from_db(self, email_address):
         """Retrieves user details from MongoDB."""
         try:
-            client = MongoClient(self.mongodb_uri)
+            client = _pymongo.MongoClient(self.mongodb_uri)
             db = client[self.database_name]
             collection = db[self.collection_name]
             user_data = collection.find_one({"user_name": email_address})
@@ -364,7 +561,8 @@ class OpenCartAPI:
     def login_api_credentials_pass(self, email_address, password):
         try:
             payload = {"user_name": email_address, "password": password}
-            response = requests.post(self.base_url + self.api_endpoints["POST"]["login"], json=payload, verify=False)
+            response = self.session.post(self.base_url + self.api_endpoints["POST"]["login"], json=payload,
+                                         timeout=self.timeout)
             if response.status_code != 200:
                 print("Login failed.")
                 return response.status_code, None
@@ -377,38 +575,310 @@ class OpenCartAPI:
             print(f"Error: {e}")
             return None, None
 
+    def resolve_endpoint(self, method, endpoint):
+        """
+        Map an endpoint name to its path; paths ('/...') and full URLs ('http...') pass through.
+        Names are the [API_<METHOD>] option names of config_end_url.ini (e.g. 'customers_url')
+        or the keys of api_endpoints (e.g. 'customer').
+
+        Raises:
+            ValueError: For a name that is neither configured nor a path.
+        """
+        if endpoint.startswith(("/", "http://", "https://")):
+            return endpoint
+        config_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'configs', 'config_end_url.ini')
+        config = config_service.ini(os.path.abspath(config_path))
+        section = f"API_{method}"
+        path = (config.get(section, endpoint, fallback=None) if config.has_section(section) else None) \
+            or self.api_endpoints.get(method, {}).get(endpoint)
+        if not path:
+            raise ValueError(f"Unknown {method} endpoint '{endpoint}': not in [{section}] of config_end_url.ini "
+                             f"and not a path.")
+        return path
+
+    def _send_bulk_item(self, method, index, item):
+        """Send one bulk request and return its result record; never raises."""
+        if isinstance(item, str):
+            item = {"endpoint": item}
+
+        endpoint = self.resolve_endpoint(method, item.get("endpoint", ""))
+        full_url = urljoin(self.base_url, endpoint)
+        headers = item.get("headers") or {"Content-Type": self.content_type}
+        result = {"index": index, "endpoint": endpoint, "status_code": None, "ok": False,
+                  "body": None, "error": None, "elapsed_ms": None}
+
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, full_url, json=item.get("payload"), headers=headers,
+                                            timeout=self.timeout)
+            result["status_code"] = response.status_code
+            result["ok"] = response.ok
+            try:
+                result["body"] = response.json()
+            except ValueError:
+                result["body"] = response.text
+        except requests.exceptions.RequestException as e:
+            result["error"] = str(e)
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    async def _send_bulk(self, method, items, concurrency):
+        """Fan the items out over the shared session with at most `concurrency` requests in flight."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="opencart-bulk") as executor:
+            async def send(index, item):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, self._send_bulk_item, method, index, item)
+
+            # gather() keeps results in input order regardless of completion order
+            return await asyncio.gather(*(send(index, item) for index, item in enumerate(items)))
+
+    def send_many(self, method, items, concurrency=None):
+        """
+        Send many requests concurrently over the shared connection pool.
+
+        Args:
+            method (str): HTTP method applied to every item.
+            items (list): Endpoint names/paths, or dicts with 'endpoint' and optional 'payload' and 'headers'.
+            concurrency (int): Max requests in flight; defaults to the pool size so every request reuses a connection.
+
+        Returns:
+            list: One result dict per item, in input order, with status_code, body, error and elapsed_ms.
+
+        Raises:
+            ValueError: When an endpoint name is not configured (see `resolve_endpoint`).
+        """
+        method = method.upper()
+        items = list(items or [])
+        if not items:
+            return []
+        # Fail fast on a misspelt endpoint name instead of requesting it as a literal path
+        for item in items:
+            self.resolve_endpoint(method, item if isinstance(item, str) else item.get("endpoint", ""))
+
+        pool_maxsize = self.http_session_settings["pool_maxsize"]
+        concurrency = max(int(concurrency or pool_maxsize), 1)
+        if concurrency > pool_maxsize:
+            print(f"[WARNING] Concurrency {concurrency} exceeds pool_maxsize {pool_maxsize}; "
+                  f"extra connections will not be kept alive.")
+
+        started = time.perf_counter()
+        results = asyncio.run(self._send_bulk(method, items, concurrency))
+        elapsed = round(time.perf_counter() - started, 3)
+
+        failed = sum(1 for result in results if not result["ok"])
+        print(f"{method} x{len(results)} completed in {elapsed}s (concurrency={concurrency}, failed={failed})")
+        return results
+
+    @keyword("Get Many")
+    def get_many(self, items, concurrency=None):
+        """Concurrent GET over a list of endpoints; see `send_many`."""
+        return self.send_many("GET", items, concurrency)
+
+    @keyword("Post Many")
+    def post_many(self, items, concurrency=None):
+        """Concurrent POST over a list of endpoint+payload items; see `send_many`."""
+        return self.send_many("POST", items, concurrency)
+
+    @keyword("Get HTTP Pool Stats")
+    def get_http_pool_stats(self):
+        """
+        Returns connection pool counters for the shared HTTP session.
+        A hit is a request served on an already-open keep-alive connection; a miss opened a new one.
+        """
+        with _session_lock:
+            checkouts = _pool_stats["checkouts"]
+            misses = _pool_stats["new_connections"]
+        stats = {
+            "requests": checkouts,
+            "pool_hits": max(checkouts - misses, 0),
+            "pool_misses": misses,
+            "hit_ratio": round((checkouts - misses) / checkouts, 3) if checkouts else 0.0,
+            "pool_maxsize": self.http_session_settings["pool_maxsize"],
+        }
+        print(f"HTTP pool stats: {stats}")
+        return stats
+
+    @keyword("Close HTTP Session")
+    def close_http_session(self):
+        """Closes the shared HTTP session; the next request opens a fresh pool."""
+        _close_shared_session()
+        print("Shared HTTP session closed.")
+
+    # ================================
+    # Storefront Provisioning
+    # ================================
+    def _customer_session(self):
+        """A session with its own cookie jar (one OpenCart login each) on the shared keep-alive adapters."""
+        shared = self.session
+        session = requests.Session()
+        session.verify = False
+        session.headers.update(shared.headers)
+        for prefix, adapter in shared.adapters.items():
+            session.mount(prefix, adapter)
+        return session
+
+    @staticmethod
+    def _storefront_error(response):
+        """First form/alert error shown on a storefront page, or the status and URL."""
+        match = re.search(r'class="(?:text-danger|alert alert-danger[^"]*)"[^>]*>(?:\s*<i[^>]*></i>)?\s*([^<]+)',
+                          response.text)
+        return match.group(1).strip() if match else f"HTTP {response.status_code} at {response.url}"
+
+    def _storefront_post(self, session, endpoint, data, success_route=None):
+        """
+        POST a storefront form. OpenCart redirects to `success_route` when the form is accepted
+        and renders the form again (with its errors) when it is not.
+        """
+        url = urljoin(self.base_url, self.api_endpoints["STOREFRONT"][endpoint])
+        response = session.post(url, data=data, timeout=self.timeout)
+        if not response.ok:
+            raise RuntimeError(f"{endpoint}: HTTP {response.status_code}")
+        landed_on = urllib.parse.parse_qs(urllib.parse.urlparse(response.url).query).get("route")
+        if success_route and landed_on != [success_route]:
+            raise RuntimeError(f"{endpoint}: {self._storefront_error(response)}")
+        return response
+
+    def _provision_customer(self, index, tag, addresses, cart_products):
+        """Register one customer and add its addresses and cart items; never raises."""
+        settings = self.provisioning_settings
+        first_name = self.reg_user.get("first_name") or "automation"
+        last_name = self.reg_user.get("last_name") or "test"
+        customer = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": f"{first_name}.{last_name}.{tag}.{index}@{settings['email_domain']}".lower().replace(" ", ""),
+            "telephone": self.reg_user.get("telephone") or "0123456789",
+            "password": self.reg_user.get("password") or "Tester123!",
+            "session_cookie": None, "addresses": 0, "cart_items": 0,
+            "ok": False, "error": None, "elapsed_ms": None,
+        }
+        session = self._customer_session()
+        started = time.perf_counter()
+        try:
+            # Step 1: Register (OpenCart logs the new customer in on the same session)
+            self._storefront_post(session, "register", {
+                "firstname": first_name, "lastname": last_name, "email": customer["email"],
+                "telephone": customer["telephone"], "password": customer["password"],
+                "confirm": customer["password"], "newsletter": "0", "agree": "1",
+            }, success_route="account/success")
+
+            # Step 2: Address book entries (the first one becomes the default address)
+            for number in range(addresses):
+                self._storefront_post(session, "add_address", {
+                    "firstname": first_name, "lastname": last_name, "company": "",
+                    "address_1": settings["address_1"], "address_2": "", "city": settings["city"],
+                    "postcode": settings["postcode"], "country_id": settings["country_id"],
+                    "zone_id": settings["zone_id"], "default": "1" if number == 0 else "0",
+                }, success_route="account/address")
+                customer["addresses"] += 1
+
+            # Step 3: Cart items (the cart route answers with JSON)
+            for product_id in cart_products:
+                response = self._storefront_post(session, "add_to_cart", {"product_id": product_id, "quantity": "1"})
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = {"error": response.text[:200]}
+                if body.get("error"):
+                    raise RuntimeError(f"add_to_cart {product_id}: {body['error']}")
+                customer["cart_items"] += 1
+
+            customer["session_cookie"] = session.cookies.get(SESSION_COOKIE)
+            customer["ok"] = customer["session_cookie"] is not None
+            if not customer["ok"]:
+                customer["error"] = f"No {SESSION_COOKIE} cookie received"
+        except (requests.exceptions.RequestException, RuntimeError) as e:
+            customer["error"] = str(e)
+        customer["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return customer
+
+    @keyword("Provision Customers")
+    def provision_customers(self, count=1, addresses=None, cart_products=None, concurrency=None, record=True):
+        """
+        Create registered customers over HTTP instead of the UI registration flow.
+
+        Args:
+            count (int): Customers to create, `concurrency` at a time over the shared connection pool.
+            addresses (int): Address book entries per customer; defaults to [provisioning] addresses.
+            cart_products (list|str): Product ids put in each cart; defaults to [provisioning] cart_products.
+            concurrency (int): Customers provisioned at once; defaults to [provisioning] concurrency.
+            record (bool): Queue the credentials in TestRunManager's user store (flushed with the others).
+
+        Returns:
+            list: One dict per customer with email, password, session_cookie (OCSESSID) and counts.
+
+        Raises:
+            RuntimeError: When any customer could not be provisioned.
+        """
+        settings = self.provisioning_settings
+        count = int(count)
+        addresses = settings["addresses"] if addresses is None else int(addresses)
+        if cart_products is None:
+            cart_products = settings["cart_products"]
+        elif isinstance(cart_products, str):
+            cart_products = [product.strip() for product in cart_products.split(",") if product.strip()]
+        concurrency = max(min(int(concurrency or settings["concurrency"]), count), 1)
+        tag = f"{time.strftime('%Y%m%d%H%M%S')}{os.getpid()}"  # Unique emails across runs and pabot workers
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="opencart-provision") as executor:
+            customers = list(executor.map(
+                lambda index: self._provision_customer(index, tag, addresses, cart_products), range(count)))
+        elapsed = round(time.perf_counter() - started, 3)
+
+        failed = [customer for customer in customers if not customer["ok"]]
+        print(f"Provisioned {count - len(failed)}/{count} customer(s) in {elapsed}s "
+              f"({addresses} address(es), {len(cart_products)} cart item(s) each, concurrency={concurrency})")
+
+        if str(record).lower() != "false":
+            for customer in customers:
+                if not customer["ok"]:
+                    continue
+                try:
+                    before_run.buffer_user_data_for_db(customer["first_name"], customer["last_name"],
+                                                       customer["email"], customer["telephone"],
+                                                       customer["password"], customer["password"])
+                except Exception as e:
+                    print(f"[WARNING] Could not record provisioned customer {customer['email']}: {e}")
+
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {count} customer(s) could not be provisioned; "
+                               f"first error: {failed[0]['error']}")
+        return customers
+
+    @keyword("Get Customer Session")
+    def get_customer_session(self, email_address=None, password=None):
+        """
+        Log an existing customer in over HTTP and return its OCSESSID cookie value
+        (defaults to the [users] credentials).
+        """
+        email_address = email_address or self.login_credentials["email_address"]
+        password = password or self.login_credentials["password"]
+        session = self._customer_session()
+        self._storefront_post(session, "login", {"email": email_address, "password": password},
+                              success_route="account/account")
+        cookie = session.cookies.get(SESSION_COOKIE)
+        if cookie is None:
+            raise RuntimeError(f"No {SESSION_COOKIE} cookie received for {email_address}")
+        return cookie
+
     @keyword("Get Set password Link From Email")
-    def get_set_password_link(self, email_addr, password, imap_server="imap.gmail.com",
+    def get_set_password_link(self, email_addr, password, imap_server=None,
                               expected_subject="Set your new password"):
-        mail = None
+        # IMAP_SERVER may point at the local mail sink (see Start Mail Sink)
+        imap_server = imap_server or os.getenv("IMAP_SERVER", "imap.gmail.com")
         try:
-            mail = imaplib.IMAP4_SSL(imap_server)
-            mail.login(email_addr, password)
-            mail.select("inbox")
+            mail = imap_sessions.get_session(imap_server, email_addr, password)
+            mail.select("inbox", readonly=True)
 
-            result, data = mail.search(None, '(FROM "noreply@imetanic.co")')
-            email_ids = data[0].split()
-            if not email_ids:
-                return None
-
-            emails_with_dates = []
-            for eid in email_ids:
-                result, msg_data = mail.fetch(eid, '(BODY[HEADER.FIELDS (DATE)])')
-                raw_date = msg_data[0][1].decode().strip().replace('Date: ', '')
-                email_date = email.utils.parsedate_to_datetime(raw_date)
-                emails_with_dates.append((eid, email_date))
-
-            sorted_emails = sorted(emails_with_dates, key=lambda x: x[1], reverse=True)
-
-            for email_id, _ in sorted_emails:
-                result, data = mail.fetch(email_id, '(RFC822)')
-                raw_email = data[0][1]
-                msg = email.message_from_bytes(raw_email)
-
-                subject = msg.get("Subject", "").strip()
-                if subject != expected_subject:
-                    continue
+            # One batched header FETCH (newest first); bodies only for the expected subject
+            matching_emails = imap_session.find_latest_messages(mail, ["FROM", '"noreply@imetanic.co"'],
+                                                                lambda subject: subject.strip() == expected_subject)
 
+            for _, msg in matching_emails:
                 body = ""
                 if msg.is_multipart():
                     for part in msg.walk():
@@ -430,10 +900,10 @@ class OpenCartAPI:
 
         except Exception as e:
             print(f"Error fetching email: {e}")
+            imap_sessions.discard(imap_server, email_addr)
             return None
         finally:
-            if mail:
-                mail.logout()
+            imap_sessions.touch(imap_server, email_addr)
 
 
 # Example Usage
@@ -0,0 +1,215 @@
+# utils/batch_assertions.py
+"""
+Visibility and text checks of many elements in one WebDriver round trip.
+
+Checking a list of locators with Wait Until Element Is Visible / Get Text costs one or more driver
+calls per element. These keywords send every locator to the browser in a single execute_script call,
+which resolves, checks and reads all of them at once and answers with one structured result.
+
+Locators may be a list or a (nested) dict such as a subtree of locators.yaml; expected values are
+paired by key (dotted paths for nested dicts) or by position for lists:
+    text          element visible and its text equal to (or, with contains=True, containing) the value
+    True / None   element visible (keys without an expected value are visibility checks)
+    False         element absent or hidden
+
+Supported locator strategies: css, xpath, id, name, link, partial link, class, tag and the
+SeleniumLibrary default (id/name, or xpath for locators starting with //).
+
+Usage (Robot):
+    Library    ../utils/batch_assertions.py
+
+    Elements Should Match    ${locators_params['register_success']}    ${test_data['register_success']}
+    ${diff}    Compare Elements    ${locators_params['register']['newsletter']}
+"""
+import re
+
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import secs_to_timestr
+
+from smart_waits import poll_until, resolve_timeout
+
+# Only the @keyword functions below are keywords
+ROBOT_AUTO_KEYWORDS = False
+
+_STRATEGIES = {
+    "css": "css", "xpath": "xpath", "id": "id", "identifier": "default", "name": "name",
+    "link": "link", "partial link": "partial link", "class": "class", "tag": "tag", "default": "default",
+}
+_STRATEGY_PREFIX = re.compile(r"^\s*(%s)\s*[:=]" % "|".join(sorted(_STRATEGIES, key=len, reverse=True)),
+                              re.IGNORECASE)
+
+# arguments[0]: [[strategy, value], ...] -> [{count, visible, text}, ...] (first match of each locator)
+_EVALUATE_ELEMENTS = """
+var find = function (strategy, value) {
+    var byText = function (partial) {
+        return Array.prototype.filter.call(document.getElementsByTagName('a'), function (a) {
+            var text = (a.innerText || a.textContent).trim();
+            return partial ? text.indexOf(value) !== -1 : text === value;
+        });
+    };
+    switch (strategy) {
+        case 'css': return Array.prototype.slice.call(document.querySelectorAll(value));
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        case 'id': var byId = document.getElementById(value); return byId ? [byId] : [];
+        case 'name': return Array.prototype.slice.call(document.getElementsByName(value));
+        case 'class': return Array.prototype.slice.call(document.getElementsByClassName(value));
+        case 'tag': return Array.prototype.slice.call(document.getElementsByTagName(value));
+        case 'link': return byText(false);
+        case 'partial link': return byText(true);
+        default:
+            var element = document.getElementById(value);
+            return element ? [element] : Array.prototype.slice.call(document.getElementsByName(value));
+    }
+};
+var visible = function (element) {
+    if (!element.isConnected) { return false; }
+    if (element.checkVisibility) {
+        if (!element.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})) { return false; }
+    } else {
+        for (var node = element; node && node.nodeType === 1; node = node.parentElement) {
+            var style = getComputedStyle(node);
+            if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') { return false; }
+        }
+    }
+    var rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+};
+// Same normalisation as WebDriver's element text: no nbsp, trimmed lines, single spaces
+var text = function (node) {
+    var raw = node.nodeType === 1 ? (node.innerText || node.textContent) : node.textContent;
+    return (raw || '').replace(/\\u00a0/g, ' ').split('\\n').map(function (line) {
+        return line.replace(/[ \\t\\r]+/g, ' ').trim();
+    }).filter(Boolean).join('\\n');
+};
+return arguments[0].map(function (locator) {
+    var nodes;
+    try { nodes = find(locator[0], locator[1]); } catch (e) { return {count: 0, visible: false, text: null, error: String(e)}; }
+    if (!nodes.length) { return {count: 0, visible: false, text: null}; }
+    var element = nodes[0].nodeType === 1 ? nodes[0] : nodes[0].parentElement;
+    return {count: nodes.length, visible: !!element && visible(element), text: text(nodes[0])};
+});
+"""
+
+
+# parse_locator(), pair_checks(), diff_states() and describe_diff() are helpers (not keywords) shared with
+# page_snapshot, which runs the same checks against a captured page
+def parse_locator(locator):
+    """(strategy, value) of a SeleniumLibrary locator string, e.g. 'css=#content > h1' -> ('css', '#content > h1')."""
+    locator = str(locator)
+    match = _STRATEGY_PREFIX.match(locator)
+    if match:
+        return _STRATEGIES[match.group(1).lower()], locator[match.end():].strip()
+    if locator.startswith(("//", "(//")):
+        return "xpath", locator
+    if re.match(r"^\s*[\w ]+[:=]", locator) and not locator.startswith(("#", ".", "[")):
+        raise ValueError(f"Locator strategy not supported in batch checks: {locator}")
+    return "default", locator
+
+
+def _flatten(tree, prefix=""):
+    """{'a': {'b': x}} -> {'a.b': x}; lists are keyed by their locators (or index for expected values)."""
+    if isinstance(tree, dict):
+        flat = {}
+        for key, value in tree.items():
+            name = f"{prefix}{key}"
+            flat.update(_flatten(value, f"{name}.") if isinstance(value, dict) else {name: value})
+        return flat
+    return {str(index): value for index, value in enumerate(tree)}
+
+
+def pair_checks(locators, expected):
+    """[(name, locator, expected)] pairing a locator tree/list with its expected tree/list."""
+    flat_locators = _flatten(locators)
+    flat_expected = _flatten(expected) if expected is not None else {}
+    if not isinstance(locators, dict):
+        # List of locators: report them by locator, pair expected values by position
+        return [(str(locator), locator, flat_expected.get(index))
+                for index, locator in flat_locators.items()]
+    return [(name, locator, flat_expected.get(name)) for name, locator in flat_locators.items()]
+
+
+def _evaluate(checks):
+    driver = BuiltIn().get_library_instance("SeleniumLibrary").driver
+    return driver.execute_script(_EVALUATE_ELEMENTS, [list(parse_locator(locator)) for _, locator, _ in checks])
+
+
+def diff_states(checks, states, contains):
+    mismatches = []
+    for (name, locator, expected), state in zip(checks, states):
+        mismatch = {"name": name, "locator": locator, "expected": expected, "actual": None}
+        if expected is False:
+            if state["visible"]:
+                mismatches.append({**mismatch, "check": "hidden", "actual": "visible"})
+        elif not state["count"]:
+            mismatches.append({**mismatch, "check": "missing", "actual": state.get("error")})
+        elif not state["visible"]:
+            mismatches.append({**mismatch, "check": "visible", "actual": "hidden"})
+        elif expected is not None and expected is not True:
+            expected_text, actual = str(expected).strip(), state["text"]
+            if not (expected_text in actual if contains else actual == expected_text):
+                mismatches.append({**mismatch, "check": "contains" if contains else "text", "actual": actual})
+    return {
+        "passed": not mismatches,
+        "checked": len(checks),
+        "mismatches": mismatches,
+        "elements": {name: state for (name, _, _), state in zip(checks, states)},
+    }
+
+
+def describe_diff(diff):
+    lines = [f"{len(diff['mismatches'])} of {diff['checked']} element check(s) failed:"]
+    for mismatch in diff["mismatches"]:
+        if mismatch["check"] == "missing":
+            problem = "not found"
+        elif mismatch["check"] in ("text", "contains"):
+            problem = f"expected {mismatch['check']} '{mismatch['expected']}', got '{mismatch['actual']}'"
+        else:
+            problem = f"expected {mismatch['check']}, is {mismatch['actual']}"
+        lines.append(f"  {mismatch['name']}: {problem} ({mismatch['locator']})")
+    return "\n".join(lines)
+
+
+@keyword("Get Elements State")
+def get_elements_state(locators):
+    """
+    Returns {name: {count, visible, text}} for a list or (nested) dict of locators, read in one round trip.
+    Names are dotted dict keys, or the locators themselves for a list.
+    """
+    checks = pair_checks(locators, None)
+    return {name: state for (name, _, _), state in zip(checks, _evaluate(checks))}
+
+
+@keyword("Compare Elements")
+def compare_elements(locators, expected=None, contains=False):
+    """
+    Checks all ``locators`` against ``expected`` in one round trip and returns the diff without failing:
+    {passed, checked, mismatches: [{name, locator, check, expected, actual}], elements: {name: state}}.
+    """
+    checks = pair_checks(locators, expected)
+    return diff_states(checks, _evaluate(checks), BuiltIn().convert_to_boolean(contains))
+
+
+@keyword("Elements Should Match")
+def elements_should_match(locators, expected=None, contains=False, timeout=None):
+    """
+    Waits until every element matches its expected text/visibility (one round trip per poll) and returns the diff.
+    Fails with the list of mismatches after ``timeout`` (default: SeleniumLibrary's timeout).
+    """
+    checks = pair_checks(locators, expected)
+    contains = BuiltIn().convert_to_boolean(contains)
+    last = {}
+
+    def matched():
+        last.update(diff_states(checks, _evaluate(checks), contains))
+        return last["passed"]
+
+    timeout = resolve_timeout(timeout)
+    poll_until(matched, timeout, lambda _: f"After {secs_to_timestr(timeout)}: {describe_diff(last)}")
+    logger.info(f"{last['checked']} element check(s) passed in one round trip per poll.")
+    return dict(last)
@@ -0,0 +1,317 @@
+# utils/browser_pool.py
+"""
+Warm browser sessions reused across suites, per Robot/pabot worker.
+
+Starting Chrome and its driver costs seconds per suite. With the pool, `Acquire Browser` hands back
+an idle session of the same browser/mode when one exists, and `Release Browser` resets it
+(extra windows, cookies, localStorage, sessionStorage, and on Chromium the origin's cache/IndexedDB)
+and parks it on about:blank instead of quitting it. Sessions are recycled after `max_uses`
+acquisitions or when they stop responding.
+
+pabot starts a new robot process for every suite, so the pool of one process only lasts one suite.
+With the local grid running (utils/local_grid.py, [local_grid] enabled = True) the browsers live in
+the grid's driver services instead: when a robot process ends, its idle sessions are parked for its
+pabot worker (${PABOTEXECUTIONPOOLID}) and the worker's next suite re-attaches to them on its first
+Acquire; they are quit when the grid stops. Without the grid, sessions are closed when the run ends.
+
+Settings ([browser_pool] in configs/config.ini):
+    enabled     False restores one fresh browser per Acquire and a real close per Release
+    max_uses    acquisitions before a session is replaced by a fresh one
+    reset_url   page idle sessions are parked on
+
+Usage (Robot):
+    Library    ../utils/browser_pool.py
+
+    Suite Setup       Acquire Browser    Chrome    ${URL}    incognito=True
+    Suite Teardown    Release Browser
+"""
+import os
+import atexit
+import threading
+
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+from SeleniumLibrary.errors import NoOpenBrowser
+
+import local_grid
+from config_service import config_service
+from network_profile import is_chromium
+
+# Only the @keyword functions below are keywords
+ROBOT_AUTO_KEYWORDS = False
+
+# SeleniumLibrary `options` strings for private browsing per browser
+_PRIVATE_MODE_OPTIONS = {
+    "chrome": "add_argument('--incognito')",
+    "headlesschrome": "add_argument('--incognito')",
+    "edge": "add_argument('--inprivate')",
+    "headlessedge": "add_argument('--inprivate')",
+    "firefox": "add_argument('-private')",
+    "headlessfirefox": "add_argument('-private')",
+}
+
+_CLEAR_WEB_STORAGE = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+
+class BrowserPool:
+    """Idle/busy WebDriver sessions of this process, kept in SeleniumLibrary under pool aliases."""
+
+    def __init__(self):
+        self.sessions = []  # dicts: alias, key, driver, uses, busy, node (grid node URL or None)
+        self.stats = {"opened": 0, "reused": 0, "recycled": 0, "crashed": 0, "closed": 0, "adopted": 0, "parked": 0}
+        self._counter = 0
+        self._adopted = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def settings():
+        return {
+            "enabled": config_service.get_bool("browser_pool", "enabled", fallback=True),
+            "max_uses": config_service.get_int("browser_pool", "max_uses", fallback=25),
+            "reset_url": config_service.get("browser_pool", "reset_url", fallback="about:blank"),
+        }
+
+    @staticmethod
+    def _selenium():
+        return BuiltIn().get_library_instance("SeleniumLibrary")
+
+    def _is_alive(self, session):
+        """The session is still registered in SeleniumLibrary and its driver answers."""
+        selenium = self._selenium()
+        if session["alias"] not in selenium.get_browser_aliases():
+            return False
+        try:
+            session["driver"].current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, session):
+        selenium = self._selenium()
+        self.sessions.remove(session)
+        try:
+            if session["alias"] in selenium.get_browser_aliases():
+                selenium.switch_browser(session["alias"])
+                selenium.close_browser()
+            else:
+                session["driver"].quit()
+        except Exception as e:
+            logger.debug(f"Closing pooled browser {session['alias']} failed: {e}")
+        self.stats["closed"] += 1
+
+    def _open(self, browser, url, incognito, key):
+        selenium = self._selenium()
+        self._counter += 1
+        alias = f"pool-{os.getpid()}-{self._counter}"
+        options = _PRIVATE_MODE_OPTIONS.get(browser.lower().replace(" ", "")) if incognito else None
+        # Local grid: headless, on this worker's driver node (or the cached driver binary)
+        arguments = local_grid.connection_options(browser, options) if local_grid.settings()["enabled"] \
+            else {"options": options}
+        selenium.open_browser(url, browser, alias=alias, **arguments)
+        session = {"alias": alias, "key": key, "driver": selenium.driver, "uses": 1, "busy": True,
+                   "node": arguments.get("remote_url")}
+        self.sessions.append(session)
+        self.stats["opened"] += 1
+        return session
+
+    def _adopt_parked(self):
+        """Re-attach to the idle sessions the previous robot process of this pabot worker parked on the grid."""
+        selenium = self._selenium()
+        for parked in local_grid.take_parked_sessions():
+            try:
+                driver = local_grid.attach_session(parked["url"], parked["session_id"], parked["capabilities"])
+            except Exception as e:
+                logger.debug(f"Re-attaching to parked session {parked['session_id']} failed: {e}")
+                continue
+            self._counter += 1
+            alias = f"pool-{os.getpid()}-{self._counter}"
+            selenium.register_driver(driver, alias)
+            self.sessions.append({"alias": alias, "key": tuple(parked["key"]), "driver": driver,
+                                  "uses": parked["uses"], "busy": False, "node": parked["url"]})
+            self.stats["adopted"] += 1
+
+    def acquire(self, browser, url, incognito):
+        settings = self.settings()
+        key = (browser.lower(), bool(incognito))
+        with self._lock:
+            if settings["enabled"]:
+                if not self._adopted and local_grid.settings()["enabled"]:
+                    self._adopted = True
+                    self._adopt_parked()
+                for session in [s for s in self.sessions if s["key"] == key and not s["busy"]]:
+                    if not self._is_alive(session):
+                        self.stats["crashed"] += 1
+                        self._quit(session)
+                    elif session["uses"] >= settings["max_uses"]:
+                        self.stats["recycled"] += 1
+                        self._quit(session)
+                    else:
+                        self._selenium().switch_browser(session["alias"])
+                        session["uses"] += 1
+                        session["busy"] = True
+                        self.stats["reused"] += 1
+                        if url and url != settings["reset_url"]:
+                            session["driver"].get(url)
+                        return session["alias"]
+            return self._open(browser, url or settings["reset_url"], incognito, key)["alias"]
+
+    def _reset(self, driver, reset_url):
+        """Leave exactly one window on reset_url with no cookies or web storage."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        url = driver.current_url
+        if is_chromium(driver):
+            # Chromium: cookies of every domain, plus cache/IndexedDB/service workers of the current origin
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if url.startswith("http"):
+                origin = "/".join(url.split("/", 3)[:3])
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.execute_script(_CLEAR_WEB_STORAGE)
+        driver.delete_all_cookies()
+        driver.get(reset_url)
+
+    def release(self):
+        settings = self.settings()
+        selenium = self._selenium()
+        with self._lock:
+            try:
+                current = selenium.driver
+            except NoOpenBrowser:
+                current = None
+            session = next((s for s in self.sessions if s["driver"] is current), None)
+            if session is None or not settings["enabled"]:
+                # Not pooled (or pooling switched off): behave like a normal close
+                if session is not None:
+                    self._quit(session)
+                elif current is not None:
+                    selenium.close_browser()
+                return False
+            try:
+                self._reset(session["driver"], settings["reset_url"])
+                session["busy"] = False
+                return True
+            except Exception as e:
+                logger.warn(f"Resetting pooled browser {session['alias']} failed, closing it: {e}")
+                self.stats["crashed"] += 1
+                self._quit(session)
+                return False
+
+    def release_all(self):
+        """Release every busy pooled browser and close all browsers the pool does not own."""
+        selenium = self._selenium()
+        pooled = {id(s["driver"]) for s in self.sessions}
+        for index in selenium.get_browser_ids():
+            selenium.switch_browser(index)
+            if id(selenium.driver) not in pooled:
+                selenium.close_browser()
+        for session in [s for s in self.sessions if s["busy"]]:
+            selenium.switch_browser(session["alias"])
+            self.release()
+
+    def close_all(self):
+        with self._lock:
+            for session in list(self.sessions):
+                self._quit(session)
+
+    def park_or_close_all(self):
+        """
+        End of run: idle, healthy sessions on the local grid are parked for this worker's next robot
+        process; all other sessions are closed.
+        """
+        settings = self.settings()
+        with self._lock:
+            parked = []
+            for session in list(self.sessions):
+                if settings["enabled"] and session["node"] and not session["busy"] \
+                        and session["uses"] < settings["max_uses"] and self._responds(session["driver"]):
+                    parked.append(session)
+                else:
+                    self._quit(session)
+            records = [{"url": s["node"], "session_id": s["driver"].session_id, "capabilities": s["driver"].caps,
+                        "key": list(s["key"]), "uses": s["uses"]} for s in parked]
+            if records and local_grid.park_sessions(records):
+                for session in parked:
+                    self.sessions.remove(session)
+                self.stats["parked"] += len(parked)
+                return
+            for session in parked:
+                self._quit(session)
+
+    @staticmethod
+    def _responds(driver):
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+
+_pool = BrowserPool()
+
+
+@keyword("Acquire Browser")
+def acquire_browser(browser="Chrome", url=None, incognito=False):
+    """
+    Makes a warm browser of the given type/mode current (opening one if none is idle) and returns its alias.
+    ``url`` is opened when given; otherwise the browser stays on the pool's reset page.
+    """
+    return _pool.acquire(browser, url, BuiltIn().convert_to_boolean(incognito))
+
+
+@keyword("Release Browser")
+def release_browser():
+    """
+    Resets the current browser (windows, cookies, web storage) and returns it to the pool.
+    Browsers not opened by the pool, or any browser when the pool is disabled, are closed instead.
+    """
+    return _pool.release()
+
+
+@keyword("Release All Browsers")
+def release_all_browsers():
+    """Drop-in for Close All Browsers: pooled browsers are reset and kept warm, all others are closed."""
+    _pool.release_all()
+
+
+@keyword("Close Browser Pool")
+def close_browser_pool():
+    """Quits every pooled browser of this process (done automatically when the run ends, unless parked)."""
+    _pool.close_all()
+
+
+@keyword("Get Browser Pool Stats")
+def get_browser_pool_stats():
+    """
+    Returns opened / reused / recycled / crashed / closed / adopted / parked counts and the number of pooled sessions.
+    """
+    return {**_pool.stats, "sessions": len(_pool.sessions), "idle": sum(not s["busy"] for s in _pool.sessions)}
+
+
+class _PoolCloser:
+    """Library listener: Robot calls close() when this global-scope library goes out of scope (end of run)."""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def close(self):
+        try:
+            _pool.park_or_close_all()
+        except Exception as e:
+            logger.debug(f"Closing the browser pool failed: {e}")
+
+
+ROBOT_LIBRARY_LISTENER = _PoolCloser()
+
+
+@atexit.register
+def _quit_leftover_drivers():
+    # Last resort when Robot did not call the listener (e.g. interrupted run)
+    for session in list(_pool.sessions):
+        try:
+            session["driver"].quit()
+        except Exception:
+            pass
@@ -1,12 +1,18 @@
 import os
+import copy
 from typing import Dict, Any
 
-import yaml
+from config_service import config_service
+from lazy_import import LazyModule
+
+_yaml = LazyModule("yaml")
 
 
 def parse_yaml(file_path: str) -> dict[Any, Any] | None:
     """
     Safely parses a YAML file and returns its content as a dictionary.
+    The file is parsed once per process (config_service) and re-read only when it changes;
+    each caller gets its own copy so suites can modify the result freely.
 
     Args:
         file_path (str): Absolute or relative path to the YAMl file.
@@ -22,16 +28,44 @@ def parse_yaml(file_path: str) -> dict[Any, Any] | None:
         print(f"[INFO] Current working directory: {os.getcwd()}")
         print(f"[INFO] Reading YAML file: {file_path}")
 
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = yaml.safe_load(file) or {}
+        content = copy.deepcopy(config_service.yaml(os.path.abspath(file_path)))
 
         print(f"[SUCCESS] YAML file content parsed successfully.")
         return content
 
-    except yaml.YAMLError as yaml_error:
+    except _yaml.YAMLError as yaml_error:
         print(f"[ERROR] Failed to parse YAML file content: {yaml_error}")
 
     except Exception as error:
         print(f"[ERROR] Unexpected error occurred: {error}")
 
     return {}
+
+
+def get_locator(key: str, file_path: str = "locators.yaml") -> Any:
+    """
+    Returns the locator stored under a dotted key, e.g. 'register.agreement.continue_button'.
+    Lookups use the precompiled flat index (constant time, no YAML parsing on warm runs).
+
+    Args:
+        key (str): Dotted path of the locator (or of a section, which returns a dictionary).
+        file_path (str): YAML file name under configs/ or an absolute path.
+
+    Returns:
+        Any: The locator string, or the nested dictionary for a section key.
+    """
+    return config_service.compiled(file_path).get(key)
+
+
+def get_test_data(key: str, file_path: str = "test_data.yaml") -> Any:
+    """
+    Returns the test data value stored under a dotted key, e.g. 'page_titles.register'.
+
+    Args:
+        key (str): Dotted path of the value (or of a section, which returns a dictionary).
+        file_path (str): YAML file name under configs/ or an absolute path.
+
+    Returns:
+        Any: The value, or the nested dictionary for a section key.
+    """
+    return config_service.compiled(file_path).get(key)
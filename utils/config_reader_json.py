@@ -1,20 +1,32 @@
 import json
 import os
 
+from config_service import config_service
+
 # Construct the absolute path to config.json
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'configs', 'json_files',
                                 'config.json')
 
-# Load JSON configuration safely
-try:
-    with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as file:
-        config = json.load(file)
-except FileNotFoundError:
-    print(f"[ERROR] config.json not found at: {CONFIG_FILE_PATH}")
-    config = {}
-except json.JSONDecodeError as e:
-    print(f"[ERROR] Failed to parse JSON: {e}")
-    config = {}
+
+# Last error printed, so a missing or invalid config.json is reported once instead of on every lookup
+_last_error = None
+
+
+def _config():
+    """Parsed config.json from the shared config service ({} if missing or invalid)."""
+    global _last_error
+    try:
+        config = config_service.json(CONFIG_FILE_PATH)
+        _last_error = None
+        return config
+    except FileNotFoundError:
+        error = f"[ERROR] config.json not found at: {CONFIG_FILE_PATH}"
+    except json.JSONDecodeError as e:
+        error = f"[ERROR] Failed to parse JSON: {e}"
+    if error != _last_error:
+        print(error)
+        _last_error = error
+    return {}
 
 
 class ConfigReader:
@@ -23,62 +35,62 @@ class ConfigReader:
     # Environment
     @staticmethod
     def environment():
-        return config.get('environment', {}).get('environment', 'Web')
+        return _config().get('environment', {}).get('environment', 'Web')
 
     @staticmethod
     def browser():
-        return config.get('environment', {}).get('browser', 'chrome')
+        return _config().get('environment', {}).get('browser', 'chrome')
 
     # Application
     @staticmethod
     def app_name():
-        return config.get('application', {}).get('appName', 'OpenCart')
+        return _config().get('application', {}).get('appName', 'OpenCart')
 
     # MySQL
     @staticmethod
     def mysql_config():
-        return config.get('mysql', {})
+        return _config().get('mysql', {})
 
     # MongoDB
     @staticmethod
     def mongodb_config():
-        return config.get('mongodb', {})
+        return _config().get('mongodb', {})
 
     # REST API
     @staticmethod
     def base_url():
-        return config.get('restApi', {}).get('baseUrl')
+        return _config().get('restApi', {}).get('baseUrl')
 
     @staticmethod
     def grant_type():
-        return config.get('restApi', {}).get('grantType')
+        return _config().get('restApi', {}).get('grantType')
 
     # Users
     @staticmethod
     def register_url():
-        return config.get('users', {}).get('signupUrl')
+        return _config().get('users', {}).get('signupUrl')
 
     @staticmethod
     def login_url():
-        return config.get('users', {}).get('loginUrl')
+        return _config().get('users', {}).get('loginUrl')
 
     @staticmethod
     def login_email():
-        return config.get('users', {}).get('emailAddress')
+        return _config().get('users', {}).get('emailAddress')
 
     @staticmethod
     def login_password():
-        return config.get('users', {}).get('password')
+        return _config().get('users', {}).get('password')
 
     # Register Users
     @staticmethod
     def register_user_info():
-        return config.get('registerUsers', {})
+        return _config().get('registerUsers', {})
 
     # Content-Type
     @staticmethod
     def content_types():
-        return config.get('contentType', {})
+        return _config().get('contentType', {})
 
 
 config_reader = ConfigReader()
@@ -0,0 +1,172 @@
+# utils/config_service.py
+"""
+Process-wide configuration service.
+
+config.ini, config_end_url.ini, config.json, the YAML locator/test-data files and .env are
+parsed once per process and memoized (YAML additionally through the pickle cache of locator_index.py). Every lookup re-checks the file's modification time
+(one os.stat), so edits made while a run is in progress are picked up without re-parsing
+unchanged files. ConfigReader, parse_yaml, OpenCartAPI, TestRunManager and EnvConfigLoader
+all read through the shared `config_service` instance.
+"""
+import os
+import json
+import threading
+from configparser import ConfigParser
+
+from dotenv import dotenv_values
+
+import locator_index
+
+BASE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+CONFIG_DIR = os.path.join(BASE_DIR, 'configs')
+ENV_FILE = os.path.join(BASE_DIR, '.env')
+
+_UNSET = object()
+_BOOLEAN_STATES = ConfigParser.BOOLEAN_STATES
+
+
+def _to_bool(value):
+    if value.lower() not in _BOOLEAN_STATES:
+        raise ValueError(f"Not a boolean: {value}")
+    return _BOOLEAN_STATES[value.lower()]
+
+
+def _parse_ini(path):
+    config = ConfigParser()
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            config.read_file(file)
+    except UnicodeDecodeError:
+        # Fall back for files saved with a legacy encoding
+        config = ConfigParser()
+        with open(path, 'r', encoding='latin1') as file:
+            config.read_file(file)
+    return config
+
+
+def _parse_json(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+class ConfigService:
+    """
+    Memoized loader for the project's configuration sources.
+
+    Parsed trees are shared between callers and must be treated as read-only.
+    Relative file names are resolved against the configs/ directory.
+    """
+
+    def __init__(self, config_dir=CONFIG_DIR, env_file=ENV_FILE):
+        self.config_dir = config_dir
+        self.env_file = env_file
+        self._cache = {}
+        self._lock = threading.RLock()
+        self._env_signature = None
+        self.stats = {"hits": 0, "loads": 0, "reloads": 0}
+
+    def resolve(self, name):
+        """Absolute path of a config file given by name (relative to configs/) or path."""
+        return os.path.normpath(name if os.path.isabs(name) else os.path.join(self.config_dir, name))
+
+    @staticmethod
+    def _signature(path):
+        """(mtime_ns, size) of the file; raises FileNotFoundError if it does not exist."""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, name, parser):
+        path = self.resolve(name)
+        signature = self._signature(path)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == signature:
+                self.stats["hits"] += 1
+                return cached[1]
+
+            parsed = parser(path)
+            self._cache[path] = (signature, parsed)
+            self.stats["reloads" if cached else "loads"] += 1
+            return parsed
+
+    # --- Sources ----------------------------------------------------------
+    def ini(self, name='config.ini'):
+        """Parsed ConfigParser for an .ini file."""
+        return self._load(name, _parse_ini)
+
+    def json(self, name='config.json'):
+        """Parsed content of a JSON file."""
+        return self._load(name, _parse_json)
+
+    def compiled(self, name):
+        """CompiledYaml (tree + flat dotted-key index) of a YAML file, backed by the on-disk pickle cache."""
+        return self._load(name, locator_index.compile_yaml)
+
+    def yaml(self, name):
+        """Parsed content of a YAML file ({} when empty)."""
+        return self.compiled(name).tree
+
+    def env(self):
+        """
+        Values of the .env file, exported to os.environ the first time they are seen.
+        Variables already set in the environment are not overridden (same as load_dotenv()).
+        """
+        if not os.path.exists(self.env_file):
+            return {}
+        values = self._load(self.env_file, dotenv_values)
+        with self._lock:
+            signature = self._cache[self.resolve(self.env_file)][0]
+            if signature != self._env_signature:
+                for key, value in values.items():
+                    if value is not None:
+                        os.environ.setdefault(key, value)
+                self._env_signature = signature
+        return values
+
+    # --- Typed lookups ----------------------------------------------------
+    # Without a fallback, a missing section/option raises configparser errors, like ConfigParser.get()
+    def get(self, section, option, fallback=_UNSET, name='config.ini'):
+        """String value of section/option."""
+        config = self.ini(name)
+        if fallback is _UNSET:
+            return config.get(section, option)
+        return config.get(section, option, fallback=fallback)
+
+    def _typed(self, section, option, fallback, name, convert):
+        value = self.get(section, option, None if fallback is not _UNSET else _UNSET, name)
+        if value is None or not value.strip():
+            if fallback is _UNSET:
+                raise ValueError(f"Empty value for [{section}] {option}")
+            return fallback
+        return convert(value.strip())
+
+    def get_int(self, section, option, fallback=_UNSET, name='config.ini'):
+        return self._typed(section, option, fallback, name, int)
+
+    def get_float(self, section, option, fallback=_UNSET, name='config.ini'):
+        return self._typed(section, option, fallback, name, float)
+
+    def get_bool(self, section, option, fallback=_UNSET, name='config.ini'):
+        return self._typed(section, option, fallback, name, _to_bool)
+
+    def get_list(self, section, option, fallback=_UNSET, separator=',', name='config.ini'):
+        return self._typed(section, option, fallback, name,
+                           lambda value: [item.strip() for item in value.split(separator) if item.strip()])
+
+    def section(self, section, name='config.ini'):
+        """All options of an .ini section as a dict ({} if the section is missing)."""
+        config = self.ini(name)
+        return dict(config.items(section)) if config.has_section(section) else {}
+
+    def invalidate(self, name=None):
+        """Forget one cached file (or all of them) so the next lookup re-parses it."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+                self._env_signature = None
+            else:
+                self._cache.pop(self.resolve(name), None)
+
+
+# Shared by every module in the process
+config_service = ConfigService()
@@ -1,23 +1,89 @@
 from robot.api.deco import keyword
 import os
+import csv
+import time
+import atexit
 import string
-import pandas as pd
-import imaplib
 import email
 from email.header import decode_header
 import re
 import random
-from datetime import datetime
-from configparser import ConfigParser
-from email.utils import parseaddr
+import threading
+from decimal import Decimal
+from datetime import datetime, timedelta
+from email.utils import parseaddr, parsedate_to_datetime
 
-import mysql.connector
-from mysql.connector import errorcode
-import openpyxl
-from openpyxl.workbook import Workbook
-from openpyxl.utils.exceptions import InvalidFileException
-import pyautogui
-from dotenv import load_dotenv
+from robot.utils import timestr_to_secs
+
+from config_service import config_service
+import imap_session
+from imap_session import imap_sessions
+from lazy_import import LazyModule
+import mail_sink
+
+# Heavy dependencies are imported on first use, not when Robot loads this library
+_mysql = LazyModule("mysql.connector")
+_mysql_pooling = LazyModule("mysql.connector.pooling")
+_openpyxl = LazyModule("openpyxl")
+_filelock = LazyModule("filelock")
+_pyautogui = LazyModule("pyautogui")
+
+
+# ================================
+# Email Parsing Helpers
+# ================================
+# Headers needed to decode a message whose body is fetched separately with BODY.PEEK[TEXT]
+_IMAP_HEADER_FIELDS = "FROM TO SUBJECT DATE CONTENT-TYPE CONTENT-TRANSFER-ENCODING MIME-VERSION"
+_IMAP_MESSAGE_PARTS = f"(BODY.PEEK[HEADER.FIELDS ({_IMAP_HEADER_FIELDS})] BODY.PEEK[TEXT])"
+
+
+def _imap_quote(value):
+    """Quote a value for use inside an IMAP SEARCH criterion."""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _imap_since(days_ago):
+    """IMAP SEARCH date (dd-Mon-yyyy) for `days_ago` days before today."""
+    return (datetime.now() - timedelta(days=int(days_ago))).strftime("%d-%b-%Y")
+
+
+def _message_from_fetch(msg_data):
+    """
+    Rebuild an email.message.Message from a FETCH response holding the header fields and body text parts.
+    """
+    parts = [item[1] for item in msg_data if isinstance(item, tuple) and len(item) > 1]
+    return email.message_from_bytes(b"".join(parts))
+
+
+def _decode_subject(msg):
+    """Decode the (possibly RFC 2047 encoded) subject of a message."""
+    raw_subject = msg.get("Subject", "")
+    decoded_subject, enc = decode_header(raw_subject)[0]
+    if isinstance(decoded_subject, bytes):
+        decoded_subject = decoded_subject.decode(enc or "utf-8", errors="ignore")
+    return decoded_subject
+
+
+def _extract_body(msg):
+    """Return the first text/plain or text/html part of a message as a string."""
+    if msg.is_multipart():
+        for part in msg.walk():
+            if part.get_content_type() in ["text/plain", "text/html"] and "attachment" not in str(
+                    part.get("Content-Disposition")):
+                charset = part.get_content_charset() or "utf-8"
+                return part.get_payload(decode=True).decode(charset, errors="ignore")
+        return ""
+    charset = msg.get_content_charset() or "utf-8"
+    payload = msg.get_payload(decode=True) or b""
+    return payload.decode(charset, errors="ignore")
+
+
+def _message_sent_at(msg):
+    """Parse the Date header into a datetime, or None if missing or malformed."""
+    try:
+        return parsedate_to_datetime(msg.get("Date"))
+    except (TypeError, ValueError, IndexError):
+        return None
 
 
 class TestRunManager:
@@ -25,6 +91,27 @@ class TestRunManager:
     A utility class for managing test execution metadata, user data storage,
     database configuration loading from both config.ini and .env files.
     """
+    # Process-wide MySQL connection pool shared by every TestRunManager instance.
+    # Rebuilt when the PID changes so forked pabot workers never share sockets.
+    _db_pool = None
+    _db_pool_pid = None
+    _db_lock = threading.Lock()
+
+    # Process-wide buffers of registered-user records, flushed in batches.
+    _user_buffer_lock = threading.RLock()
+    _db_user_buffer = []
+    _excel_user_buffer = {}
+    _user_buffer_oldest = None  # monotonic time the oldest pending record was queued
+    _user_buffer_exit_hook = False
+
+    # Highest UID already inspected per (server, account, folder, search), with the folder UIDVALIDITY
+    _imap_seen_uids = {}
+
+    REGISTRATION_EMAIL_SUBJECT = "thank you for registering"
+    LOGIN_LINK_PATTERN = r"https?://\S+?route=account/login"
+
+    EXCEL_HEADERS = ['First Name', 'Last Name', 'Email', 'Telephone', 'Password', 'Confirm Password', 'Created At']
+
     def __init__(self):
         """
         Initialize configuration variables from .env and config.ini, then set up DB connection details.
@@ -33,18 +120,20 @@ class TestRunManager:
             # Step 1: Construct the full path to the config.ini file
             self.config_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'configs', 'config.ini')
 
-            # Step 2: Load .env file (if present)
-            env_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '.env')
-            if os.path.exists(env_path):
-                load_dotenv(dotenv_path=env_path)
+            # Step 2: Load .env file (if present; parsed once per process)
+            config_service.env()
 
             # Step 3: Read and override from config.ini if available
             self.database_config = {}
+            self.buffer_batch_size = 20
+            self.buffer_flush_interval = 60.0
+            self.mail_sink_config = {"enabled": False, "host": "127.0.0.1", "smtp_port": 2525, "imap_port": 1143}
             self.read_config()
 
             # Step 4: Initialize DB connection and cursor to None
             self.connection = None
             self.cursor = None
+            self.run_id = None
 
             # Step 5: Extract DB config values into instance variables
             self.database_username = self.database_config["username"]
@@ -54,15 +143,21 @@ class TestRunManager:
             self.database_name = self.database_config["database"]
             self.execution_status_start = self.database_config["execution_status_start"]
             self.execution_status_end = self.database_config["execution_status_end"]
+            self.database_pool_name = self.database_config["pool_name"]
+            self.database_pool_size = int(self.database_config["pool_size"])
 
             # Step 6: Default DB values from .env (override by config.ini if found)
             self.register_email_app_password = os.getenv("REGISTER_EMAIL_APP_PASSWORD")
-            self.imap_server = os.getenv("IMAP_SERVER")
             self.email_subject = os.getenv("SUBJECT")
 
         except Exception as e:
             print(f"[ERROR] Initialization failed: {e}")
 
+    @property
+    def imap_server(self):
+        """IMAP host from .env, read on every use so a started mail sink takes effect immediately."""
+        return os.getenv("IMAP_SERVER")
+
     def read_config(self):
         """
         Reads configuration from the config.ini file.
@@ -72,18 +167,30 @@ class TestRunManager:
             print(f"Config file not found: {self.config_file}")
             return
 
-        # Step 2: Create ConfigParser instance and read the file
-        config = ConfigParser()
+        # Step 2: Get the shared, cached ConfigParser for the file
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as file:
-                config.read_file(file)  # Read file with correct encoding
-
-            # Step 3: Validate section presence
+            config = config_service.ini(self.config_file)
+
+            # Step 3: Read user-data buffer thresholds (optional section)
+            if "user_data_buffer" in config:
+                self.buffer_batch_size = config.getint("user_data_buffer", "batch_size", fallback=20)
+                self.buffer_flush_interval = config.getfloat("user_data_buffer", "flush_interval", fallback=60.0)
+
+            # Step 4: Read local mail sink settings (optional section)
+            if "mail_sink" in config:
+                self.mail_sink_config = {
+                    "enabled": config.getboolean("mail_sink", "enabled", fallback=False),
+                    "host": config.get("mail_sink", "host", fallback="127.0.0.1"),
+                    "smtp_port": config.getint("mail_sink", "smtp_port", fallback=2525),
+                    "imap_port": config.getint("mail_sink", "imap_port", fallback=1143),
+                }
+
+            # Step 5: Validate section presence
             if "mysql" not in config:
                 print("Error: 'mysql' section not found in config.ini")
                 return
 
-            # Step 4: Populate DB config dictionary with fallback defaults
+            # Step 6: Populate DB config dictionary with fallback defaults
             self.database_config = {
                 "username": config.get("mysql", "username", fallback=None),
                 "password": config.get("mysql", "password", fallback=None),
@@ -92,6 +199,8 @@ class TestRunManager:
                 "database": config.get("mysql", "database", fallback=None),
                 "execution_status_start": config.get("mysql", "execution_status_start", fallback="STARTED"),
                 "execution_status_end": config.get("mysql", "execution_status_end", fallback="COMPLETED"),
+                "pool_name": config.get("mysql", "pool_name", fallback="opencart_pool"),
+                "pool_size": config.get("mysql", "pool_size", fallback="5"),
             }
 
             if not all(self.database_config.values()):
@@ -100,37 +209,37 @@ class TestRunManager:
         except Exception as e:
             print(f"[ERROR] Failed to read configuration: {e}")
 
-    def connect_db(self):
+    def get_db_pool(self):
         """
-        Establish connection to the database.
-        - Creates the database if it doesn't exist.
-        - Ensures required tables are created.
+        Return the process-wide MySQL connection pool.
+        - On first use, creates the database and required tables once.
+        - Later calls only hand back the cached pool.
         """
-        # Step 1: Check if essential DB config values exist
-        if not all([self.database_username, self.database_password, self.database_host, self.database_name]):
-            print("Database credentials are missing. Check your config.ini file.")
-            return False
+        cls = type(self)
+        with cls._db_lock:
+            if cls._db_pool is not None and cls._db_pool_pid == os.getpid():
+                return cls._db_pool
 
-        try:
-            # Step 2: Connect to MySQL server without selecting DB
-            temp_connection = mysql.connector.connect(
+            # Step 1: Create the database once using a throwaway server connection
+            server_connection = _mysql.connect(
                 user=self.database_username,
                 password=self.database_password,
                 host=self.database_host,
                 port=int(self.database_port),
-                database=self.database_name,
                 auth_plugin="mysql_native_password"
             )
-
-            temp_cursor = temp_connection.cursor()
-
-            # Step 3: Create DB if not already present
-            temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database_name}")
-            temp_cursor.close()
-            temp_connection.close()
-
-            # Step 4: Now connect to the actual target database
-            self.connection = mysql.connector.connect(
+            try:
+                server_cursor = server_connection.cursor()
+                server_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database_name}")
+                server_cursor.close()
+            finally:
+                server_connection.close()
+
+            # Step 2: Build the pool against the target database
+            pool = _mysql_pooling.MySQLConnectionPool(
+                pool_name=f"{self.database_pool_name}_{os.getpid()}",
+                pool_size=self.database_pool_size,
+                pool_reset_session=True,
                 user=self.database_username,
                 password=self.database_password,
                 host=self.database_host,
@@ -139,22 +248,67 @@ class TestRunManager:
                 auth_plugin="mysql_native_password"  # Ensures compatibility with modern MySQL versions
             )
 
-            self.cursor = self.connection.cursor()
-            print("Database connection successful.")
+            # Step 3: Bootstrap the schema once per process
+            connection = pool.get_connection()
+            try:
+                self.connection = connection
+                self.cursor = connection.cursor()
+                self.ensure_tables_exist()
+            finally:
+                self.cursor.close()
+                connection.close()  # Returns the connection to the pool
+                self.connection = None
+                self.cursor = None
 
-            # Step 5: Ensure required tables exist before proceeding
-            self.ensure_tables_exist()
+            cls._db_pool = pool
+            cls._db_pool_pid = os.getpid()
+            print(f"Database pool '{pool.pool_name}' ready (size={self.database_pool_size}).")
+            return pool
+
+    def connect_db(self):
+        """
+        Borrow a connection from the shared pool.
+        - The database and tables are bootstrapped once per process by get_db_pool().
+        - Call close_db() afterwards to return the connection to the pool.
+        """
+        # Step 1: Check if essential DB config values exist
+        if not all([self.database_username, self.database_password, self.database_host, self.database_name]):
+            print("Database credentials are missing. Check your config.ini file.")
+            return False
+
+        try:
+            # Step 2: Check out a pooled connection
+            self.connection = self.get_db_pool().get_connection()
+            self.cursor = self.connection.cursor()
             return True
 
-        except mysql.connector.Error as err:
+        except _mysql.Error as err:
             print(f"[ERROR] Database connection failed: {err}")
             return False
 
+    def close_db(self):
+        """
+        Close the cursor and return the borrowed connection to the pool.
+        """
+        try:
+            if self.cursor:
+                self.cursor.close()
+            if self.connection and self.connection.is_connected():
+                self.connection.close()
+        except _mysql.Error as err:
+            print(f"[ERROR] Failed to release database connection: {err}")
+        finally:
+            self.cursor = None
+            self.connection = None
+
     def ensure_tables_exist(self):
         """
         Create essential tables if they do not exist.
         - test_execution_reports
         - user_data
+        - registered_users
+        - test_case_results
+        - suite_results
         """
         # Step 1: Define table creation SQL for both tables
         tables = {
@@ -167,7 +321,7 @@ class TestRunManager:
                     execution_status VARCHAR(50)
                 )
             """,
-            "users": """
+            "user_data": """
                 CREATE TABLE IF NOT EXISTS user_data (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     business_name VARCHAR(255),
@@ -175,6 +329,55 @@ class TestRunManager:
                     password VARCHAR(255),
                     email VARCHAR(255)
                 )
+            """,
+            "registered_users": """
+                CREATE TABLE IF NOT EXISTS registered_users (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    firstname VARCHAR(100) NOT NULL,
+                    lastname VARCHAR(100) NOT NULL,
+                    email VARCHAR(255) NOT NULL UNIQUE,
+                    telephone VARCHAR(15),
+                    password TEXT NOT NULL,
+                    confirm_password TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """,
+            "test_case_results": """
+                CREATE TABLE IF NOT EXISTS test_case_results (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    run_id INT NULL,
+                    suite VARCHAR(255),
+                    name VARCHAR(255),
+                    long_name VARCHAR(1024),
+                    status VARCHAR(10),
+                    start_time DATETIME(3) NULL,
+                    elapsed_seconds DECIMAL(12,3),
+                    tags VARCHAR(1024),
+                    test_case_ids VARCHAR(255),
+                    message TEXT,
+                    INDEX idx_test_case_results_run (run_id),
+                    INDEX idx_test_case_results_name (name),
+                    INDEX idx_test_case_results_long_name (long_name(255), run_id)
+                )
+            """,
+            "suite_results": """
+                CREATE TABLE IF NOT EXISTS suite_results (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    run_id INT NULL,
+                    name VARCHAR(255),
+                    long_name VARCHAR(1024),
+                    source VARCHAR(1024),
+                    status VARCHAR(10),
+                    start_time DATETIME(3) NULL,
+                    end_time DATETIME(3) NULL,
+                    elapsed_seconds DECIMAL(12,3),
+                    passed INT,
+                    failed INT,
+                    skipped INT,
+                    message TEXT,
+                    INDEX idx_suite_results_run (run_id),
+                    INDEX idx_suite_results_long_name (long_name(255), run_id)
+                )
             """
         }
 
@@ -196,14 +399,15 @@ class TestRunManager:
             print(f"[ERROR] Failed to ensure tables exist: {e}")
             raise
 
-    def insert_start_time(self):
+    def insert_start_time(self, name='OpenCart'):
         """
         Insert test Execution Start Time into database.
+        The new row id is kept in self.run_id (and returned) so update_end_time() completes this run's row.
         """
         # Step 1: Ensure DB is connected
         if not self.connect_db():
             print("Skipping database insertion due to connection failure.")
-            return
+            return None
 
         # Step 2: Get current datetime
         current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -211,141 +415,571 @@ class TestRunManager:
         # Step 3: Insert a new test execution row
         try:
             sql = "INSERT INTO test_execution_reports (Name, execution_start_time, execution_status) VALUES (%s, %s, %s)"
-            self.cursor.execute(sql, ('OpenCart', current_timestamp, self.execution_status_start))
+            self.cursor.execute(sql, (name, current_timestamp, self.execution_status_start))
             self.connection.commit()
-            print("Start time inserted successfully.")
+            self.run_id = self.cursor.lastrowid
+            print(f"Start time inserted successfully (run id {self.run_id}).")
+            return self.run_id
 
         except Exception as e:
             print(f"[ERROR] Failed to insert start time: {e}")
             raise
 
-    def update_end_time(self):
+        finally:
+            self.close_db()
+
+    def update_end_time(self, run_id=None):
         """
-        Update the last test execution with an end time and completion status.
+        Update a test execution with an end time and completion status.
+        The row is the one created by insert_start_time() (or the given run_id), never simply the
+        latest row, which under parallel pabot runs may belong to another process.
         """
+        run_id = run_id or self.run_id
+        if not run_id:
+            print("No test run started by this process; call insert_start_time() first or pass run_id.")
+            return None
+
         # Step 1: Ensure DB is connected
         if not self.connect_db():
             print("Skipping database update due to connection failure.")
-            return
+            return None
 
         # Step 2: Get current datetime
         current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         try:
-            # Step 3: Get last inserted row
-            self.cursor.execute("SELECT id FROM test_execution_reports ORDER BY id DESC LIMIT 1")
-            last_id = self.cursor.fetchone()
-
-            if not last_id:
-                print("No previous test reports found to update.")
-                return
-
-            # Step 4: Update end time and status
+            # Step 3: Update end time and status of this run's row
             sql = "UPDATE test_execution_reports SET execution_end_time = %s, execution_status = %s WHERE id = %s"
-            self.cursor.execute(sql, (current_timestamp, self.execution_status_end, last_id[0]))
+            self.cursor.execute(sql, (current_timestamp, self.execution_status_end, int(run_id)))
             self.connection.commit()
+
+            if not self.cursor.rowcount:
+                print(f"No test report found with id {run_id}.")
+                return None
             print("End time updated successfully.")
+            return current_timestamp
 
         except Exception as e:
             print(f"[ERROR] Failed to update end time: {e}")
             raise
 
+        finally:
+            self.close_db()
+
+    def insert_test_run(self, name, start_time=None, end_time=None, status=None):
+        """
+        Insert one row into test_execution_reports for an already finished run (e.g. from output.xml).
+        Returns the new row id, used as run_id for its test_case_results.
+        """
+        if not self.connect_db():
+            raise ConnectionError("No database connection available for recording the test run.")
+
+        try:
+            sql = """
+                INSERT INTO test_execution_reports (name, execution_start_time, execution_end_time, execution_status)
+                VALUES (%s, %s, %s, %s)
+            """
+            self.cursor.execute(sql, (name, start_time, end_time, status or self.execution_status_end))
+            self.connection.commit()
+            return self.cursor.lastrowid
+
+        finally:
+            self.close_db()
+
+    def update_test_run(self, run_id, start_time, end_time, status):
+        """
+        Complete a test_execution_reports row created by insert_test_run() with the run's timing and status.
+        """
+        if not self.connect_db():
+            raise ConnectionError("No database connection available for updating the test run.")
+
+        try:
+            sql = """
+                UPDATE test_execution_reports
+                SET execution_start_time = %s, execution_end_time = %s, execution_status = %s
+                WHERE id = %s
+            """
+            self.cursor.execute(sql, (start_time, end_time, status, run_id))
+            self.connection.commit()
+
+        finally:
+            self.close_db()
+
+    def save_test_results(self, run_id, records):
+        """
+        Insert a batch of per-test result records into test_case_results with one executemany.
+
+        Args:
+            run_id (int): test_execution_reports id the results belong to (or None).
+            records (list): Dicts with suite, name, long_name, status, start_time, elapsed_seconds,
+                tags (list), test_case_ids (list) and message.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        if not records:
+            return 0
+        if not self.connect_db():
+            raise ConnectionError("No database connection available for saving test results.")
+
+        sql = """
+            INSERT INTO test_case_results (run_id, suite, name, long_name, status, start_time, elapsed_seconds,
+                                           tags, test_case_ids, message)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        rows = [
+            (run_id, record["suite"][:255], record["name"][:255], record["long_name"][:1024], record["status"],
+             record["start_time"], record["elapsed_seconds"], ", ".join(record["tags"])[:1024],
+             ", ".join(record["test_case_ids"])[:255], record["message"])
+            for record in records
+        ]
+        try:
+            self.cursor.executemany(sql, rows)
+            self.connection.commit()
+            return len(rows)
+
+        finally:
+            self.close_db()
+
+    def save_suite_results(self, run_id, records):
+        """
+        Insert a batch of per-suite result records into suite_results with one executemany.
+
+        Args:
+            run_id (int): test_execution_reports id the results belong to (or None).
+            records (list): Dicts with name, long_name, source, status, start_time, end_time,
+                elapsed_seconds, passed, failed, skipped and message.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        if not records:
+            return 0
+        if not self.connect_db():
+            raise ConnectionError("No database connection available for saving suite results.")
+
+        sql = """
+            INSERT INTO suite_results (run_id, name, long_name, source, status, start_time, end_time,
+                                       elapsed_seconds, passed, failed, skipped, message)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        rows = [
+            (run_id, record["name"][:255], record["long_name"][:1024], (record["source"] or "")[:1024],
+             record["status"], record["start_time"], record["end_time"], record["elapsed_seconds"],
+             record["passed"], record["failed"], record["skipped"], record["message"])
+            for record in records
+        ]
+        try:
+            self.cursor.executemany(sql, rows)
+            self.connection.commit()
+            return len(rows)
+
+        finally:
+            self.close_db()
+
+    def _query(self, sql, params=()):
+        """
+        Run a read query on a pooled connection and return its rows as dictionaries.
+        """
+        if not self.connect_db():
+            raise ConnectionError("No database connection available for querying test results.")
+
+        try:
+            self.cursor.execute(sql, params)
+            columns = [column[0] for column in self.cursor.description]
+            return [
+                {column: float(value) if isinstance(value, Decimal) else value for column, value in zip(columns, row)}
+                for row in self.cursor.fetchall()
+            ]
+
+        finally:
+            self.close_db()
+
+    def _latest_run_ids(self, run_id=None):
+        """
+        (run_id, previous run_id) among runs that have test results; run_id defaults to the latest one.
+        """
+        if run_id is None:
+            run_id = self._query("SELECT MAX(run_id) AS run_id FROM test_case_results")[0]["run_id"]
+        previous = self._query("SELECT MAX(run_id) AS run_id FROM test_case_results WHERE run_id < %s",
+                               (run_id or 0,))[0]["run_id"]
+        return run_id, previous
+
+    def get_slowest_tests(self, limit=10, runs=5):
+        """
+        Slowest tests over the last `runs` runs, by average duration.
+
+        Returns:
+            list: Dicts with long_name, samples, avg_seconds, max_seconds and failures.
+        """
+        sql = """
+            SELECT r.long_name, COUNT(*) AS samples, AVG(r.elapsed_seconds) AS avg_seconds,
+                   MAX(r.elapsed_seconds) AS max_seconds, SUM(r.status = 'FAIL') AS failures
+            FROM test_case_results r
+            JOIN (SELECT DISTINCT run_id FROM test_case_results
+                  WHERE run_id IS NOT NULL ORDER BY run_id DESC LIMIT %s) recent ON recent.run_id = r.run_id
+            GROUP BY r.long_name
+            ORDER BY avg_seconds DESC
+            LIMIT %s
+        """
+        return self._query(sql, (int(runs), int(limit)))
+
+    def get_regressions(self, run_id=None, baseline_run_id=None):
+        """
+        Tests that failed in a run but passed in the baseline run (defaults: latest run and the one before it).
+        When a run holds several results for a test (e.g. a pabot rerun), the last one counts.
+
+        Returns:
+            list: Dicts with long_name, message, elapsed_seconds, run_id and baseline_run_id.
+        """
+        run_id, previous = self._latest_run_ids(run_id)
+        baseline_run_id = baseline_run_id or previous
+        if not run_id or not baseline_run_id:
+            print("Need two runs with test results to compare.")
+            return []
+
+        sql = """
+            SELECT cur.long_name, cur.message, cur.elapsed_seconds, %s AS run_id, %s AS baseline_run_id
+            FROM (SELECT MAX(id) AS id FROM test_case_results WHERE run_id = %s GROUP BY long_name) cur_last
+            JOIN test_case_results cur ON cur.id = cur_last.id
+            JOIN test_case_results base ON base.run_id = %s AND base.long_name = cur.long_name
+            JOIN (SELECT MAX(id) AS id FROM test_case_results WHERE run_id = %s GROUP BY long_name) base_last
+                ON base_last.id = base.id
+            WHERE cur.status = 'FAIL' AND base.status = 'PASS'
+            ORDER BY cur.long_name
+        """
+        return self._query(sql, (run_id, baseline_run_id, run_id, baseline_run_id, baseline_run_id))
+
+    def get_duration_regressions(self, run_id=None, runs=5, factor=1.5, min_seconds=1.0):
+        """
+        Passing tests of a run that took `factor` times longer than their average over the previous `runs` runs.
+
+        Returns:
+            list: Dicts with long_name, elapsed_seconds, avg_seconds and ratio, slowest ratio first.
+        """
+        run_id, _ = self._latest_run_ids(run_id)
+        if not run_id:
+            return []
+
+        sql = """
+            SELECT cur.long_name, cur.elapsed_seconds, history.avg_seconds,
+                   cur.elapsed_seconds / history.avg_seconds AS ratio
+            FROM (SELECT MAX(id) AS id FROM test_case_results WHERE run_id = %s GROUP BY long_name) cur_last
+            JOIN test_case_results cur ON cur.id = cur_last.id
+            JOIN (SELECT r.long_name, AVG(r.elapsed_seconds) AS avg_seconds
+                  FROM test_case_results r
+                  JOIN (SELECT DISTINCT run_id FROM test_case_results
+                        WHERE run_id < %s ORDER BY run_id DESC LIMIT %s) recent ON recent.run_id = r.run_id
+                  WHERE r.status = 'PASS'
+                  GROUP BY r.long_name) history ON history.long_name = cur.long_name
+            WHERE cur.status = 'PASS' AND cur.elapsed_seconds >= %s
+              AND cur.elapsed_seconds > history.avg_seconds * %s
+            ORDER BY ratio DESC
+        """
+        return self._query(sql, (run_id, run_id, int(runs), float(min_seconds), float(factor)))
+
+    @staticmethod
+    def _user_store_paths(excel_path):
+        """
+        Resolve the Excel path, its append-only CSV store and the lock file under utils/.
+        """
+        # Step 1: Define the directory where the files are stored
+        directory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils'))
+        os.makedirs(directory, exist_ok=True)  # Step 2: Create the directory if it doesn't exist
+
+        # Step 3: The CSV store sits next to the workbook with the same base name
+        full_excel_path = os.path.join(directory, os.path.basename(excel_path))
+        store_path = os.path.splitext(full_excel_path)[0] + '.csv'
+        return full_excel_path, store_path, store_path + '.lock'
+
+    @staticmethod
+    def _append_rows_to_store(excel_path, rows):
+        """
+        Append rows to the CSV store behind the given Excel path.
+        Each append is O(1) and guarded by a file lock so parallel pabot workers never interleave rows.
+        The first append seeds the store from an existing workbook so earlier entries are kept.
+        Returns the store path.
+        """
+        full_excel_path, store_path, lock_path = TestRunManager._user_store_paths(excel_path)
+
+        with _filelock.FileLock(lock_path):
+            # Step 1: Seed a new store with headers (and legacy workbook rows, if any)
+            if not os.path.exists(store_path):
+                seed_rows = [TestRunManager.EXCEL_HEADERS]
+                if os.path.exists(full_excel_path):
+                    workbook = _openpyxl.load_workbook(full_excel_path, read_only=True)
+                    seed_rows = [list(row) for row in workbook.active.iter_rows(values_only=True)] or seed_rows
+                    workbook.close()
+                with open(store_path, 'w', newline='', encoding='utf-8') as store:
+                    csv.writer(store).writerows(seed_rows)
+
+            # Step 2: Append the new rows at the end of the file
+            with open(store_path, 'a', newline='', encoding='utf-8') as store:
+                csv.writer(store).writerows(rows)
+
+        return store_path
+
     @staticmethod
     def save_user_data_to_excel(firstname, lastname, email, telephone, password, confirm_password, excel_path):
         """
-        Save user registration data into an Excel file.
-        Appends to existing file; does not overwrite previous entries.
+        Save user registration data into the append-only store behind the Excel file.
+        Appends to existing data; does not overwrite previous entries.
+        Use export_user_data_to_excel() to materialize the .xlsx file.
         """
         try:
-            # Step 1: Define the directory where the Excel file will be stored
-            directory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils'))
-            os.makedirs(directory, exist_ok=True)  # Step 2: Create the directory if it doesn't exist
-
-            # Step 3: Create full path to Excel file
-            full_path = os.path.join(directory, os.path.basename(excel_path))
-
-            # Step 4: If Excel file exists, load it; otherwise, create a new one with headers
-            if os.path.exists(full_path):
-                workbook = openpyxl.load_workbook(full_path)
-                sheet = workbook.active
-            else:
-                workbook = openpyxl.Workbook()
-                sheet = workbook.active
-                # Add headers only once when creating a new file
-                sheet.append(
-                    ['First Name', 'Last Name', 'Email', 'Telephone', 'Password', 'Confirm Password', 'Created At'])
-
-            # Step 5: Append the user data to the next available row
-            sheet.append([
-                firstname,
-                lastname,
-                email,
-                telephone,
-                password,
-                confirm_password,
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            ])
+            row = [firstname, lastname, email, telephone, password, confirm_password,
+                   datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+            store_path = TestRunManager._append_rows_to_store(excel_path, [row])
+            print(f"User credentials saved to store: {store_path}")
 
-            # Step 6: Save the updated workbook
-            workbook.save(full_path)
-            print(f"User credentials saved to Excel: {full_path}")
+            return {"status": "success", "message": "User data saved successfully.", "file_path": store_path}
 
-            return {"status": "error", "message": "User data saved successfully to Excel.", "file_path": None}
+        except Exception as e:
+            error_message = f"[ERROR] Failed to save user data to Excel store: {e}"
+            print(error_message)
+            return {"status": "error", "message": str(e), "file_path": None}
+
+    @staticmethod
+    @keyword("Export Registered Users To Excel")
+    def export_user_data_to_excel(excel_path):
+        """
+        Materialize the Excel file from the append-only CSV store.
+        The workbook is written in streaming (write-only) mode and swapped in atomically.
+        """
+        try:
+            # Step 0: Rows still queued in memory for this workbook go to the store first
+            TestRunManager._flush_excel_buffer(excel_path)
+
+            full_excel_path, store_path, lock_path = TestRunManager._user_store_paths(excel_path)
+            if not os.path.exists(store_path):
+                message = f"No user data store found: {store_path}"
+                print(message)
+                return {"status": "error", "message": message, "file_path": None}
+
+            with _filelock.FileLock(lock_path):
+                # Step 1: Stream the CSV rows into a write-only workbook
+                workbook = _openpyxl.Workbook(write_only=True)
+                sheet = workbook.create_sheet()
+                row_count = 0
+                with open(store_path, 'r', newline='', encoding='utf-8') as store:
+                    for row in csv.reader(store):
+                        sheet.append(row)
+                        row_count += 1
+
+                # Step 2: Save to a temporary file and replace the workbook in one step
+                temp_path = full_excel_path + '.tmp'
+                workbook.save(temp_path)
+                os.replace(temp_path, full_excel_path)
+
+            message = f"Exported {max(row_count - 1, 0)} user record(s) to Excel: {full_excel_path}"
+            print(message)
+            return {"status": "success", "message": message, "file_path": full_excel_path}
 
         except Exception as e:
-            error_message = f"[ERROR] Failed to save user data to Excel: {e}"
+            error_message = f"[ERROR] Failed to export user data to Excel: {e}"
             print(error_message)
             return {"status": "error", "message": str(e), "file_path": None}
 
-    def save_user_data_to_db(self, firstname, lastname, email, telephone, password, confirm_password):
+    @staticmethod
+    def _flush_excel_buffer(excel_path):
         """
-        Save user registration data into the MySQL database.
-        Ensures database and table creation before insertion.
-        Returns a dictionary with success status and message.
+        Append the rows queued for one Excel store (see buffer_user_data_for_excel).
+        Rows are re-queued and the error is raised when the append fails.
+        """
+        cls = TestRunManager
+        with cls._user_buffer_lock:
+            rows = cls._excel_user_buffer.pop(excel_path, [])
+            if not rows:
+                return 0
+            try:
+                cls._append_rows_to_store(excel_path, rows)
+            except Exception:
+                cls._excel_user_buffer.setdefault(excel_path, [])[:0] = rows
+                raise
+            if not cls._db_user_buffer and not cls._excel_user_buffer:
+                cls._user_buffer_oldest = None
+            return len(rows)
+
+    def _register_user_buffer_exit_hook(self):
+        """
+        Register a one-time interpreter-exit flush so queued records are never dropped.
+        """
+        cls = type(self)
+        if not cls._user_buffer_exit_hook:
+            atexit.register(self.flush_user_data)
+            cls._user_buffer_exit_hook = True
+
+    def _user_buffer_due(self):
+        """
+        Check whether the pending records reached the size or time threshold.
+        """
+        cls = type(self)
+        pending = self._user_buffer_pending()
+        elapsed = time.monotonic() - cls._user_buffer_oldest if cls._user_buffer_oldest is not None else 0
+        return pending >= self.buffer_batch_size or elapsed >= self.buffer_flush_interval
+
+    def _user_buffer_pending(self):
+        cls = type(self)
+        return len(cls._db_user_buffer) + sum(len(rows) for rows in cls._excel_user_buffer.values())
+
+    def _mark_user_buffer_queued(self):
+        """
+        Start the flush interval when a record goes into an empty buffer (not at import time).
+        """
+        cls = type(self)
+        if cls._user_buffer_oldest is None:
+            cls._user_buffer_oldest = time.monotonic()
+
+    def buffer_user_data_for_db(self, firstname, lastname, email, telephone, password, confirm_password):
+        """
+        Queue user registration data for a batched insert into the 'registered_users' table.
+        Flushes when the size or time threshold is reached; otherwise at teardown or interpreter exit.
+        """
+        cls = type(self)
+        with cls._user_buffer_lock:
+            # Step 1: Queue the record
+            self._mark_user_buffer_queued()
+            cls._db_user_buffer.append((firstname, lastname, email, telephone, password, confirm_password))
+            self._register_user_buffer_exit_hook()
+            pending = len(cls._db_user_buffer)
+
+            # Step 2: Flush if a threshold was reached; report only the DB outcome to this caller
+            if self._user_buffer_due():
+                return self.flush_user_data()["db"]
+
+        message = f"User credentials queued for DB: {firstname} {lastname} ({pending} pending)"
+        print(message)
+        return {"success": True, "message": message}
+
+    def buffer_user_data_for_excel(self, firstname, lastname, email, telephone, password, confirm_password,
+                                   excel_path):
         """
+        Queue user registration data for a batched append to the store behind the Excel file.
+        Flushes when the size or time threshold is reached; otherwise at teardown or interpreter exit.
+        """
+        cls = type(self)
+        with cls._user_buffer_lock:
+            # Step 1: Queue the row, stamped with the registration time
+            self._mark_user_buffer_queued()
+            cls._excel_user_buffer.setdefault(excel_path, []).append([
+                firstname, lastname, email, telephone, password, confirm_password,
+                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            ])
+            self._register_user_buffer_exit_hook()
+
+            # Step 2: Flush if a threshold was reached; report only the Excel outcome to this caller
+            if self._user_buffer_due():
+                result = self.flush_user_data()["excel"]
+                return {"status": "success" if result["success"] else "error", "message": result["message"],
+                        "file_path": excel_path}
+
+        return {"status": "success", "message": "User data queued for Excel.", "file_path": excel_path}
+
+    def _flush_db_records(self, records):
+        """
+        Insert queued records with a single executemany.
+        Falls back to row-by-row inserts when the batch hits a duplicate email so the other rows are kept.
+        Returns (inserted_count, failed_messages).
+        """
+        sql = """
+            INSERT INTO registered_users (firstname, lastname, email, telephone, password, confirm_password)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        # Step 1: Borrow a pooled connection
+        if not self.connect_db():
+            raise ConnectionError("No database connection available for flushing user data.")
+
         try:
-            # Step 1: Connect without specifying database to create DB if needed
-            temp_connection = mysql.connector.connect(
-                user=self.database_username,
-                password=self.database_password,
-                host=self.database_host,
-                port=int(self.database_port),
-                auth_plugin="mysql_native_password"
-            )
-            temp_cursor = temp_connection.cursor()
+            # Step 2: Batch insert
+            try:
+                self.cursor.executemany(sql, records)
+                self.connection.commit()
+                return len(records), []
+            except _mysql.IntegrityError:
+                self.connection.rollback()
+
+            # Step 3: Retry row by row to isolate the duplicates
+            inserted, failed = 0, []
+            for record in records:
+                try:
+                    self.cursor.execute(sql, record)
+                    inserted += 1
+                except _mysql.IntegrityError as ie:
+                    failed.append(f"Duplicate email entry: {record[2]} - {ie}")
+            self.connection.commit()
+            return inserted, failed
 
-            # Step 2: Create the database if it does not exist
-            temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database_name}")
-            temp_cursor.close()
-            temp_connection.close()
+        finally:
+            self.close_db()
 
-            # Step 3: Now connect to the actual target database
-            self.connection = mysql.connector.connect(
-                user=self.database_username,
-                password=self.database_password,
-                host=self.database_host,
-                port=int(self.database_port),
-                database=self.database_name,
-                auth_plugin="mysql_native_password"
-            )
-            self.cursor = self.connection.cursor()
-            print("Database connection successful.")
+    def flush_user_data(self):
+        """
+        Write all queued user records: one executemany for the DB and one append per Excel store.
+        Records whose write fails for a connection/IO reason are re-queued for the next flush.
+        Returns a dictionary with overall success, message and row counts, plus the outcome of each
+        sink under "db" and "excel" (success, message) so callers only see errors of their own sink.
+        """
+        cls = type(self)
+        with cls._user_buffer_lock:
+            # Step 1: Take ownership of the pending records
+            db_records, cls._db_user_buffer = cls._db_user_buffer, []
+            excel_rows, cls._excel_user_buffer = cls._excel_user_buffer, {}
+            cls._user_buffer_oldest = None
+
+            db_errors, excel_errors = [], []
+            db_inserted = 0
+            excel_written = 0
+
+            # Step 2: Flush DB records
+            if db_records:
+                try:
+                    db_inserted, failed = self._flush_db_records(db_records)
+                    db_errors.extend(failed)
+                except Exception as e:
+                    cls._db_user_buffer[:0] = db_records
+                    db_errors.append(f"Failed to flush {len(db_records)} user record(s) to DB: {e}")
+
+            # Step 3: Flush Excel rows, one locked append per store
+            for excel_path, rows in excel_rows.items():
+                try:
+                    store_path = self._append_rows_to_store(excel_path, rows)
+                    excel_written += len(rows)
+                    print(f"{len(rows)} user credential(s) saved to store: {store_path}")
+                except Exception as e:
+                    cls._excel_user_buffer.setdefault(excel_path, [])[:0] = rows
+                    excel_errors.append(f"Failed to flush {len(rows)} user record(s) to Excel: {e}")
+
+            # Step 4: Re-queued records start a new flush interval
+            if self._user_buffer_pending():
+                cls._user_buffer_oldest = time.monotonic()
+
+        def outcome(sink, rows, sink_errors):
+            message = f"Flushed {rows} {sink} row(s)."
+            return {"success": not sink_errors,
+                    "message": f"[ERROR] {message} " + " | ".join(sink_errors) if sink_errors else message}
+
+        errors = db_errors + excel_errors
+        message = f"Flushed user data: {db_inserted} DB row(s), {excel_written} Excel row(s)."
+        if errors:
+            message = f"[ERROR] {message} " + " | ".join(errors)
+        print(message)
+        return {"success": not errors, "message": message, "db_rows": db_inserted, "excel_rows": excel_written,
+                "db": outcome("DB", db_inserted, db_errors), "excel": outcome("Excel", excel_written, excel_errors)}
 
-            # Step 4: Create table if not exists
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS registered_users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    firstname VARCHAR(100) NOT NULL,
-                    lastname VARCHAR(100) NOT NULL,
-                    email VARCHAR(255) NOT NULL UNIQUE,
-                    telephone VARCHAR(15),
-                    password TEXT NOT NULL,
-                    confirm_password TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+    def save_user_data_to_db(self, firstname, lastname, email, telephone, password, confirm_password):
+        """
+        Save user registration data into the MySQL database.
+        Uses a pooled connection; the database and table are created once per process by get_db_pool().
+        Returns a dictionary with success status and message.
+        """
+        # Step 1: Borrow a pooled connection
+        if not self.connect_db():
+            message = "[ERROR] Failed to save user data to database: no database connection."
+            print(message)
+            return {"success": False, "message": message}
 
-            # Step 5: Insert user data
+        try:
+            # Step 2: Insert user data
             self.cursor.execute("""
                 INSERT INTO registered_users (firstname, lastname, email, telephone, password, confirm_password)
                 VALUES (%s, %s, %s, %s, %s, %s)
@@ -356,7 +990,7 @@ class TestRunManager:
             print(message)
             return {"success": True, "message": message}
 
-        except mysql.connector.IntegrityError as ie:
+        except _mysql.IntegrityError as ie:
             message = f"[ERROR] Duplicate email entry: {email} - {ie}"
             print(message)
             return {"success": False, "message": message}
@@ -367,116 +1001,277 @@ class TestRunManager:
             return {"success": False, "message": message}
 
         finally:
-            # Step 6: Only close if the connection was successfully created
-            if hasattr(self, "connection") and self.connection and self.connection.is_connected():
-                self.cursor.close()
-                self.connection.close()
+            # Step 3: Return the connection to the pool
+            self.close_db()
 
-    @keyword("Fetch Registration Login Link")
-    def get_login_link_from_email(self, email_user, email_pass):
+    def _search_new_uids(self, mail, email_user, folder, criteria):
         """
-        Searches accessible email folders for a message with the expected subject.
-        Extracts login link and sender email.
+        Run a server-side UID SEARCH limited to messages newer than the last UID seen for the same search.
+        Returns the matching UIDs (oldest first) and the folder state to remember once they are processed.
+        """
+        # Step 1: Read the folder UIDVALIDITY; a new value invalidates remembered UIDs
+        uid_validity = (mail.response("UIDVALIDITY")[1] or [b"0"])[0]
+        state_key = (self.imap_server, email_user.lower(), folder, tuple(criteria))
+        seen_validity, last_uid = type(self)._imap_seen_uids.get(state_key, (None, 0))
+        if seen_validity != uid_validity:
+            last_uid = 0
+
+        # Step 2: Only ask for UIDs above the high-water mark
+        search_criteria = list(criteria)
+        if last_uid:
+            search_criteria += ["UID", f"{last_uid + 1}:*"]
+
+        result, data = mail.uid("SEARCH", None, *search_criteria)
+        if result != "OK":
+            return [], (state_key, uid_validity, last_uid)
+
+        # "n:*" always matches the newest message, so drop anything already seen
+        uids = sorted(int(uid) for uid in (data[0] or b"").split() if int(uid) > last_uid)
+        return uids, (state_key, uid_validity, max(uids, default=last_uid))
+
+    def _find_email(self, email_user, email_pass, subject=None, recipient=None, pattern=None, since_days=1):
+        """
+        Searches accessible email folders for the newest unseen message with the expected subject
+        whose body matches the link pattern.
 
-        Args:
-            email_user (str): Gmail address.
-            email_pass (str): Gmail App Password (not your actual password).
+        Filtering happens on the server (SUBJECT/TO/SINCE) and the highest UID seen per folder
+        is remembered per search, so repeated polls only fetch messages that arrived since the last call.
+        Only the needed header fields and BODY.PEEK[TEXT] are fetched, so full RFC822 messages are
+        never downloaded and messages are not marked as seen.
 
         Returns:
-            tuple: (login_link, sender_email) if found, otherwise (None, None)
+            dict: {link, sender, subject, sent_at, folder} if found, otherwise None
         """
-        mail = None
+        # Strip any invisible characters
+        email_user = email_user.strip()
+        email_pass = email_pass.strip()
         try:
-            # Step 1: Connect and log in to Gmail IMAP
-            mail = imaplib.IMAP4_SSL(self.imap_server)
-
-            # Strip any invisible characters
-            email_user = email_user.strip()
-            email_pass = email_pass.strip()
-
-            mail.login(email_user, email_pass)
-            print("Login successful")
+            # Step 1: Reuse (or open) the cached IMAP session for this account
+            mail = imap_sessions.get_session(self.imap_server, email_user, email_pass)
+            subject = subject or self.REGISTRATION_EMAIL_SUBJECT
+            recipient = (recipient or email_user).strip()
+            pattern = pattern or self.LOGIN_LINK_PATTERN
 
             # Step 2: Get available folders
             status, folders = mail.list()
             if status != "OK":
                 print("[ERROR] Unable to list folders.")
-                return None, None
+                return None
+
+            criteria = ["SUBJECT", _imap_quote(subject), "TO", _imap_quote(recipient),
+                        "SINCE", _imap_since(since_days)]
 
             for folder_bytes in folders:
-                # Extract folder name from response
-                folder = folder_bytes.decode().split(' "/" ')[-1].strip('"')
-                print(f"Checking folder: {folder}")
+                # Extract folder name from response; skip containers that cannot be selected
+                folder_line = folder_bytes.decode()
+                if "\\Noselect" in folder_line:
+                    continue
+                folder = folder_line.split(' "/" ')[-1].strip('"')
 
-                # Step 3: Select folder safely
-                status, _ = mail.select(f'"{folder}"')
+                # Step 3: Select folder read-only
+                status, _ = mail.select(f'"{folder}"', readonly=True)
                 if status != "OK":
                     print(f"[ERROR] Cannot select folder: {folder}")
                     continue
 
-                # Step 4: Search for emails with the given subject
-                result, data = mail.search(None, 'ALL')
-                if result != "OK":
-                    print(f"[ERROR] No matching emails found in {folder}")
-                    continue
-
-                email_ids = data[0].split()[-20:]
-
-                for eid in reversed(email_ids):  # Check latest first
-                    # Fetch full email
-                    result, msg_data = mail.fetch(eid, "(RFC822)")
-                    if result != "OK":
-                        continue
-
-                    raw_email = msg_data[0][1]
-                    msg = email.message_from_bytes(raw_email)
-
-                    # Decode subject
-                    raw_subject = msg.get("Subject", "")
-                    decoded_subject, enc = decode_header(raw_subject)[0]
-                    if isinstance(decoded_subject, bytes):
-                        decoded_subject = decoded_subject.decode(enc or "utf-8", errors="ignore")
-
-                    print(f"Found subject: {decoded_subject}")
-                    if "thank you for registering" not in decoded_subject.lower():
-                        continue
-
-                    from_email = msg.get("From")
-                    sender_email = email.utils.parseaddr(from_email)
-                    print(f"Sender email found: {sender_email}")
-
-                    # Extract body
-                    body = ""
-                    if msg.is_multipart():
-                        for part in msg.walk():
-                            if part.get_content_type() in ["text/plain", "text/html"] and "attachment" not in str(
-                                    part.get("Content-Disposition")):
-                                charset = part.get_content_charset() or "utf-8"
-                                body = part.get_payload(decode=True).decode(charset, errors="ignore")
-                                break
-                    else:
-                        charset = msg.get_content_charset() or "utf-8"
-                        body = msg.get_payload(decode=True).decode(charset, errors="ignore")
-
-                    print("Body preview:\n", body[:300])  # Optional preview
-
-                    # Find login link
-                    match = re.search(r"https?://\S+?route=account/login", body)
-                    if match:
-                        login_link = match.group(0)
-                        print(f"Login link found: {login_link}")
-                        return login_link, sender_email
+                # Step 4: Server-side search for new matching messages only
+                uids, (state_key, uid_validity, high_uid) = self._search_new_uids(mail, email_user, folder, criteria)
+                print(f"Checking folder: {folder} ({len(uids)} new matching message(s))")
+
+                # UIDs not inspected yet; a failed FETCH leaves its UID here so the next poll retries it
+                pending = set(uids)
+                mark = None
+                try:
+                    for uid in reversed(uids):  # Check latest first
+                        # Fetch selected headers and body text without setting \Seen
+                        result, msg_data = mail.uid("FETCH", str(uid), _IMAP_MESSAGE_PARTS)
+                        if result != "OK" or not msg_data:
+                            print(f"[WARNING] FETCH of UID {uid} in {folder} failed; it is checked again next time.")
+                            continue
+                        pending.discard(uid)
+
+                        msg = _message_from_fetch(msg_data)
+                        decoded_subject = _decode_subject(msg)
+                        print(f"Found subject: {decoded_subject}")
+                        if subject.lower() not in decoded_subject.lower():
+                            continue
+
+                        sender_email = parseaddr(msg.get("From"))
+                        print(f"Sender email found: {sender_email}")
+
+                        body = _extract_body(msg)
+                        print("Body preview:\n", body[:300])  # Optional preview
+
+                        # Find login link
+                        match = re.search(pattern, body)
+                        if match:
+                            login_link = match.group(0)
+                            print(f"Login link found: {login_link}")
+                            # Older UIDs were never checked and this one matched: the next call must see it again
+                            mark = uid - 1
+                            return {
+                                "link": login_link,
+                                "sender": sender_email,
+                                "subject": decoded_subject,
+                                "sent_at": _message_sent_at(msg),
+                                "folder": folder,
+                            }
+                finally:
+                    # Remember the high-water mark so the next poll skips the messages checked without a match.
+                    # After a failed FETCH or an error, stop below the oldest UID that was not inspected.
+                    if mark is None:
+                        mark = min(pending) - 1 if pending else high_uid
+                    type(self)._imap_seen_uids[state_key] = (uid_validity, mark)
 
             print("No login link found in any folder.")
-            return None, None
+            return None
 
         except Exception as e:
             print(f"[ERROR] Email check failed: {e}")
-            return None, None
+            # The connection may be mid-command; drop it so the next call reconnects
+            imap_sessions.discard(self.imap_server, email_user)
+            return None
 
         finally:
-            if mail:
-                mail.logout()
+            imap_sessions.touch(self.imap_server, email_user)
+
+    @keyword("Fetch Registration Login Link")
+    def get_login_link_from_email(self, email_user, email_pass, subject=None, recipient=None, since_days=1):
+        """
+        Searches accessible email folders for a message with the expected subject.
+        Extracts login link and sender email.
+
+        Args:
+            email_user (str): Gmail address.
+            email_pass (str): Gmail App Password (not your actual password).
+            subject (str): Subject text to search for. Defaults to the registration subject.
+            recipient (str): Recipient address to search for. Defaults to email_user.
+            since_days (int): Only consider messages received within this many days.
+
+        Returns:
+            tuple: (login_link, sender_email) if found, otherwise (None, None)
+        """
+        found = self._find_email(email_user, email_pass, subject, recipient, since_days=since_days)
+        if not found:
+            return None, None
+        return found["link"], found["sender"]
+
+    @keyword("Wait For Email")
+    def wait_for_email(self, email_user, email_pass, subject=None, recipient=None, regex=None, timeout="60s",
+                       max_backoff="16s"):
+        """
+        Waits until an email matching subject/recipient/regex arrives, returning as soon as it is found.
+
+        Between searches the shared IMAP session waits with IDLE (woken by the server on delivery),
+        bounded by an exponential backoff of 1s, 2s, 4s ... up to `max_backoff`, so servers without
+        IDLE are polled quickly at first and less often later.
+
+        Args:
+            email_user (str): Gmail address.
+            email_pass (str): Gmail App Password.
+            subject (str): Subject text to search for. Defaults to the registration subject.
+            recipient (str): Recipient address to search for. Defaults to email_user.
+            regex (str): Pattern the body must contain; the first match is returned as the link.
+                Defaults to the account login link.
+            timeout (str): Robot Framework time string or seconds.
+            max_backoff (str): Longest wait between two searches.
+
+        Returns:
+            dict: found, link, sender, subject, attempts, waited_seconds and
+                delivery_latency_seconds (Date header to detection; None if unknown).
+        """
+        timeout = timestr_to_secs(timeout)
+        max_backoff = timestr_to_secs(max_backoff)
+        started = time.monotonic()
+        deadline = started + timeout
+        backoff = 1.0
+        attempts = 0
+        found = None
+
+        while True:
+            attempts += 1
+            found = self._find_email(email_user, email_pass, subject, recipient, regex)
+            remaining = deadline - time.monotonic()
+            if found or remaining <= 0:
+                break
+            # IDLE returns early on delivery; otherwise this is the backoff sleep
+            imap_sessions.wait_for_new_mail(self.imap_server, email_user.strip(), email_pass.strip(),
+                                            timeout=min(backoff, remaining))
+            backoff = min(backoff * 2, max_backoff)
+
+        waited = round(time.monotonic() - started, 3)
+        result = {
+            "found": bool(found),
+            "link": found["link"] if found else None,
+            "sender": found["sender"] if found else None,
+            "subject": found["subject"] if found else None,
+            "attempts": attempts,
+            "waited_seconds": waited,
+            "delivery_latency_seconds": None,
+        }
+        if found and found["sent_at"]:
+            latency = (datetime.now(found["sent_at"].tzinfo) - found["sent_at"]).total_seconds()
+            result["delivery_latency_seconds"] = round(max(latency, 0.0), 3)
+
+        print(f"Email {'found' if found else 'not found'} after {waited}s and {attempts} search(es); "
+              f"delivery latency: {result['delivery_latency_seconds']}s")
+        return result
+
+    @keyword("Wait For New Mail")
+    def wait_for_new_mail(self, email_user, email_pass, folder="INBOX", timeout="30s"):
+        """
+        Block on the cached IMAP session until new mail arrives in the folder or the timeout expires.
+        Uses IMAP IDLE when available, so callers wake up as soon as the server announces a message.
+
+        Args:
+            email_user (str): Gmail address.
+            email_pass (str): Gmail App Password.
+            folder (str): Folder to watch.
+            timeout (str): Robot Framework time string or seconds.
+
+        Returns:
+            bool: True if new mail was announced before the timeout.
+        """
+        return imap_sessions.wait_for_new_mail(self.imap_server, email_user.strip(), email_pass.strip(),
+                                               folder=folder, timeout=timestr_to_secs(timeout))
+
+    @keyword("Start Mail Sink")
+    def start_mail_sink(self, host=None, smtp_port=None, imap_port=None):
+        """
+        Starts the local SMTP/IMAP mail sink (or reuses the one already listening on the ports)
+        and points the email keywords at it by setting IMAP_SERVER and IMAP_SSL=False.
+        Defaults come from the [mail_sink] section of config.ini.
+
+        Returns:
+            dict: smtp_server and imap_server ('host:port') and owner flag.
+        """
+        settings = self.mail_sink_config
+        sink = mail_sink.start_mail_sink(host or settings["host"],
+                                         smtp_port if smtp_port is not None else settings["smtp_port"],
+                                         imap_port if imap_port is not None else settings["imap_port"])
+
+        # Remember the real mailbox so Stop Mail Sink can restore it
+        if "MAIL_SINK_PREVIOUS_IMAP_SERVER" not in os.environ:
+            os.environ["MAIL_SINK_PREVIOUS_IMAP_SERVER"] = os.getenv("IMAP_SERVER", "")
+            os.environ["MAIL_SINK_PREVIOUS_IMAP_SSL"] = os.getenv("IMAP_SSL", "")
+        os.environ["IMAP_SERVER"] = sink["imap_server"]
+        os.environ["IMAP_SSL"] = "False"
+        print(f"Email keywords now read from the mail sink at {sink['imap_server']} "
+              f"(OpenCart SMTP: {sink['smtp_server']})")
+        return sink
+
+    @keyword("Stop Mail Sink")
+    def stop_mail_sink(self):
+        """Stops the mail sink started by this process and restores the previous IMAP settings."""
+        imap_sessions.close_all()
+        mail_sink.stop_mail_sink()
+        if "MAIL_SINK_PREVIOUS_IMAP_SERVER" in os.environ:
+            for name in ("IMAP_SERVER", "IMAP_SSL"):
+                previous = os.environ.pop(f"MAIL_SINK_PREVIOUS_{name}")
+                if previous:
+                    os.environ[name] = previous
+                else:
+                    os.environ.pop(name, None)
 
     def store_user_data(self, username="tester", password="&lackMan123!", business_name="Demo", email_addr="demo@gmail.com"):
         """
@@ -500,6 +1295,9 @@ class TestRunManager:
         except Exception as e:
             print(f"[ERROR] Failed to store user data: {e}")
 
+        finally:
+            self.close_db()
+
     # def create_user_excel(self, firstname=None, lastname=None, email=None, telephone=None, password=None, confirm_password=None):
     #     try:
     #         wb = Workbook()
@@ -574,7 +1372,7 @@ class TestRunManager:
         """Zoom in using Ctrl + '+' shortcut."""
         try:
             for _ in range(2):  # Step 1: Simulate zoom in 2 times
-                pyautogui.hotkey('ctrl', '+')
+                _pyautogui.hotkey('ctrl', '+')
         except Exception as e:
             print(f"[ERROR] Failed to zoom in: {e}")
 
@@ -583,58 +1381,28 @@ class TestRunManager:
         """Zoom out using Ctrl + '-' shortcut."""
         try:
             for _ in range(2):  # Step 1: Simulate zoom out 2 times
-                pyautogui.hotkey('ctrl', '-')
+                _pyautogui.hotkey('ctrl', '-')
         except Exception as e:
             print(f"[ERROR] Failed to zoom out: {e}")
 
     def get_login_link(self, email_addr, password):
-        mail = None
+        """
+        Return the login link from the newest registration email in the inbox.
+        Headers are read with one batched FETCH (newest first) and only the first matching
+        message's body is downloaded.
+        """
         try:
             print("Running....")
-            mail = imaplib.IMAP4_SSL(self.imap_server)
-            mail.login(email_addr, password)
-            mail.select("inbox")
-
-            result, data = mail.search(None, '(FROM "info@opencart.com.gr")')
-            email_ids = data[0].split()
-            if not email_ids:
-                return None
-
-            emails_with_dates = []
-            for eid in email_ids:
-                result, msg_data = mail.fetch(eid, '(BODY[HEADER.FIELDS (DATE)])')
-                raw_date = msg_data[0][1].decode().strip().replace('Date: ', '')
-                email_date = email.utils.parsedate_to_datetime(raw_date)
-                emails_with_dates.append((eid, email_date))
-
-            sorted_emails = sorted(emails_with_dates, key=lambda x: x[1], reverse=True)
+            mail = imap_sessions.get_session(self.imap_server, email_addr, password)
+            mail.select("inbox", readonly=True)
 
-            for email_id, _ in sorted_emails:
-                result, data = mail.fetch(email_id, '(RFC822)')
-                raw_email = data[0][1]
-                msg = email.message_from_bytes(raw_email)
-
-                raw_subject = msg.get("Subject", "")
-                decoded_subject, enc = decode_header(raw_subject)[0]
-                if isinstance(decoded_subject, bytes):
-                    decoded_subject = decoded_subject.decode(enc or "utf-8", errors="ignore")
-
-                print(f"Found subject: {decoded_subject}")
-                if "thank you for registering" not in decoded_subject.lower():
-                    continue
-
-                body = ""
-                if msg.is_multipart():
-                    for part in msg.walk():
-                        if part.get_content_type() in ["text/plain", "text/html"] and "attachment" not in str(
-                                part.get("Content-Disposition")):
-                            charset = part.get_content_charset() or "utf-8"
-                            body = part.get_payload(decode=True).decode(charset, errors="ignore")
-                            break
-                else:
-                    charset = msg.get_content_charset() or "utf-8"
-                    body = msg.get_payload(decode=True).decode(charset, errors="ignore")
+            def is_registration_subject(subject):
+                print(f"Found subject: {subject}")
+                return self.REGISTRATION_EMAIL_SUBJECT in subject.lower()
 
+            sender = ["FROM", '"info@opencart.com.gr"']
+            for _, msg in imap_session.find_latest_messages(mail, sender, is_registration_subject):
+                body = _extract_body(msg)
                 print("Body preview:\n", body[:300])  # Optional preview
 
                 match = re.search(r'https?://\S+?route=account/login', body)
@@ -647,10 +1415,10 @@ class TestRunManager:
 
         except Exception as e:
             print(f"Error fetching email: {e}")
+            imap_sessions.discard(self.imap_server, email_addr)
             return None
         finally:
-            if mail:
-                mail.logout()
+            imap_sessions.touch(self.imap_server, email_addr)
 
 
 # Initialize and test the class
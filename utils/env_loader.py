@@ -1,12 +1,12 @@
 # utils/env_loader.py
 import os
-from dotenv import load_dotenv
+
+from config_service import config_service
 
 class EnvConfigLoader:
     def __init__(self):
-        # Load .env file from one directory above this file
-        env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-        load_dotenv(dotenv_path=env_path)
+        # Load .env file from one directory above this file (parsed once per process)
+        config_service.env()
 
     @staticmethod
     def get_email_config():
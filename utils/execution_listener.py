@@ -0,0 +1,231 @@
+# utils/execution_listener.py
+"""
+Robot Framework listener (API v3) that records every suite and test of a run in MySQL.
+
+A test_execution_reports row is the run; its id (run_id) links the per-test rows in
+test_case_results and the per-suite rows in suite_results. Records are queued by the listener
+methods and written by a background thread in executemany batches, so the database never sits
+on the test execution path.
+
+pabot starts one Robot process per worker. To group all workers under one run, create the run
+first and export its id; every listener then attaches to it instead of creating its own:
+
+    for /f %%i in ('python ..\\utils\\execution_listener.py start-run "OpenCart Regression"') do set TEST_RUN_ID=%%i
+    pabot --listener ..\\utils\\execution_listener.py ...
+    python ..\\utils\\execution_listener.py end-run %TEST_RUN_ID%
+
+Usage:
+    robot --listener utils/execution_listener.py page_objects/
+    robot --listener utils/execution_listener.py:100:10 ...       # batch_size:flush_interval (seconds)
+
+    python utils/execution_listener.py slowest --limit 20 --runs 5
+    python utils/execution_listener.py regressions [--run-id 42] [--baseline 41]
+"""
+import os
+import re
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+import contextlib
+from datetime import datetime, timedelta
+
+from custom_library import TestRunManager
+
+# Test case IDs written in documentation, e.g. "Test Case ID: TC_RF_001"
+TEST_CASE_ID_PATTERN = re.compile(r"\bTC_[A-Z0-9]+_\d+\b")
+
+RUN_ID_ENV = "TEST_RUN_ID"
+
+_CLOSE = object()
+
+
+def _times(result):
+    """(start datetime, end datetime, elapsed seconds) of a running.Result object (RF 7 and RF 6)."""
+    if hasattr(result, "start_time"):
+        elapsed = result.elapsed_time.total_seconds()
+        return result.start_time, result.end_time, elapsed
+    elapsed = result.elapsedtime / 1000.0
+    start = datetime.strptime(result.starttime, "%Y%m%d %H:%M:%S.%f") if result.starttime != "N/A" else None
+    return start, start + timedelta(seconds=elapsed) if start else None, elapsed
+
+
+class ExecutionListener:
+    """Queues suite/test results and writes them to MySQL in batches from a background thread."""
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, batch_size=50, flush_interval=5):
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        self.manager = TestRunManager()
+        self.run_id = int(os.environ[RUN_ID_ENV]) if os.environ.get(RUN_ID_ENV) else None
+        self.owns_run = self.run_id is None
+        self.depth = 0
+        self.failed_writes = 0
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="execution-listener-writer", daemon=True)
+        self._writer.start()
+
+    # --- Listener interface (Robot's thread) -----------------------------
+    def start_suite(self, data, result):
+        if self.depth == 0 and self.owns_run:
+            self._queue.put(("run_start", result.name))
+        self.depth += 1
+
+    def end_test(self, data, result):
+        start, _, elapsed = _times(result)
+        self._queue.put(("test", {
+            "suite": result.parent.name if result.parent else "",
+            "name": result.name,
+            "long_name": result.full_name if hasattr(result, "full_name") else result.longname,
+            "status": result.status,
+            "start_time": start,
+            "elapsed_seconds": round(elapsed, 3),
+            "tags": list(result.tags),
+            "test_case_ids": sorted(set(TEST_CASE_ID_PATTERN.findall(result.doc or ""))),
+            "message": result.message,
+        }))
+
+    def end_suite(self, data, result):
+        self.depth -= 1
+        start, end, elapsed = _times(result)
+        statistics = result.statistics
+        self._queue.put(("suite", {
+            "name": result.name,
+            "long_name": result.full_name if hasattr(result, "full_name") else result.longname,
+            "source": str(result.source) if result.source else "",
+            "status": result.status,
+            "start_time": start,
+            "end_time": end,
+            "elapsed_seconds": round(elapsed, 3),
+            "passed": statistics.passed,
+            "failed": statistics.failed,
+            "skipped": statistics.skipped,
+            "message": result.message,
+        }))
+        if self.depth == 0 and self.owns_run:
+            self._queue.put(("run_end", (start, end, result.status)))
+
+    def close(self):
+        self._queue.put(_CLOSE)
+        self._writer.join(timeout=60)
+        if self._writer.is_alive():
+            self._log("[WARNING] Result writer still busy after 60s; remaining records are dropped.")
+
+    # --- Writer thread ----------------------------------------------------
+    @staticmethod
+    def _log(message):
+        # Robot's console belongs to the main thread; write straight to the process stderr
+        print(f"[execution_listener] {message}", file=sys.__stderr__)
+
+    def _write_loop(self):
+        tests, suites = [], []
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0.01)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _CLOSE:
+                self._flush(tests, suites)
+                return
+            if item is not None:
+                kind, payload = item
+                if kind == "test":
+                    tests.append(payload)
+                elif kind == "suite":
+                    suites.append(payload)
+                elif kind == "run_start":
+                    self._start_run(payload)
+                elif kind == "run_end":
+                    # Everything of this run is queued already; write it before completing the run row
+                    self._flush(tests, suites)
+                    self._end_run(*payload)
+
+            # Flush on a full batch or when the interval has passed
+            if len(tests) + len(suites) >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush(tests, suites)
+                last_flush = time.monotonic()
+
+    def _start_run(self, name):
+        try:
+            self.run_id = self.manager.insert_test_run(name, start_time=datetime.now(),
+                                                       status=self.manager.execution_status_start)
+        except Exception as e:
+            self._log(f"[ERROR] Could not create the test run row: {e}")
+
+    def _end_run(self, start, end, status):
+        if self.run_id is None:
+            return
+        try:
+            self.manager.update_test_run(self.run_id, start, end, status)
+        except Exception as e:
+            self._log(f"[ERROR] Could not complete test run {self.run_id}: {e}")
+
+    def _flush(self, tests, suites):
+        """Write the pending records; on failure they are dropped (a test run never waits on the database)."""
+        for records, save in ((tests, self.manager.save_test_results), (suites, self.manager.save_suite_results)):
+            if not records:
+                continue
+            try:
+                save(self.run_id, records)
+            except Exception as e:
+                self.failed_writes += len(records)
+                self._log(f"[ERROR] Dropped {len(records)} result record(s): {e}")
+            records.clear()
+
+
+# Robot instantiates the class named like the module when the listener is given by path
+execution_listener = ExecutionListener
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test run records and queries for the execution listener.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start-run", help="Create a run row and print its id (export as TEST_RUN_ID)")
+    start.add_argument("name", nargs="?", default="OpenCart")
+
+    end = commands.add_parser("end-run", help="Complete a run row created by start-run")
+    end.add_argument("run_id", type=int)
+
+    slowest = commands.add_parser("slowest", help="Slowest tests by average duration")
+    slowest.add_argument("--limit", type=int, default=10)
+    slowest.add_argument("--runs", type=int, default=5, help="Number of most recent runs to average")
+
+    regressions = commands.add_parser("regressions", help="Tests that passed in the baseline run and fail now")
+    regressions.add_argument("--run-id", type=int)
+    regressions.add_argument("--baseline", type=int, help="Baseline run id (default: the previous run)")
+    regressions.add_argument("--runs", type=int, default=5, help="Runs averaged for duration regressions")
+    regressions.add_argument("--factor", type=float, default=1.5, help="Slowdown factor reported as a regression")
+
+    options = parser.parse_args(argv)
+    manager = TestRunManager()
+
+    if options.command == "start-run":
+        # Only the id on stdout, so batch files can capture it
+        with contextlib.redirect_stdout(sys.stderr):
+            run_id = manager.insert_start_time(options.name)
+        if not run_id:
+            return 1
+        print(run_id)
+    elif options.command == "end-run":
+        return 0 if manager.update_end_time(options.run_id) else 1
+    elif options.command == "slowest":
+        for row in manager.get_slowest_tests(options.limit, options.runs):
+            print(f"{row['avg_seconds']:>9.3f}s avg  {row['max_seconds']:>9.3f}s max  "
+                  f"{row['samples']:>3} runs  {int(row['failures'] or 0):>3} fail  {row['long_name']}")
+    else:
+        failures = manager.get_regressions(options.run_id, options.baseline)
+        slowdowns = manager.get_duration_regressions(options.run_id, options.runs, options.factor)
+        print(json.dumps({"failures": failures, "slowdowns": slowdowns}, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
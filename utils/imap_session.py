@@ -0,0 +1,281 @@
+# utils/imap_session.py
+import os
+import re
+import ssl
+import time
+import email
+import atexit
+import select
+import imaplib
+import threading
+from email.header import decode_header, make_header
+
+
+class ImapSessionCache:
+    """
+    Keeps one logged-in IMAP connection per (server, account) for the whole process.
+
+    - Sessions idle for longer than `keepalive_interval` are probed with NOOP before reuse.
+    - Dropped or broken sessions are transparently reconnected.
+    - wait_for_new_mail() uses IMAP IDLE (when the server supports it) so callers are
+      woken as soon as a message arrives instead of sleeping for a fixed interval.
+    """
+
+    def __init__(self, keepalive_interval=240, use_ssl=None):
+        """
+        Args:
+            keepalive_interval (int): Seconds of inactivity after which a session is probed with NOOP.
+            use_ssl (bool): Force SSL on/off. Defaults to the IMAP_SSL environment variable (True if unset).
+        """
+        self.keepalive_interval = keepalive_interval
+        self.use_ssl = use_ssl
+        self._sessions = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _split_server(server):
+        """Split 'host' or 'host:port' into (host, port or None)."""
+        host, _, port = (server or "").strip().partition(":")
+        return host, int(port) if port else None
+
+    def _ssl_enabled(self):
+        if self.use_ssl is not None:
+            return self.use_ssl
+        return os.getenv("IMAP_SSL", "True").strip().lower() not in ("false", "0", "no")
+
+    def _connect(self, server, user, password):
+        """Open and log in a new IMAP connection."""
+        host, port = self._split_server(server)
+        if self._ssl_enabled():
+            mail = imaplib.IMAP4_SSL(host, port or imaplib.IMAP4_SSL_PORT)
+        else:
+            mail = imaplib.IMAP4(host, port or imaplib.IMAP4_PORT)
+        mail.login(user, password)
+        print(f"IMAP session opened for {user} on {server}")
+        return mail
+
+    def get_session(self, server, user, password):
+        """
+        Return a live, logged-in IMAP connection for the account, reusing the cached one when possible.
+
+        Args:
+            server (str): IMAP host, optionally with ':port'.
+            user (str): Account login.
+            password (str): Account (app) password.
+
+        Returns:
+            imaplib.IMAP4: Authenticated connection; callers must not log it out.
+        """
+        key = (server, user.strip().lower())
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry:
+                mail, last_used = entry
+                try:
+                    # Probe sessions that sat idle long enough for the server to drop them
+                    if time.monotonic() - last_used >= self.keepalive_interval:
+                        mail.noop()
+                    self._sessions[key] = (mail, time.monotonic())
+                    return mail
+                except (imaplib.IMAP4.abort, imaplib.IMAP4.error, OSError) as e:
+                    print(f"IMAP session for {user} is no longer usable ({e}); reconnecting.")
+                    self._close(mail)
+
+            mail = self._connect(server, user.strip(), password.strip())
+            self._sessions[key] = (mail, time.monotonic())
+            return mail
+
+    def touch(self, server, user):
+        """Mark the cached session as just used."""
+        key = (server, user.strip().lower())
+        with self._lock:
+            if key in self._sessions:
+                self._sessions[key] = (self._sessions[key][0], time.monotonic())
+
+    def discard(self, server, user):
+        """Drop (and log out) the cached session, e.g. after a protocol error."""
+        key = (server, user.strip().lower())
+        with self._lock:
+            entry = self._sessions.pop(key, None)
+        if entry:
+            self._close(entry[0])
+
+    def close_all(self):
+        """Log out every cached session."""
+        with self._lock:
+            entries, self._sessions = list(self._sessions.values()), {}
+        for mail, _ in entries:
+            self._close(mail)
+
+    @staticmethod
+    def _close(mail):
+        try:
+            mail.logout()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _readable(mail, timeout):
+        """Wait until the connection has a line to read, honouring bytes imaplib or TLS already buffered."""
+        sock = mail.sock
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+
+        # A non-blocking peek only returns bytes already read ahead into imaplib's buffer
+        previous_timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            if mail.file.peek(1):
+                return True
+        except (BlockingIOError, ssl.SSLWantReadError):
+            pass
+        finally:
+            sock.settimeout(previous_timeout)
+
+        readable, _, _ = select.select([sock], [], [], max(timeout, 0))
+        return bool(readable)
+
+    def wait_for_new_mail(self, server, user, password, folder="INBOX", timeout=30):
+        """
+        Block until a new message arrives in the folder or the timeout expires.
+
+        Uses IMAP IDLE when the server advertises it; otherwise polls with NOOP once per second.
+
+        Args:
+            server (str): IMAP host, optionally with ':port'.
+            user (str): Account login.
+            password (str): Account (app) password.
+            folder (str): Folder to watch.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            bool: True if new mail was announced before the timeout.
+        """
+        mail = self.get_session(server, user, password)
+        try:
+            status, data = mail.select(f'"{folder}"', readonly=True)
+            if status != "OK":
+                print(f"[ERROR] Cannot select folder: {folder}")
+                return False
+            known_count = int(data[0] or 0)
+            deadline = time.monotonic() + float(timeout)
+
+            if "IDLE" not in mail.capabilities:
+                # Fallback: NOOP polling on the same connection (no new TLS logins)
+                while time.monotonic() < deadline:
+                    time.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+                    mail.noop()
+                    exists = mail.response("EXISTS")[1]
+                    if exists and exists[-1] and int(exists[-1]) > known_count:
+                        return True
+                return False
+
+            # Step 1: Enter IDLE and wait for the continuation response
+            tag = mail._new_tag()
+            mail.send(tag + b" IDLE\r\n")
+            if not mail.readline().startswith(b"+"):
+                raise imaplib.IMAP4.error("Server refused IDLE")
+
+            # Step 2: Wait for an EXISTS push or the deadline
+            arrived = False
+            try:
+                while not arrived:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._readable(mail, remaining):
+                        break
+                    line = mail.readline()
+                    if not line:
+                        raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                    if line.rstrip().endswith(b"EXISTS") and int(line.split()[1]) > known_count:
+                        arrived = True
+            finally:
+                # Step 3: Leave IDLE and consume the tagged completion
+                mail.send(b"DONE\r\n")
+                while True:
+                    line = mail.readline()
+                    if not line or line.startswith(tag):
+                        break
+
+            return arrived
+
+        except (imaplib.IMAP4.error, OSError) as e:
+            print(f"[ERROR] IMAP wait failed: {e}")
+            self.discard(server, user)
+            return False
+
+        finally:
+            self.touch(server, user)
+
+
+# ================================
+# Batched Message Lookup
+# ================================
+_UID_PATTERN = re.compile(rb"UID (\d+)")
+_HEADER_ITEMS = "(UID INTERNALDATE BODY.PEEK[HEADER.FIELDS (SUBJECT DATE)])"
+_BODY_ITEMS = ("(BODY.PEEK[HEADER.FIELDS (FROM TO SUBJECT DATE CONTENT-TYPE CONTENT-TRANSFER-ENCODING "
+               "MIME-VERSION)] BODY.PEEK[TEXT])")
+
+
+def _decoded_subject(header_bytes):
+    """Decode the Subject header from a block of raw header lines."""
+    raw_subject = email.message_from_bytes(header_bytes).get("Subject", "")
+    try:
+        return str(make_header(decode_header(raw_subject)))
+    except Exception:
+        return raw_subject
+
+
+def find_latest_messages(mail, search_criteria, subject_filter=None, chunk_size=100):
+    """
+    Yield messages matching the search, newest first, with as few round trips as possible.
+
+    - One UID SEARCH selects the candidates on the server.
+    - Headers are fetched in batches of `chunk_size` UIDs with a single FETCH per batch,
+      starting from the newest UIDs and ordered by INTERNALDATE within the batch.
+    - Only messages whose subject passes `subject_filter` have their body fetched (one FETCH each).
+    Callers stop iterating at the first useful message, so the rest are never downloaded.
+
+    Args:
+        mail (imaplib.IMAP4): Connection with a folder selected.
+        search_criteria (list): IMAP SEARCH criteria, e.g. ['FROM', '"info@opencart.com.gr"'].
+        subject_filter (callable): Receives the decoded subject; return True to fetch the body.
+        chunk_size (int): UIDs per batched header FETCH.
+
+    Yields:
+        tuple: (uid, email.message.Message) with selected headers and the body text.
+    """
+    result, data = mail.uid("SEARCH", None, *search_criteria)
+    if result != "OK" or not data or not data[0]:
+        return
+    uids = sorted(int(uid) for uid in data[0].split())
+
+    # Walk from the newest UIDs backwards; UIDs grow with arrival order inside a folder
+    for end in range(len(uids), 0, -chunk_size):
+        chunk = uids[max(end - chunk_size, 0):end]
+        result, data = mail.uid("FETCH", ",".join(str(uid) for uid in chunk), _HEADER_ITEMS)
+        if result != "OK":
+            continue
+
+        headers = []
+        for item in data:
+            if not isinstance(item, tuple):
+                continue
+            uid_match = _UID_PATTERN.search(item[0])
+            if not uid_match:
+                continue
+            received = imaplib.Internaldate2tuple(item[0])
+            headers.append((time.mktime(received) if received else 0, int(uid_match.group(1)), item[1]))
+
+        for _, uid, header_bytes in sorted(headers, reverse=True):
+            if subject_filter and not subject_filter(_decoded_subject(header_bytes)):
+                continue
+            result, body_data = mail.uid("FETCH", str(uid), _BODY_ITEMS)
+            if result != "OK":
+                continue
+            parts = [part[1] for part in body_data if isinstance(part, tuple)]
+            yield uid, email.message_from_bytes(b"".join(parts))
+
+
+# Process-wide cache shared by custom_library.py and api_handler.py
+imap_sessions = ImapSessionCache()
+atexit.register(imap_sessions.close_all)
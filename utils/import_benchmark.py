@@ -0,0 +1,100 @@
+# utils/import_benchmark.py
+"""
+Cold-start benchmark for the keyword libraries imported by test_cases/base.robot.
+
+Every suite file and every pabot worker imports these modules in a fresh process, so each
+measurement runs in a new interpreter. Robot Framework itself is imported first and excluded,
+because it is already loaded when a suite imports the libraries.
+
+Usage:
+    python utils/import_benchmark.py                        # current working tree
+    python utils/import_benchmark.py --baseline HEAD~1      # compare with another git revision
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+BASE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Modules base.robot loads as Library/Variables, in import order
+SUITE_MODULES = ["api_handler", "config_parser", "config_reader", "custom_library", "env_loader"]
+
+# Third-party modules whose import is worth deferring; reported if a cold start loads them
+HEAVY_MODULES = ["pandas", "pyautogui", "openpyxl", "mysql.connector", "pymongo", "filelock"]
+
+_PROBE = """
+import io, sys, json, time, contextlib
+import robot.api.deco, robot.utils
+sys.path.insert(0, {utils_dir!r})
+timings = {{}}
+with contextlib.redirect_stdout(io.StringIO()):
+    for name in {modules!r}:
+        started = time.perf_counter()
+        try:
+            __import__(name)
+        except Exception as e:
+            print(json.dumps({{"error": f"{{name}}: {{type(e).__name__}}: {{e}}"}}), file=sys.stderr)
+            sys.exit(1)
+        timings[name] = (time.perf_counter() - started) * 1000
+print(json.dumps({{"timings": timings, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(root, repeat):
+    """Import the suite modules from `root`/utils in `repeat` fresh interpreters."""
+    probe = _PROBE.format(utils_dir=os.path.join(root, "utils"), modules=SUITE_MODULES, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", probe], cwd=root, capture_output=True, text=True)
+        if completed.returncode != 0:
+            lines = completed.stderr.strip().splitlines()
+            return {"error": json.loads(lines[-1])["error"] if lines and lines[-1].startswith("{") else
+                    (lines[-1] if lines else "import failed")}
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    per_module = {name: round(statistics.median(run["timings"][name] for run in runs), 1) for name in SUITE_MODULES}
+    return {
+        "total_ms": round(statistics.median(sum(run["timings"].values()) for run in runs), 1),
+        "per_module_ms": per_module,
+        "heavy_modules_loaded": runs[-1]["heavy"],
+    }
+
+
+def export_revision(revision, target):
+    """Write the utils/ and configs/ trees of a git revision into `target`."""
+    archive = subprocess.run(["git", "archive", revision, "utils", "configs"], cwd=BASE_DIR,
+                             capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    env_file = os.path.join(BASE_DIR, ".env")
+    if os.path.exists(env_file):
+        shutil.copy(env_file, target)
+
+
+def print_report(label, result):
+    print(f"\n{label}")
+    if "error" in result:
+        print(f"  could not import: {result['error']}")
+        return
+    for name, elapsed in result["per_module_ms"].items():
+        print(f"  {name:<16} {elapsed:>8.1f} ms")
+    print(f"  {'total':<16} {result['total_ms']:>8.1f} ms")
+    print(f"  heavy modules loaded: {', '.join(result['heavy_modules_loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start import time of the suite keyword libraries.")
+    parser.add_argument("--baseline", help="Git revision to compare against, e.g. HEAD~1")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement (median is shown)")
+    options = parser.parse_args()
+
+    if options.baseline:
+        with tempfile.TemporaryDirectory() as baseline_root:
+            export_revision(options.baseline, baseline_root)
+            print_report(f"Baseline ({options.baseline})", measure(baseline_root, options.repeat))
+
+    print_report("Working tree", measure(BASE_DIR, options.repeat))
@@ -0,0 +1,203 @@
+# utils/keyword_profiler.py
+"""
+Keyword-level timing profiler (Robot Framework listener, API v2).
+
+For every keyword of a run it aggregates:
+    - calls, total time (keyword and everything it called) and self time (the keyword alone)
+    - a collapsed-stack file ("suite;test;keyword;keyword <ms>") for flame graphs
+    - every Sleep, by call site, with its cumulative wasted seconds
+
+Written next to output.xml at the end of the run:
+    keyword_profile.txt         top-N table by self time, plus the Sleep report
+    keyword_profile.collapsed   input for flamegraph.pl / speedscope / inferno
+    keyword_profile.json        raw aggregates, merged across pabot workers by the `report` command
+
+Usage:
+    robot --listener utils/keyword_profiler.py page_objects/
+    robot --listener utils/keyword_profiler.py:40 ...                    # top 40 keywords
+
+    # pabot: every worker writes its own profile under pabot_results/; merge them
+    python utils/keyword_profiler.py report results/pabot_results/*/keyword_profile.json --top 30
+    flamegraph.pl keyword_profile.collapsed > keyword_profile.svg
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+
+PROFILE_NAME = "keyword_profile"
+SLEEP_KEYWORDS = {"BuiltIn.Sleep", "Sleep"}
+
+# Only these v2 keyword types are profiled; FOR/IF/TRY frames count towards the enclosing keyword
+_PROFILED_TYPES = {"KEYWORD", "SETUP", "TEARDOWN"}
+
+
+def _new_stats():
+    return {"calls": 0, "total": 0.0, "self": 0.0, "max": 0.0}
+
+
+class KeywordProfiler:
+    """Aggregates self/total time per keyword and collapsed stacks for one Robot run."""
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, top=25):
+        self.top = int(top)
+        self.output_dir = None
+        self.keywords = defaultdict(_new_stats)
+        self.sleeps = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "caller": "", "arguments": ""})
+        self.stacks = defaultdict(float)
+        self._frames = []       # [name, start, child seconds] of the open suite/test/keywords
+        self._active = defaultdict(int)  # open frames per keyword, so recursion counts total time once
+
+    # --- Listener interface -----------------------------------------------
+    def start_suite(self, name, attrs):
+        self._frames.append([name, time.perf_counter(), 0.0])
+
+    def end_suite(self, name, attrs):
+        self._pop()
+
+    def start_test(self, name, attrs):
+        self._frames.append([name, time.perf_counter(), 0.0])
+
+    def end_test(self, name, attrs):
+        self._pop()
+
+    def start_keyword(self, name, attrs):
+        if attrs.get("type", "KEYWORD") not in _PROFILED_TYPES:
+            return
+        keyword = f"{attrs['libname']}.{attrs['kwname']}" if attrs.get("libname") else attrs["kwname"]
+        self._frames.append([keyword, time.perf_counter(), 0.0])
+        self._active[keyword] += 1
+
+    def end_keyword(self, name, attrs):
+        if attrs.get("type", "KEYWORD") not in _PROFILED_TYPES:
+            return
+        keyword, elapsed, self_time, stack = self._pop()
+        self._active[keyword] -= 1
+
+        stats = self.keywords[keyword]
+        stats["calls"] += 1
+        stats["self"] += self_time
+        stats["max"] = max(stats["max"], elapsed)
+        if not self._active[keyword]:
+            stats["total"] += elapsed
+
+        if keyword in SLEEP_KEYWORDS:
+            site = f"{attrs.get('source') or '?'}:{attrs.get('lineno') or '?'}"
+            sleep = self.sleeps[site]
+            sleep["calls"] += 1
+            sleep["seconds"] += elapsed
+            sleep["caller"] = stack[-2] if len(stack) > 1 else ""
+            sleep["arguments"] = " ".join(attrs.get("args", []))
+
+    def output_file(self, path):
+        if self.output_dir is None and path and path != "None":
+            self.output_dir = os.path.dirname(os.path.abspath(path))
+
+    def close(self):
+        if self.output_dir is None:
+            self.output_dir = os.getcwd()
+        profile = self.as_dict()
+        write_profile(profile, os.path.join(self.output_dir, PROFILE_NAME), self.top)
+        print(f"Keyword profile: {os.path.join(self.output_dir, PROFILE_NAME)}.txt", file=sys.__stdout__)
+
+    # --- Internals ----------------------------------------------------------
+    def _pop(self):
+        """Close the innermost frame: returns (name, elapsed, self time, stack of names)."""
+        stack = [frame[0] for frame in self._frames]
+        name, start, child_seconds = self._frames.pop()
+        elapsed = time.perf_counter() - start
+        self_time = max(elapsed - child_seconds, 0.0)
+        if self._frames:
+            self._frames[-1][2] += elapsed
+        self.stacks[";".join(part.replace(";", ",") for part in stack)] += self_time
+        return name, elapsed, self_time, stack
+
+    def as_dict(self):
+        return {"keywords": dict(self.keywords), "sleeps": dict(self.sleeps), "stacks": dict(self.stacks)}
+
+
+# Robot instantiates the class named like the module when the listener is given by path
+keyword_profiler = KeywordProfiler
+
+
+# ================================
+# Reporting
+# ================================
+def merge_profiles(profiles):
+    """Sum several profile dictionaries (e.g. one per pabot worker) into one."""
+    merged = {"keywords": defaultdict(_new_stats), "sleeps": {}, "stacks": defaultdict(float)}
+    for profile in profiles:
+        for name, stats in profile["keywords"].items():
+            target = merged["keywords"][name]
+            for field in ("calls", "total", "self"):
+                target[field] += stats[field]
+            target["max"] = max(target["max"], stats["max"])
+        for site, sleep in profile["sleeps"].items():
+            target = merged["sleeps"].setdefault(site, {**sleep, "calls": 0, "seconds": 0.0})
+            target["calls"] += sleep["calls"]
+            target["seconds"] += sleep["seconds"]
+        for stack, seconds in profile["stacks"].items():
+            merged["stacks"][stack] += seconds
+    return {key: dict(value) for key, value in merged.items()}
+
+
+def format_report(profile, top=25):
+    """Top-N keywords by self time, followed by every Sleep call site by cumulative seconds."""
+    keywords = sorted(profile["keywords"].items(), key=lambda item: item[1]["self"], reverse=True)
+    run_seconds = sum(stats["self"] for _, stats in keywords) or 1.0
+
+    lines = [f"Top {min(top, len(keywords))} keywords by self time (of {len(keywords)} profiled)", "",
+             f"{'self s':>10} {'self %':>7} {'total s':>10} {'calls':>7} {'avg ms':>9} {'max ms':>9}  keyword"]
+    for name, stats in keywords[:top]:
+        lines.append(f"{stats['self']:>10.3f} {100 * stats['self'] / run_seconds:>6.1f}% {stats['total']:>10.3f} "
+                     f"{stats['calls']:>7} {1000 * stats['total'] / stats['calls']:>9.1f} "
+                     f"{1000 * stats['max']:>9.1f}  {name}")
+
+    sleeps = sorted(profile["sleeps"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    wasted = sum(sleep["seconds"] for _, sleep in sleeps)
+    lines += ["", f"Sleep: {wasted:.1f}s wasted in {sum(s['calls'] for _, s in sleeps)} call(s) "
+                  f"({100 * wasted / run_seconds:.1f}% of keyword time)", ""]
+    for site, sleep in sleeps:
+        lines.append(f"{sleep['seconds']:>10.2f}s {sleep['calls']:>5}x  Sleep {sleep['arguments']:<10} "
+                     f"in {sleep['caller']}  ({site})")
+    return "\n".join(lines) + "\n"
+
+
+def write_profile(profile, base_path, top=25):
+    """Write <base_path>.json, .collapsed (milliseconds per stack) and .txt."""
+    with open(f"{base_path}.json", "w", encoding="utf-8") as file:
+        json.dump(profile, file)
+    with open(f"{base_path}.collapsed", "w", encoding="utf-8") as file:
+        for stack, seconds in sorted(profile["stacks"].items()):
+            milliseconds = round(seconds * 1000)
+            if milliseconds:
+                file.write(f"{stack} {milliseconds}\n")
+    with open(f"{base_path}.txt", "w", encoding="utf-8") as file:
+        file.write(format_report(profile, top))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge keyword profiles and print the top-N report.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report = commands.add_parser("report", help="Merge keyword_profile.json files (e.g. from pabot workers)")
+    report.add_argument("profiles", nargs="+", help="keyword_profile.json files")
+    report.add_argument("--top", type=int, default=25)
+    report.add_argument("--output", default=PROFILE_NAME, help="Base path of the merged .txt/.collapsed/.json")
+    options = parser.parse_args(argv)
+
+    profiles = []
+    for path in options.profiles:
+        with open(path, "r", encoding="utf-8") as file:
+            profiles.append(json.load(file))
+    merged = merge_profiles(profiles)
+    write_profile(merged, options.output, options.top)
+    print(format_report(merged, options.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# utils/lazy_import.py
+"""
+Deferred imports and construction for the keyword libraries.
+
+Robot Framework imports the utils modules as both Library and Variables in every suite file
+and every pabot worker, so module import time is paid over and over. Heavy dependencies
+(mysql.connector, openpyxl, pymongo, pyautogui ...) and module-level helper objects are
+wrapped here so they are only imported/constructed when a keyword first touches them.
+"""
+import importlib
+import threading
+
+
+def _is_robot_probe(name):
+    """Robot Framework checks every library attribute for keyword markers such as `robot_name`."""
+    return name.startswith(("robot_", "ROBOT_"))
+
+
+class LazyModule:
+    """Module proxy that imports `module_name` on first attribute access."""
+
+    def __init__(self, module_name):
+        self.__dict__["_module_name"] = module_name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_module_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name):
+        if _is_robot_probe(name):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_module_name']}' ({state})>"
+
+
+class LazyInstance:
+    """
+    Object proxy that calls `factory()` on first attribute access and forwards to the result.
+
+    Works with Robot Framework's `Call Method` and `${obj.attribute}` syntax, which only use getattr.
+    """
+
+    def __init__(self, factory):
+        self.__dict__["_factory"] = factory
+        self.__dict__["_instance"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        if self.__dict__["_instance"] is None:
+            with self.__dict__["_lock"]:
+                if self.__dict__["_instance"] is None:
+                    self.__dict__["_instance"] = self.__dict__["_factory"]()
+        return self.__dict__["_instance"]
+
+    def __getattr__(self, name):
+        if _is_robot_probe(name):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __repr__(self):
+        instance = self.__dict__["_instance"]
+        if instance is None:
+            return f"<lazy {getattr(self.__dict__['_factory'], '__name__', 'object')} (not constructed)>"
+        return repr(instance)
@@ -0,0 +1,397 @@
+# utils/local_grid.py
+"""
+Local, headless browser grid for parallel (pabot) runs.
+
+    - Driver cache: chromedriver/geckodriver/msedgedriver are resolved once per installed browser
+      version with Selenium Manager and recorded in .cache/drivers/index.json; later runs reuse
+      the cached binary without any network lookup until the browser is updated.
+    - Grid: `start` launches N driver services (each one a W3C WebDriver endpoint, the same
+      protocol a Selenium Grid hub speaks) and records them in .cache/local_grid.json.
+    - Assignment: pabot worker k (${PABOTEXECUTIONPOOLID}) always gets node k % N, so workers never
+      share a driver service. Without a running grid, browsers start in-process from the cached driver.
+    - Parked sessions: browsers live in the driver services, not in the robot process, so a worker's
+      idle sessions are recorded in .cache/local_grid_sessions/ when its robot process ends and the
+      next robot process of the same worker re-attaches to them. They are quit when the grid stops.
+
+Settings: [local_grid] in configs/config.ini. browser_pool.py opens its browsers through
+connection_options() when the local grid is enabled, and parks them with park_sessions().
+
+Usage:
+    python utils/local_grid.py resolve chrome               # warm the driver cache
+    python utils/local_grid.py start --nodes 8              # keep running while pabot runs (Ctrl+C stops)
+    python utils/local_grid.py status
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import signal
+import argparse
+import subprocess
+import urllib.request
+
+from config_service import config_service
+
+BASE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+DRIVER_CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'drivers')
+DRIVER_INDEX_FILE = os.path.join(DRIVER_CACHE_DIR, 'index.json')
+GRID_STATE_FILE = os.path.join(BASE_DIR, '.cache', 'local_grid.json')
+SESSIONS_DIR = os.path.join(BASE_DIR, '.cache', 'local_grid_sessions')
+
+# SeleniumLibrary browser name -> (Selenium Manager browser, headless argument)
+_BROWSERS = {
+    "chrome": ("chrome", "--headless=new"),
+    "headlesschrome": ("chrome", "--headless=new"),
+    "edge": ("edge", "--headless=new"),
+    "headlessedge": ("edge", "--headless=new"),
+    "firefox": ("firefox", "-headless"),
+    "headlessfirefox": ("firefox", "-headless"),
+}
+
+# Where to look for the browser binary when it is not on PATH
+_BROWSER_BINARIES = {
+    "chrome": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+               "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+    "edge": ["microsoft-edge", "microsoft-edge-stable", "msedge",
+             "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge"],
+    "firefox": ["firefox", "/Applications/Firefox.app/Contents/MacOS/firefox"],
+}
+
+# Windows: browser versions are read from the registry (the binaries do not print --version)
+_WINDOWS_VERSION_KEYS = {
+    "chrome": [("HKEY_CURRENT_USER", r"Software\Google\Chrome\BLBeacon", "version")],
+    "edge": [("HKEY_CURRENT_USER", r"Software\Microsoft\Edge\BLBeacon", "version")],
+    "firefox": [("HKEY_LOCAL_MACHINE", r"SOFTWARE\Mozilla\Mozilla Firefox", "CurrentVersion")],
+}
+
+
+def settings():
+    return {
+        "enabled": config_service.get_bool("local_grid", "enabled", fallback=False),
+        "browser": config_service.get("local_grid", "browser", fallback="chrome"),
+        "nodes": config_service.get_int("local_grid", "nodes", fallback=4),
+        "base_port": config_service.get_int("local_grid", "base_port", fallback=4450),
+        "headless": config_service.get_bool("local_grid", "headless", fallback=True),
+    }
+
+
+def _browser_name(browser):
+    key = browser.lower().replace(" ", "")
+    if key not in _BROWSERS:
+        raise ValueError(f"Unsupported browser for the local grid: {browser}")
+    return _BROWSERS[key][0]
+
+
+# ================================
+# Driver Cache
+# ================================
+def browser_version(browser):
+    """Installed version of the browser (e.g. '126.0.6478.126'), or None if it cannot be found."""
+    name = _browser_name(browser)
+    if sys.platform == "win32":
+        import winreg
+        for hive, path, value in _WINDOWS_VERSION_KEYS[name]:
+            try:
+                with winreg.OpenKey(getattr(winreg, hive), path) as key:
+                    return str(winreg.QueryValueEx(key, value)[0]).split()[0]
+            except OSError:
+                continue
+        return None
+
+    for candidate in _BROWSER_BINARIES[name]:
+        binary = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if not binary:
+            continue
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        versions = [part for part in output.split() if part[:1].isdigit()]
+        if versions:
+            return versions[0]
+    return None
+
+
+def _load_index():
+    try:
+        with open(DRIVER_INDEX_FILE, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index):
+    os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+    temp_path = f"{DRIVER_INDEX_FILE}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=1, sort_keys=True)
+    os.replace(temp_path, DRIVER_INDEX_FILE)
+
+
+def resolve_driver(browser):
+    """
+    Path of the driver binary for the installed browser, from the on-disk cache when the browser
+    version is unchanged; otherwise resolved (and downloaded if needed) once by Selenium Manager.
+    """
+    name = _browser_name(browser)
+    version = browser_version(name)
+    key = f"{name}-{version.split('.')[0]}" if version else None
+
+    cached = _load_index().get(key) if key else None
+    if cached and os.path.isfile(cached["driver_path"]):
+        return cached["driver_path"]
+
+    from selenium.webdriver.common.selenium_manager import SeleniumManager
+    arguments = ["--browser", name, "--cache-path", DRIVER_CACHE_DIR]
+    if version:
+        arguments += ["--browser-version", version.split(".")[0]]
+    driver_path = SeleniumManager().binary_paths(arguments)["driver_path"]
+
+    if key:
+        index = _load_index()
+        index[key] = {"driver_path": driver_path, "browser_version": version, "resolved_at": time.time()}
+        _save_index(index)
+    return driver_path
+
+
+# ================================
+# Grid
+# ================================
+def _driver_command(browser, driver_path, port):
+    if _browser_name(browser) == "firefox":
+        return [driver_path, "--port", str(port), "--host", "127.0.0.1"]
+    return [driver_path, f"--port={port}"]
+
+
+def _wait_until_ready(url, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _node_ready(url):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _port_free(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        return probe.connect_ex(("127.0.0.1", port)) != 0
+
+
+def _node_ready(url):
+    try:
+        with urllib.request.urlopen(f"{url}/status", timeout=2) as response:
+            return bool(json.load(response).get("value", {}).get("ready", True))
+    except (OSError, ValueError):
+        return False
+
+
+def read_grid():
+    """Running grid recorded by `start` (None when no grid is running)."""
+    try:
+        with open(GRID_STATE_FILE, "r", encoding="utf-8") as file:
+            grid = json.load(file)
+    except (OSError, ValueError):
+        return None
+    # A stale state file (grid killed without cleanup) has no answering nodes
+    return grid if grid.get("nodes") and _node_ready(grid["nodes"][0]["url"]) else None
+
+
+def start_grid(nodes, browser, base_port):
+    """Start `nodes` driver services and record them; returns the list of started processes."""
+    driver_path = resolve_driver(browser)
+    processes, endpoints = [], []
+    port = base_port
+    for _ in range(nodes):
+        while not _port_free(port):
+            port += 1
+        process = subprocess.Popen(_driver_command(browser, driver_path, port),
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        processes.append(process)
+        endpoints.append({"url": f"http://127.0.0.1:{port}", "pid": process.pid})
+        port += 1
+
+    for endpoint in endpoints:
+        if not _wait_until_ready(endpoint["url"]):
+            stop_processes(processes)
+            raise RuntimeError(f"Driver service at {endpoint['url']} did not become ready")
+
+    os.makedirs(os.path.dirname(GRID_STATE_FILE), exist_ok=True)
+    with open(GRID_STATE_FILE, "w", encoding="utf-8") as file:
+        json.dump({"pid": os.getpid(), "browser": _browser_name(browser), "driver_path": driver_path,
+                   "nodes": endpoints}, file, indent=1)
+    return processes
+
+
+def stop_processes(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def worker_index():
+    """pabot execution pool id of this process (0 outside pabot)."""
+    try:
+        from robot.libraries.BuiltIn import BuiltIn
+        return int(BuiltIn().get_variable_value("${PABOTEXECUTIONPOOLID}", 0))
+    except Exception:
+        return int(os.getenv("PABOTEXECUTIONPOOLID", 0))
+
+
+def connection_options(browser, options=None):
+    """
+    Extra SeleniumLibrary `Open Browser` arguments for the local grid:
+    remote_url of this worker's node when a grid is running, otherwise the cached local driver;
+    the headless argument is appended to `options` when configured.
+    """
+    config = settings()
+    name = _browser_name(browser)
+    arguments = {}
+    if config["headless"]:
+        headless = f"add_argument('{_BROWSERS[name][1]}')"
+        options = f"{options};{headless}" if options else headless
+    if options:
+        arguments["options"] = options
+
+    grid = read_grid()
+    if grid and grid["browser"] == name and grid["nodes"]:
+        arguments["remote_url"] = grid["nodes"][worker_index() % len(grid["nodes"])]["url"]
+    else:
+        arguments["executable_path"] = resolve_driver(name)
+    return arguments
+
+
+# ================================
+# Parked Sessions
+# ================================
+def _sessions_file(worker):
+    return os.path.join(SESSIONS_DIR, f"worker-{worker}.json")
+
+
+def park_sessions(sessions):
+    """
+    Record idle sessions of this pabot worker on the running grid, so the next robot process of the
+    same worker can re-attach to them. `sessions` are dicts with url (node), session_id, capabilities
+    and any data of the caller. Returns False when no grid is running (nothing is recorded).
+    """
+    grid = read_grid()
+    if not grid:
+        return False
+    os.makedirs(SESSIONS_DIR, exist_ok=True)
+    path = _sessions_file(worker_index())
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"grid_pid": grid["pid"], "sessions": list(sessions)}, file, indent=1)
+    os.replace(temp_path, path)
+    return True
+
+
+def take_parked_sessions():
+    """Sessions parked by this worker on the running grid. The record is removed: the caller owns them now."""
+    path = _sessions_file(worker_index())
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            parked = json.load(file)
+        os.remove(path)
+    except (OSError, ValueError):
+        return []
+    grid = read_grid()
+    # Parked on an earlier grid: its driver services, and their browsers, are gone
+    if not grid or parked.get("grid_pid") != grid["pid"]:
+        return []
+    nodes = {node["url"] for node in grid["nodes"]}
+    return [session for session in parked.get("sessions", []) if session.get("url") in nodes]
+
+
+def attach_session(url, session_id, capabilities):
+    """Remote WebDriver bound to an existing session on a grid node (no new browser is started)."""
+    from selenium import webdriver
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    class AttachedWebDriver(WebDriver):
+        def start_session(self, _capabilities):
+            self.session_id, self.caps = session_id, capabilities
+
+    browser = str(capabilities.get("browserName", "")).lower()
+    options = {"firefox": webdriver.FirefoxOptions, "msedge": webdriver.EdgeOptions,
+               "microsoftedge": webdriver.EdgeOptions}.get(browser, webdriver.ChromeOptions)()
+    return AttachedWebDriver(command_executor=url, options=options)
+
+
+def quit_parked_sessions():
+    """End every parked session (the grid is stopping); returns how many were quit."""
+    quit_count = 0
+    for name in os.listdir(SESSIONS_DIR) if os.path.isdir(SESSIONS_DIR) else []:
+        path = os.path.join(SESSIONS_DIR, name)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                sessions = json.load(file).get("sessions", [])
+        except (OSError, ValueError):
+            sessions = []
+        for session in sessions:
+            request = urllib.request.Request(f"{session['url']}/session/{session['session_id']}", method="DELETE")
+            try:
+                urllib.request.urlopen(request, timeout=10).close()
+                quit_count += 1
+            except OSError:
+                pass
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return quit_count
+
+
+def main(argv=None):
+    config = settings()
+    parser = argparse.ArgumentParser(description="Local headless browser grid and driver cache.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    resolve = commands.add_parser("resolve", help="Resolve and cache the driver for the installed browser")
+    resolve.add_argument("browser", nargs="?", default=config["browser"])
+
+    start = commands.add_parser("start", help="Start driver services and keep them running until interrupted")
+    start.add_argument("--nodes", type=int, default=config["nodes"], help="Usually pabot --processes")
+    start.add_argument("--browser", default=config["browser"])
+    start.add_argument("--base-port", type=int, default=config["base_port"])
+
+    commands.add_parser("status", help="Show the running grid")
+    options = parser.parse_args(argv)
+
+    if options.command == "resolve":
+        print(f"{options.browser} {browser_version(options.browser) or '(version unknown)'}: "
+              f"{resolve_driver(options.browser)}")
+        return 0
+
+    if options.command == "status":
+        grid = read_grid()
+        print(json.dumps(grid, indent=1) if grid else "No local grid running.")
+        return 0 if grid else 1
+
+    processes = start_grid(options.nodes, options.browser, options.base_port)
+    print(f"Local grid: {options.nodes} {options.browser} node(s) on "
+          f"{options.base_port}+ (state in {GRID_STATE_FILE}); Ctrl+C to stop.", flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while all(process.poll() is None for process in processes):
+            time.sleep(1)
+        print("[ERROR] A driver service exited; stopping the grid.")
+        return 1
+    except (KeyboardInterrupt, SystemExit):
+        return 0
+    finally:
+        quit_parked_sessions()
+        stop_processes(processes)
+        try:
+            os.remove(GRID_STATE_FILE)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# utils/locator_index.py
+"""
+Precompiled index of the YAML config files (locators.yaml, test_data.yaml).
+
+Each file is compiled into:
+    - tree: the nested dictionary parse_yaml has always returned
+    - flat: every node keyed by its dotted path, e.g. 'register.agreement.continue_button'
+            (leaves and intermediate sections), for constant-time lookups
+
+The compiled result is pickled to .cache/config/ under the SHA-256 of the YAML file, so warm
+runs (and every pabot worker after the first) skip YAML parsing entirely. Editing the YAML
+changes its hash and the next load recompiles it.
+
+Usage:
+    python utils/locator_index.py               # precompile configs/locators.yaml and configs/test_data.yaml
+"""
+import os
+import sys
+import glob
+import pickle
+import hashlib
+import tempfile
+
+from lazy_import import LazyModule
+
+# Only needed when a cache is missing or stale
+_yaml = LazyModule("yaml")
+
+BASE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'config')
+DEFAULT_FILES = [os.path.join(BASE_DIR, 'configs', 'locators.yaml'), os.path.join(BASE_DIR, 'configs', 'test_data.yaml')]
+
+# Bump when the compiled layout changes so stale caches are ignored
+_CACHE_VERSION = 1
+
+
+class CompiledYaml:
+    """Parsed YAML tree plus its flat dotted-key index."""
+
+    def __init__(self, tree, source_hash, flat=None):
+        self.tree = tree
+        self.source_hash = source_hash
+        if flat is None:
+            flat = {}
+            self._flatten(tree, "", flat)
+        self.flat = flat
+
+    @classmethod
+    def _flatten(cls, node, prefix, flat):
+        if not isinstance(node, dict):
+            return
+        for key, value in node.items():
+            dotted = f"{prefix}.{key}" if prefix else str(key)
+            flat[dotted] = value
+            cls._flatten(value, dotted, flat)
+
+    def get(self, dotted_key):
+        """Value stored under the dotted key; raises KeyError naming the closest existing parent."""
+        try:
+            return self.flat[dotted_key]
+        except KeyError:
+            parent = dotted_key
+            while "." in parent:
+                parent = parent.rsplit(".", 1)[0]
+                if parent in self.flat:
+                    options = sorted(self.flat[parent]) if isinstance(self.flat[parent], dict) else []
+                    raise KeyError(f"'{dotted_key}' not found; '{parent}' has: {', '.join(map(str, options))}") from None
+            raise KeyError(f"'{dotted_key}' not found") from None
+
+
+def _cache_path(yaml_path, source_hash):
+    name = os.path.splitext(os.path.basename(yaml_path))[0]
+    return os.path.join(CACHE_DIR, f"{name}-v{_CACHE_VERSION}-{source_hash[:16]}.pickle")
+
+
+def _write_cache(cache_path, compiled):
+    """Atomically replace the cache file and drop caches of older versions of the same YAML."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prefix = os.path.basename(cache_path).rsplit("-", 2)[0]
+    descriptor, temp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(descriptor, "wb") as file:
+        # Plain containers only, so the cache loads regardless of how this module was imported;
+        # flat values reference the same objects as the tree, so sections are stored once
+        pickle.dump({"source_hash": compiled.source_hash, "tree": compiled.tree, "flat": compiled.flat},
+                    file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, cache_path)
+
+    for stale in glob.glob(os.path.join(CACHE_DIR, f"{prefix}-v*.pickle")):
+        if stale != cache_path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def compile_yaml(yaml_path):
+    """
+    Return the CompiledYaml for a file, from the pickle cache when the file hash matches.
+
+    Args:
+        yaml_path (str): Path to the YAML file.
+
+    Returns:
+        CompiledYaml: tree, flat index and source hash.
+    """
+    with open(yaml_path, "rb") as file:
+        raw = file.read()
+    source_hash = hashlib.sha256(raw).hexdigest()
+    cache_path = _cache_path(yaml_path, source_hash)
+
+    try:
+        with open(cache_path, "rb") as file:
+            cached = pickle.load(file)
+        if cached["source_hash"] == source_hash:
+            return CompiledYaml(cached["tree"], source_hash, cached["flat"])
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+        pass  # Missing or unreadable cache: recompile below
+
+    compiled = CompiledYaml(_yaml.safe_load(raw) or {}, source_hash)
+    try:
+        _write_cache(cache_path, compiled)
+    except OSError as e:
+        print(f"[WARNING] Could not write locator cache {cache_path}: {e}")
+    return compiled
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or DEFAULT_FILES:
+        compiled = compile_yaml(path)
+        print(f"{path}: {len(compiled.flat)} keys -> {_cache_path(path, compiled.source_hash)}")
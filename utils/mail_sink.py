@@ -0,0 +1,657 @@
+# utils/mail_sink.py
+"""
+Local stand-in for the mailbox used by the email keywords.
+
+MailStore is a thread-safe in-memory mailbox, SmtpSinkServer accepts mail from OpenCart over SMTP
+and ImapSinkServer is a minimal IMAP4rev1 server speaking the subset used by custom_library.py and
+api_handler.py: LOGIN, LIST, SELECT/EXAMINE, SEARCH, FETCH (plain and UID forms), NOOP, IDLE and
+LOGOUT. MailSink runs both on one store, so the existing keywords work unchanged once IMAP_SERVER
+points at it. Every IMAP command is counted so round trips can be benchmarked.
+
+Usage:
+    python utils/mail_sink.py --smtp-port 2525 --imap-port 1143     # shared sink for pabot runs
+    python utils/mail_sink.py --benchmark 1000                      # IMAP round-trip benchmark
+"""
+import sys
+import errno
+import argparse
+import email
+import imaplib
+import email.header
+import email.utils
+import re
+import select
+import socket
+import socketserver
+import threading
+import time
+from datetime import datetime, timezone
+
+
+# ================================
+# Mailbox Storage
+# ================================
+class MailStore:
+    """Thread-safe in-memory mailbox with IMAP-style UIDs per folder."""
+
+    def __init__(self, folders=("INBOX",)):
+        self.lock = threading.Condition()
+        self.uid_validity = int(time.time())
+        self.folders = {name: [] for name in folders}
+        self.uid_next = {name: 1 for name in folders}
+
+    def deliver(self, raw_message, folder="INBOX", received_at=None):
+        """Store a raw RFC 5322 message and wake up any IDLE listeners. Returns its UID."""
+        if isinstance(raw_message, str):
+            raw_message = raw_message.encode("utf-8")
+        with self.lock:
+            if folder not in self.folders:
+                self.folders[folder] = []
+                self.uid_next[folder] = 1
+            uid = self.uid_next[folder]
+            self.uid_next[folder] += 1
+            self.folders[folder].append({
+                "uid": uid,
+                "raw": raw_message,
+                "message": email.message_from_bytes(raw_message),
+                "internaldate": received_at or datetime.now(timezone.utc),
+                "flags": set(),
+            })
+            self.lock.notify_all()
+            return uid
+
+    def messages(self, folder):
+        with self.lock:
+            return list(self.folders.get(folder, []))
+
+    def clear(self):
+        with self.lock:
+            for folder in self.folders:
+                self.folders[folder] = []
+
+
+# ================================
+# IMAP Protocol Helpers
+# ================================
+_TOKEN_PATTERN = re.compile(rb'"((?:[^"\\]|\\.)*)"|(\()|(\))|([^\s()"]+)')
+
+
+def _tokenize(line):
+    """Split an IMAP command line into nested lists of byte tokens."""
+    stack = [[]]
+    for quoted, open_paren, close_paren, atom in _TOKEN_PATTERN.findall(line):
+        if open_paren:
+            stack.append([])
+        elif close_paren:
+            group = stack.pop()
+            stack[-1].append(group)
+        elif atom:
+            stack[-1].append(atom.decode())
+        else:
+            stack[-1].append(re.sub(rb'\\(.)', rb'\1', quoted).decode())
+    return stack[0]
+
+
+def _parse_sequence_set(sequence_set, maximum):
+    """Expand an IMAP sequence set such as '1,3:5,9:*' into a set of integers."""
+    numbers = set()
+    for part in sequence_set.split(","):
+        if ":" in part:
+            start, end = part.split(":")
+            start = maximum if start == "*" else int(start)
+            end = maximum if end == "*" else int(end)
+            numbers.update(range(min(start, end), max(start, end) + 1))
+        else:
+            numbers.add(maximum if part == "*" else int(part))
+    return numbers
+
+
+def _internaldate(value):
+    return value.strftime('"%d-%b-%Y %H:%M:%S %z"')
+
+
+def _header_fields(raw_message, fields):
+    """Return the named header lines (plus the terminating blank line) of a raw message."""
+    header_block = raw_message.split(b"\r\n\r\n", 1)[0].replace(b"\r\n", b"\n").split(b"\n\n", 1)[0]
+    wanted = {field.upper() for field in fields}
+    lines, keep = [], False
+    for line in header_block.split(b"\n"):
+        if line[:1] in (b" ", b"\t"):
+            if keep:
+                lines.append(line)
+            continue
+        keep = line.split(b":", 1)[0].decode(errors="ignore").upper() in wanted
+        if keep:
+            lines.append(line)
+    return b"\r\n".join(lines) + b"\r\n\r\n" if lines else b"\r\n"
+
+
+def _body_text(raw_message):
+    normalized = raw_message.replace(b"\r\n", b"\n")
+    parts = normalized.split(b"\n\n", 1)
+    return parts[1].replace(b"\n", b"\r\n") if len(parts) > 1 else b""
+
+
+# ================================
+# IMAP Server
+# ================================
+class _ImapHandler(socketserver.StreamRequestHandler):
+    """Handles one IMAP client connection."""
+
+    def setup(self):
+        super().setup()
+        self.folder = None
+        self.authenticated = False
+
+    def send(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self.wfile.write(data)
+        self.wfile.flush()
+
+    def handle(self):
+        self.send("* OK [CAPABILITY IMAP4rev1 IDLE UIDPLUS] Mail sink ready\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tokens = _tokenize(line.rstrip(b"\r\n"))
+            if len(tokens) < 2:
+                continue
+            tag, command, args = tokens[0], str(tokens[1]).upper(), tokens[2:]
+            self.server.count_command(command if command != "UID" else f"UID {str(args[0]).upper()}")
+            try:
+                if getattr(self, f"do_{command.replace(' ', '_')}", None) is None:
+                    self.send(f"{tag} BAD Unsupported command {command}\r\n")
+                    continue
+                if getattr(self, f"do_{command}")(tag, args) is False:
+                    return
+            except Exception as e:
+                self.send(f"{tag} BAD {e}\r\n")
+
+    # --- Commands ---------------------------------------------------------
+    def do_CAPABILITY(self, tag, args):
+        self.send(f"* CAPABILITY IMAP4rev1 IDLE UIDPLUS\r\n{tag} OK CAPABILITY completed\r\n")
+
+    def do_LOGIN(self, tag, args):
+        self.authenticated = True
+        self.send(f"{tag} OK LOGIN completed\r\n")
+
+    def do_LOGOUT(self, tag, args):
+        self.send(f"* BYE Mail sink closing\r\n{tag} OK LOGOUT completed\r\n")
+        return False
+
+    def do_NOOP(self, tag, args):
+        if self.folder:
+            self.send(f"* {len(self.server.store.messages(self.folder))} EXISTS\r\n")
+        self.send(f"{tag} OK NOOP completed\r\n")
+
+    def do_LIST(self, tag, args):
+        for name in list(self.server.store.folders):
+            self.send(f'* LIST (\\HasNoChildren) "/" "{name}"\r\n')
+        self.send(f"{tag} OK LIST completed\r\n")
+
+    def do_SELECT(self, tag, args, mode="READ-WRITE"):
+        folder = str(args[0])
+        folder = "INBOX" if folder.upper() == "INBOX" else folder
+        if folder not in self.server.store.folders:
+            self.send(f"{tag} NO Mailbox does not exist\r\n")
+            return
+        self.folder = folder
+        store = self.server.store
+        self.send(f"* {len(store.messages(folder))} EXISTS\r\n* 0 RECENT\r\n"
+                  f"* OK [UIDVALIDITY {store.uid_validity}] UIDs valid\r\n"
+                  f"* OK [UIDNEXT {store.uid_next[folder]}] Predicted next UID\r\n"
+                  f"{tag} OK [{mode}] {'EXAMINE' if mode == 'READ-ONLY' else 'SELECT'} completed\r\n")
+
+    def do_EXAMINE(self, tag, args):
+        self.do_SELECT(tag, args, mode="READ-ONLY")
+
+    def do_CLOSE(self, tag, args):
+        self.folder = None
+        self.send(f"{tag} OK CLOSE completed\r\n")
+
+    def do_SEARCH(self, tag, args, by_uid=False):
+        messages = self.server.store.messages(self.folder)
+        matches = [seq for seq, item in enumerate(messages, start=1)
+                   if self._matches(item, seq, args, len(messages))]
+        numbers = [messages[seq - 1]["uid"] for seq in matches] if by_uid else matches
+        self.send(f"* SEARCH{''.join(f' {n}' for n in numbers)}\r\n{tag} OK SEARCH completed\r\n")
+
+    def do_FETCH(self, tag, args, by_uid=False):
+        messages = self.server.store.messages(self.folder)
+        if by_uid:
+            wanted = _parse_sequence_set(str(args[0]), messages[-1]["uid"] if messages else 0)
+            selected = [(seq, item) for seq, item in enumerate(messages, start=1) if item["uid"] in wanted]
+        else:
+            wanted = _parse_sequence_set(str(args[0]), len(messages))
+            selected = [(seq, item) for seq, item in enumerate(messages, start=1) if seq in wanted]
+
+        items = args[1] if isinstance(args[1], list) else args[1:]
+        for seq, item in selected:
+            self.send(self._fetch_response(seq, item, items, by_uid))
+        self.send(f"{tag} OK FETCH completed\r\n")
+
+    def do_UID(self, tag, args):
+        sub_command = str(args[0]).upper()
+        if sub_command == "SEARCH":
+            self.do_SEARCH(tag, args[1:], by_uid=True)
+        elif sub_command == "FETCH":
+            self.do_FETCH(tag, args[1:], by_uid=True)
+        else:
+            self.send(f"{tag} BAD Unsupported UID command\r\n")
+
+    def do_IDLE(self, tag, args):
+        store = self.server.store
+        known = len(store.messages(self.folder))
+        self.send("+ idling\r\n")
+        while True:
+            with store.lock:
+                store.lock.wait(timeout=0.1)
+                count = len(store.folders.get(self.folder, []))
+            if count != known:
+                known = count
+                self.send(f"* {count} EXISTS\r\n")
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            if not readable:
+                continue
+            line = self.rfile.readline()
+            if not line:
+                return False
+            if line.strip().upper() == b"DONE":
+                break
+        self.send(f"{tag} OK IDLE terminated\r\n")
+
+    # --- Helpers ----------------------------------------------------------
+    def _matches(self, item, seq, criteria, total):
+        message = item["message"]
+        index = 0
+        while index < len(criteria):
+            key = criteria[index]
+            if isinstance(key, list):
+                if not self._matches(item, seq, key, total):
+                    return False
+                index += 1
+                continue
+            key = key.upper()
+            if key == "ALL":
+                index += 1
+                continue
+            if key in ("SEEN", "UNSEEN"):
+                if ("\\Seen" in item["flags"]) != (key == "SEEN"):
+                    return False
+                index += 1
+                continue
+            value = str(criteria[index + 1])
+            index += 2
+            if key in ("SUBJECT", "FROM", "TO"):
+                header = str(email.header.make_header(email.header.decode_header(message.get(key, ""))))
+                if value.lower() not in header.lower():
+                    return False
+            elif key in ("BODY", "TEXT"):
+                if value.lower().encode() not in item["raw"].lower():
+                    return False
+            elif key in ("SINCE", "BEFORE"):
+                boundary = datetime.strptime(value, "%d-%b-%Y").date()
+                received = item["internaldate"].date()
+                if (key == "SINCE" and received < boundary) or (key == "BEFORE" and received >= boundary):
+                    return False
+            elif key == "UID":
+                if item["uid"] not in _parse_sequence_set(value, self.server.store.uid_next[self.folder] - 1):
+                    return False
+            else:
+                raise ValueError(f"Unsupported search key {key}")
+        return True
+
+    def _fetch_response(self, seq, item, requested, by_uid):
+        fields = []
+        names = [str(name).upper() if not isinstance(name, list) else name for name in requested]
+        if by_uid and "UID" not in names:
+            names.insert(0, "UID")
+
+        literal_parts = []
+        index = 0
+        while index < len(names):
+            name = names[index]
+            index += 1
+            if name == "UID":
+                fields.append(f"UID {item['uid']}".encode())
+            elif name == "FLAGS":
+                fields.append(f"FLAGS ({' '.join(sorted(item['flags']))})".encode())
+            elif name == "INTERNALDATE":
+                fields.append(f"INTERNALDATE {_internaldate(item['internaldate'])}".encode())
+            elif name == "RFC822.SIZE":
+                fields.append(f"RFC822.SIZE {len(item['raw'])}".encode())
+            elif name in ("RFC822", "BODY[]", "BODY.PEEK[]"):
+                literal_parts.append((name.replace(".PEEK", ""), item["raw"]))
+                if ".PEEK" not in name:
+                    item["flags"].add("\\Seen")
+            elif name.startswith(("BODY[", "BODY.PEEK[")):
+                section = name.split("[", 1)[1].rstrip("]")
+                label = "BODY[" + section
+                if section.startswith("HEADER.FIELDS"):
+                    field_names = names[index] if index < len(names) and isinstance(names[index], list) else []
+                    if field_names:
+                        index += 1
+                    # the section is written as BODY[HEADER.FIELDS (A B)] and tokenized into name + list
+                    closing = names[index] if index < len(names) and names[index] == "]" else None
+                    if closing:
+                        index += 1
+                    data = _header_fields(item["raw"], field_names)
+                    label = f"BODY[HEADER.FIELDS ({' '.join(field_names)})]"
+                elif section == "HEADER":
+                    data = item["raw"].replace(b"\r\n", b"\n").split(b"\n\n", 1)[0].replace(b"\n", b"\r\n") + b"\r\n\r\n"
+                    label += "]"
+                elif section == "TEXT":
+                    data = _body_text(item["raw"])
+                    label += "]"
+                else:
+                    data = item["raw"]
+                    label += "]"
+                literal_parts.append((label, data))
+                if ".PEEK" not in name:
+                    item["flags"].add("\\Seen")
+
+        response = f"* {seq} FETCH (".encode() + b" ".join(fields)
+        for label, data in literal_parts:
+            response += (b" " if response[-1:] != b"(" else b"") + f"{label} {{{len(data)}}}\r\n".encode() + data
+        return response + b")\r\n"
+
+
+class _ExclusiveTCPServer(socketserver.ThreadingTCPServer):
+    """
+    Threaded TCP server whose port can only be held by one process, so a second pabot worker
+    gets EADDRINUSE and reuses the running sink instead of opening its own mailbox.
+    """
+    daemon_threads = True
+    # POSIX SO_REUSEADDR only skips TIME_WAIT; on Windows it would let two servers share the port
+    allow_reuse_address = sys.platform != "win32"
+
+    def server_bind(self):
+        if sys.platform == "win32":
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        super().server_bind()
+
+
+class ImapSinkServer(_ExclusiveTCPServer):
+    """Threaded IMAP server backed by a MailStore, with per-command counters."""
+
+    def __init__(self, store, host="127.0.0.1", port=0):
+        super().__init__((host, port), _ImapHandler)
+        self.store = store
+        self.command_counts = {}
+        self._count_lock = threading.Lock()
+
+    def count_command(self, command):
+        with self._count_lock:
+            self.command_counts[command] = self.command_counts.get(command, 0) + 1
+
+    @property
+    def round_trips(self):
+        with self._count_lock:
+            return sum(self.command_counts.values())
+
+    def reset_counts(self):
+        with self._count_lock:
+            self.command_counts.clear()
+
+
+# ================================
+# SMTP Receiver
+# ================================
+def _smtp_address(argument):
+    """Extract the address from 'FROM:<a@b>' / 'TO:<a@b> SIZE=..' SMTP arguments."""
+    value = argument.split(":", 1)[-1].strip()
+    match = re.match(r"<([^>]*)>", value)
+    return match.group(1) if match else value.split(" ", 1)[0]
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Handles one SMTP client connection; accepted messages go to the INBOX of the shared store."""
+
+    def send(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+        self.wfile.flush()
+
+    def handle(self):
+        self.send("220 mail-sink ESMTP ready")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb, _, argument = line.decode(errors="ignore").rstrip("\r\n").partition(" ")
+            verb = verb.upper()
+
+            if verb == "EHLO":
+                self.send("250-mail-sink\r\n250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n250 SIZE 26214400")
+            elif verb == "HELO":
+                self.send("250 mail-sink")
+            elif verb == "AUTH":
+                # Any credentials are accepted; consume the challenge/response exchange
+                mechanism, _, initial = argument.partition(" ")
+                prompts = {"LOGIN": ["VXNlcm5hbWU6", "UGFzc3dvcmQ6"], "PLAIN": [""]}.get(mechanism.upper(), [])
+                for prompt in prompts[1:] if initial else prompts:
+                    self.send(f"334 {prompt}".rstrip())
+                    self.rfile.readline()
+                self.send("235 Authentication successful")
+            elif verb == "MAIL":
+                sender, recipients = _smtp_address(argument), []
+                self.send("250 OK")
+            elif verb == "RCPT":
+                if sender is None:
+                    self.send("503 MAIL first")
+                    continue
+                recipients.append(_smtp_address(argument))
+                self.send("250 OK")
+            elif verb == "DATA":
+                if not recipients:
+                    self.send("503 RCPT first")
+                    continue
+                self.send("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    # Undo dot-stuffing
+                    lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                uid = self.server.store.deliver(b"".join(lines))
+                self.server.count_delivery(sender, recipients)
+                self.send(f"250 OK queued as {uid}")
+                sender, recipients = None, []
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self.send("250 OK")
+            elif verb == "NOOP":
+                self.send("250 OK")
+            elif verb == "QUIT":
+                self.send("221 Bye")
+                return
+            else:
+                self.send(f"502 Command {verb} not implemented")
+
+
+class SmtpSinkServer(_ExclusiveTCPServer):
+    """Threaded SMTP receiver that stores every accepted message in a MailStore."""
+
+    def __init__(self, store, host="127.0.0.1", port=0):
+        super().__init__((host, port), _SmtpHandler)
+        self.store = store
+        self.deliveries = 0
+        self._count_lock = threading.Lock()
+
+    def count_delivery(self, sender, recipients):
+        with self._count_lock:
+            self.deliveries += 1
+        print(f"Mail sink accepted message from {sender} to {', '.join(recipients)}")
+
+
+class MailSink:
+    """
+    SMTP receiver and IMAP server sharing one MailStore, each served from a daemon thread.
+
+    Point OpenCart's SMTP settings at `smtp_address` and IMAP_SERVER at `imap_address`
+    (with IMAP_SSL=False) and the email keywords read the messages OpenCart sent.
+    """
+
+    def __init__(self, host="127.0.0.1", smtp_port=0, imap_port=0, folders=("INBOX",)):
+        self.store = MailStore(folders)
+        self.smtp = SmtpSinkServer(self.store, host, smtp_port)
+        try:
+            self.imap = ImapSinkServer(self.store, host, imap_port)
+        except OSError:
+            self.smtp.server_close()
+            raise
+        self._threads = []
+
+    @staticmethod
+    def _address(server):
+        host, port = server.server_address[:2]
+        return f"{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    @property
+    def smtp_address(self):
+        return self._address(self.smtp)
+
+    @property
+    def imap_address(self):
+        return self._address(self.imap)
+
+    def start(self):
+        for server in (self.smtp, self.imap):
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"Mail sink listening: SMTP {self.smtp_address}, IMAP {self.imap_address}")
+        return self
+
+    def stop(self):
+        for server in (self.smtp, self.imap):
+            server.shutdown()
+            server.server_close()
+        self._threads = []
+
+
+_active_sink = None
+_active_sink_lock = threading.Lock()
+
+
+def start_mail_sink(host="127.0.0.1", smtp_port=0, imap_port=0):
+    """
+    Start the process-wide mail sink, or reuse the one already listening on the requested ports.
+
+    When a fixed port is taken (another pabot worker or a standalone `python utils/mail_sink.py`
+    owns the sink) the existing listener is reused, so all workers share a single mailbox.
+
+    Returns:
+        dict: smtp_server, imap_server ('host:port') and owner (True if started by this process).
+    """
+    global _active_sink
+    with _active_sink_lock:
+        if _active_sink is not None:
+            return {"smtp_server": _active_sink.smtp_address, "imap_server": _active_sink.imap_address, "owner": True}
+        try:
+            _active_sink = MailSink(host, int(smtp_port), int(imap_port)).start()
+        except OSError as e:
+            # An exclusively bound port fails with WSAEACCES on Windows
+            in_use = e.errno == errno.EADDRINUSE or (sys.platform == "win32" and e.errno == errno.EACCES)
+            if not in_use or not int(smtp_port) or not int(imap_port):
+                raise
+            client_host = "127.0.0.1" if host == "0.0.0.0" else host
+            print(f"Mail sink ports already in use; reusing the sink at {client_host}:{imap_port}")
+            return {"smtp_server": f"{client_host}:{smtp_port}", "imap_server": f"{client_host}:{imap_port}",
+                    "owner": False}
+        return {"smtp_server": _active_sink.smtp_address, "imap_server": _active_sink.imap_address, "owner": True}
+
+
+def stop_mail_sink():
+    """Stop the mail sink started by this process, if any."""
+    global _active_sink
+    with _active_sink_lock:
+        if _active_sink is not None:
+            _active_sink.stop()
+            _active_sink = None
+
+# ================================
+# Round-Trip Benchmark
+# ================================
+def _legacy_lookup(mail, sender, expected_subject):
+    """The previous lookup: one header FETCH per message to sort by Date, then RFC822 one by one."""
+    result, data = mail.search(None, f'(FROM "{sender}")')
+    emails_with_dates = []
+    for eid in data[0].split():
+        result, msg_data = mail.fetch(eid, '(BODY[HEADER.FIELDS (DATE)])')
+        raw_date = msg_data[0][1].decode().strip().replace('Date: ', '')
+        emails_with_dates.append((eid, email.utils.parsedate_to_datetime(raw_date)))
+
+    for email_id, _ in sorted(emails_with_dates, key=lambda x: x[1], reverse=True):
+        result, data = mail.fetch(email_id, '(RFC822)')
+        msg = email.message_from_bytes(data[0][1])
+        if expected_subject in msg.get("Subject", "").lower():
+            return msg
+    return None
+
+
+def benchmark_round_trips(message_count=1000):
+    """
+    Compare IMAP round trips and wall time of the legacy per-message lookup with the batched
+    find_latest_messages() lookup against a local ImapSinkServer.
+    """
+    from imap_session import find_latest_messages
+
+    store = MailStore()
+    sender = "info@opencart.com.gr"
+    for index in range(message_count):
+        subject = "Your Store - Thank you for registering" if index == message_count - 2 else f"Order update {index}"
+        store.deliver(
+            f"From: Your Store <{sender}>\r\nTo: tester@example.com\r\nSubject: {subject}\r\n"
+            f"Date: {email.utils.formatdate(1700000000 + index)}\r\nContent-Type: text/plain\r\n\r\n"
+            f"Message {index} https://demo.opencart.com.gr/index.php?route=account/login\r\n"
+        )
+
+    server = ImapSinkServer(store)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+
+    lookups = {
+        "legacy (per-message FETCH)": lambda mail: _legacy_lookup(mail, sender, "thank you for registering"),
+        "batched (find_latest_messages)": lambda mail: next(find_latest_messages(
+            mail, ["FROM", f'"{sender}"'], lambda subject: "thank you for registering" in subject.lower()), None),
+    }
+
+    print(f"Mailbox with {message_count} messages from {sender}")
+    for label, lookup in lookups.items():
+        mail = imaplib.IMAP4(host, port)
+        mail.login("tester@example.com", "password")
+        mail.select("INBOX", readonly=True)
+        server.reset_counts()
+        started = time.perf_counter()
+        found = lookup(mail)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<32} round trips: {server.round_trips:>6}  time: {elapsed:.3f}s  found: {found is not None}")
+        mail.logout()
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SMTP/IMAP mail sink for the email keywords.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (0.0.0.0 for containers)")
+    parser.add_argument("--smtp-port", type=int, default=2525)
+    parser.add_argument("--imap-port", type=int, default=1143)
+    parser.add_argument("--benchmark", type=int, metavar="MESSAGES",
+                        help="Run the IMAP round-trip benchmark with this many messages instead")
+    options = parser.parse_args()
+
+    if options.benchmark:
+        benchmark_round_trips(options.benchmark)
+        sys.exit(0)
+
+    sink = MailSink(options.host, options.smtp_port, options.imap_port).start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        sink.stop()
@@ -0,0 +1,171 @@
+# utils/network_profile.py
+"""
+Lean network profile for UI suites (Chromium browsers, via the DevTools protocol).
+
+The UI assertions never look at analytics, web fonts or product images, so the profile:
+    - blocks the URL patterns and file types configured in [performance] (Network.setBlockedURLs)
+    - disables CSS animations and transitions on every document (Page.addScriptToEvaluateOnNewDocument)
+
+`Apply Network Profile` is called by Open Pooled Browser, so every suite gets it when
+[performance] enabled = True. `Measure Network Profile Savings` loads a page with and without
+the profile (cache disabled) and reports the bytes and load time saved; `Get Page Network Usage`
+reports the current page only.
+
+Support is decided by the session's browserName capability: Selenium 4 defines execute_cdp_cmd on
+every Remote driver, but only Chrome/Edge answer it. Firefox (or a DevTools call that fails) skips
+the profile with a log message.
+"""
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+from selenium.common.exceptions import WebDriverException
+
+from config_service import config_service
+
+# Only the @keyword functions below are keywords
+ROBOT_AUTO_KEYWORDS = False
+
+_NO_ANIMATIONS_CSS = (
+    "*, *::before, *::after { transition: none !important; animation: none !important; "
+    "caret-color: auto !important; scroll-behavior: auto !important; }"
+)
+
+_DISABLE_ANIMATIONS_SCRIPT = """
+(function () {
+    var add = function () {
+        var style = document.createElement('style');
+        style.setAttribute('data-network-profile', '');
+        style.textContent = %r;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.readyState === 'loading') { document.addEventListener('DOMContentLoaded', add); } else { add(); }
+})();
+""" % _NO_ANIMATIONS_CSS
+
+_PAGE_NETWORK_USAGE = """
+var navigation = performance.getEntriesByType('navigation')[0] || {};
+var resources = performance.getEntriesByType('resource');
+var bytes = navigation.transferSize || 0;
+resources.forEach(function (entry) { bytes += entry.transferSize || 0; });
+return {
+    url: location.href,
+    requests: resources.length + 1,
+    transfer_bytes: bytes,
+    load_ms: Math.round(navigation.loadEventEnd || navigation.duration || 0)
+};
+"""
+
+# browserName capabilities of Chromium sessions (Chrome, Edge, and Edge as reported by older msedgedriver)
+_CHROMIUM_BROWSERS = {"chrome", "chrome-headless-shell", "chromium", "msedge", "microsoftedge"}
+
+# Session ids the profile is already applied to (a pooled browser keeps it across suites)
+_applied_sessions = set()
+
+
+def settings():
+    patterns = list(config_service.get_list("performance", "block_url_patterns", fallback=[]))
+    for extension in config_service.get_list("performance", "block_resource_types", fallback=[]):
+        extension = extension if extension.startswith(".") else f".{extension}"
+        patterns += [f"*{extension}", f"*{extension}?*"]
+    return {
+        "enabled": config_service.get_bool("performance", "enabled", fallback=False),
+        "blocked_urls": patterns,
+        "disable_animations": config_service.get_bool("performance", "disable_animations", fallback=True),
+    }
+
+
+def _driver():
+    return BuiltIn().get_library_instance("SeleniumLibrary").driver
+
+
+def is_chromium(driver):
+    """True when the session is Chrome/Edge, the browsers that accept DevTools protocol (CDP) commands."""
+    return str((getattr(driver, "caps", None) or {}).get("browserName", "")).lower() in _CHROMIUM_BROWSERS
+
+
+def _set_blocking(driver, urls):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+
+
+@keyword("Apply Network Profile")
+def apply_network_profile(force=False):
+    """
+    Applies the [performance] profile to the current browser: blocked URL patterns/file types and
+    no animations. Does nothing when the profile is disabled, already applied, or the browser is not Chrome/Edge
+    (a failing DevTools call is logged and skipped as well).
+    Returns True when the profile is active.
+    """
+    config = settings()
+    driver = _driver()
+    if not config["enabled"]:
+        return False
+    if driver.session_id in _applied_sessions and not BuiltIn().convert_to_boolean(force):
+        return True
+    if not is_chromium(driver):
+        logger.info(f"Network profile skipped: {driver.name} has no DevTools protocol access.")
+        return False
+
+    try:
+        if config["blocked_urls"]:
+            _set_blocking(driver, config["blocked_urls"])
+        if config["disable_animations"]:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _DISABLE_ANIMATIONS_SCRIPT})
+            driver.execute_script(_DISABLE_ANIMATIONS_SCRIPT)  # Current document too
+    except (RuntimeError, WebDriverException) as e:
+        logger.warn(f"Network profile skipped: DevTools protocol call failed on {driver.name}: {e}")
+        return False
+    _applied_sessions.add(driver.session_id)
+    logger.info(f"Network profile applied: {len(config['blocked_urls'])} blocked pattern(s), "
+                f"animations {'off' if config['disable_animations'] else 'on'}.")
+    return True
+
+
+@keyword("Get Page Network Usage")
+def get_page_network_usage():
+    """
+    Returns requests, transferred bytes and load time (ms) of the current page from the Resource Timing API.
+    """
+    usage = _driver().execute_script(_PAGE_NETWORK_USAGE)
+    logger.info(f"{usage['url']}: {usage['requests']} request(s), {usage['transfer_bytes']} bytes, "
+                f"loaded in {usage['load_ms']} ms")
+    return usage
+
+
+@keyword("Measure Network Profile Savings")
+def measure_network_profile_savings(url):
+    """
+    Loads ``url`` without and then with the blocked URLs (browser cache disabled for both) and returns
+    baseline/profiled bytes and load times plus bytes_saved. The profile stays applied afterwards.
+    """
+    driver = _driver()
+    if not is_chromium(driver):
+        raise RuntimeError("Measuring the network profile needs a Chromium browser (DevTools protocol).")
+    config = settings()
+
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    try:
+        _set_blocking(driver, [])
+        driver.get(url)
+        baseline = driver.execute_script(_PAGE_NETWORK_USAGE)
+
+        _set_blocking(driver, config["blocked_urls"])
+        driver.get(url)
+        profiled = driver.execute_script(_PAGE_NETWORK_USAGE)
+    finally:
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+
+    report = {
+        "url": url,
+        "baseline_bytes": baseline["transfer_bytes"],
+        "profiled_bytes": profiled["transfer_bytes"],
+        "bytes_saved": baseline["transfer_bytes"] - profiled["transfer_bytes"],
+        "baseline_requests": baseline["requests"],
+        "profiled_requests": profiled["requests"],
+        "baseline_load_ms": baseline["load_ms"],
+        "profiled_load_ms": profiled["load_ms"],
+    }
+    logger.info(f"Network profile on {url}: {report['bytes_saved']} bytes saved "
+                f"({report['baseline_bytes']} -> {report['profiled_bytes']}), "
+                f"load {report['baseline_load_ms']} -> {report['profiled_load_ms']} ms")
+    return report
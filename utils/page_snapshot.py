@@ -0,0 +1,231 @@
+# utils/page_snapshot.py
+"""
+Capture the page's DOM once, then run read-only assertions against it in-process.
+
+`Capture Page Snapshot` makes one WebDriver call: the browser serializes a copy of the document in
+which elements that are not rendered are marked (data-snapshot-hidden) and input values/checked
+states are written out as attributes. The copy is parsed with lxml and every later Snapshot keyword
+resolves the usual css= / xpath= / id= / name= / class= / tag= / link= locators from locators.yaml
+against it (CSS through cssselect), so dozens of checks take microseconds instead of a driver
+round trip each.
+
+A snapshot is a still picture: capture it after the page has settled (Wait For Page Stable) and
+capture again after any interaction that changes the page.
+
+Usage (Robot):
+    Library    ../utils/page_snapshot.py
+
+    Capture Page Snapshot
+    Snapshot Title Should Be             ${test_data['page_titles']}[register]
+    Snapshot Elements Should Match       ${locators_params['warning_messages']['register']}
+    ...                                  ${test_data['warning_messages']['register']}
+"""
+import time
+from functools import lru_cache
+
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from robot.api import logger
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+
+from batch_assertions import parse_locator, pair_checks, diff_states, describe_diff
+
+# Only the @keyword functions below are keywords
+ROBOT_AUTO_KEYWORDS = False
+
+HIDDEN_ATTRIBUTE = "data-snapshot-hidden"
+
+# Serializes a copy of the document (the live page is not touched). Both element lists are in
+# document order, so the n-th copied element belongs to the n-th original one.
+_SERIALIZE_DOCUMENT = """
+var source = document.documentElement, copy = source.cloneNode(true);
+var originals = source.getElementsByTagName('*'), copies = copy.getElementsByTagName('*');
+for (var i = 0; i < originals.length; i++) {
+    var element = originals[i], target = copies[i];
+    if (!element.getClientRects().length || getComputedStyle(element).visibility === 'hidden') {
+        target.setAttribute('%s', '');
+    }
+    if (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA' || element.tagName === 'SELECT') {
+        target.setAttribute('value', element.value);
+        if (element.checked) { target.setAttribute('checked', ''); }
+    }
+}
+return {url: location.href, title: document.title, html: copy.outerHTML};
+""" % HIDDEN_ATTRIBUTE
+
+# Text of these elements never shows up in WebDriver's element text
+_NO_TEXT_TAGS = {"script", "style", "noscript", "template", "head"}
+# Rendered on their own line (innerText), so their text never runs into the neighbouring text
+_BLOCK_TAGS = {"address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+               "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+               "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul"}
+
+
+@lru_cache(maxsize=512)
+def _css(selector):
+    return CSSSelector(selector, translator="html")
+
+
+@lru_cache(maxsize=512)
+def _xpath(expression):
+    return etree.XPath(expression)
+
+
+class PageSnapshot:
+    """Parsed copy of a page: locator lookups, WebDriver-like element text and visibility."""
+
+    def __init__(self, html, url="", title=""):
+        self.root = lxml.html.document_fromstring(html)
+        self.url = url
+        self.title = title
+
+    def find(self, locator):
+        """Elements (or text nodes, for xpath .../text()) matching a SeleniumLibrary locator, in document order."""
+        strategy, value = parse_locator(locator)
+        if strategy == "css":
+            return _css(value)(self.root)
+        if strategy == "xpath":
+            result = _xpath(value)(self.root)
+            return result if isinstance(result, list) else []
+        if strategy == "id":
+            return self.root.xpath("//*[@id=$value]", value=value)
+        if strategy == "name":
+            return self.root.xpath("//*[@name=$value]", value=value)
+        if strategy == "class":
+            return self.root.find_class(value)
+        if strategy == "tag":
+            return self.root.xpath(f"//{value}")
+        if strategy in ("link", "partial link"):
+            links = self.root.iter("a")
+            if strategy == "link":
+                return [link for link in links if self.text(link) == value]
+            return [link for link in links if value in self.text(link)]
+        return self.root.xpath("//*[@id=$value]", value=value) or self.root.xpath("//*[@name=$value]", value=value)
+
+    @staticmethod
+    def _element(node):
+        return node if isinstance(node, etree._Element) else node.getparent()
+
+    def visible(self, node):
+        element = self._element(node)
+        return element is not None and HIDDEN_ATTRIBUTE not in element.attrib
+
+    def text(self, node):
+        """Rendered text like WebDriver's element text: hidden parts skipped, whitespace collapsed."""
+        if not isinstance(node, etree._Element):
+            return " ".join(str(node).split()) if self.visible(node) else ""
+        parts = []
+
+        def walk(element):
+            if not isinstance(element.tag, str):
+                return  # Comments and processing instructions
+            if element.tag in _NO_TEXT_TAGS or HIDDEN_ATTRIBUTE in element.attrib:
+                return
+            block = element.tag in _BLOCK_TAGS
+            if block:
+                parts.append("\n")
+            parts.append(element.text or "")
+            for child in element:
+                walk(child)
+                parts.append(child.tail or "")
+            if block:
+                parts.append("\n")
+
+        walk(node)
+        lines = (" ".join(line.split()) for line in "".join(parts).replace("\xa0", " ").split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def state(self, locator):
+        """{count, visible, text} of the first match, the same shape batch_assertions reads from the browser."""
+        nodes = self.find(locator)
+        if not nodes:
+            return {"count": 0, "visible": False, "text": None}
+        return {"count": len(nodes), "visible": self.visible(nodes[0]), "text": self.text(nodes[0])}
+
+
+_snapshot = None
+
+
+def _current():
+    if _snapshot is None:
+        raise RuntimeError("No page snapshot captured yet. Call 'Capture Page Snapshot' first.")
+    return _snapshot
+
+
+@keyword("Capture Page Snapshot")
+def capture_page_snapshot():
+    """
+    Serializes the current page in one WebDriver call and keeps it for the Snapshot keywords.
+    Returns the number of elements in the snapshot.
+    """
+    global _snapshot
+    started = time.perf_counter()
+    driver = BuiltIn().get_library_instance("SeleniumLibrary").driver
+    page = driver.execute_script(_SERIALIZE_DOCUMENT)
+    _snapshot = PageSnapshot(page["html"], page["url"], page["title"])
+    elements = sum(1 for _ in _snapshot.root.iter())
+    logger.info(f"Snapshot of {page['url']}: {elements} elements, {len(page['html']) // 1024} KB, "
+                f"captured in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return elements
+
+
+@keyword("Get Snapshot Title")
+def get_snapshot_title():
+    """Returns the document title at capture time."""
+    return _current().title
+
+
+@keyword("Snapshot Title Should Be")
+def snapshot_title_should_be(expected, message=None):
+    """Same as SeleniumLibrary's Title Should Be, against the snapshot."""
+    title = _current().title
+    if title != expected:
+        raise AssertionError(message or f"Title should have been '{expected}' but was '{title}'.")
+
+
+@keyword("Get Snapshot Text")
+def get_snapshot_text(locator):
+    """Returns the text of the first element matching ``locator`` in the snapshot."""
+    nodes = _current().find(locator)
+    if not nodes:
+        raise AssertionError(f"Element with locator '{locator}' not found in the page snapshot.")
+    return _current().text(nodes[0])
+
+
+@keyword("Get Snapshot Element Count")
+def get_snapshot_element_count(locator):
+    """Returns how many elements match ``locator`` in the snapshot."""
+    return len(_current().find(locator))
+
+
+@keyword("Snapshot Should Contain Element")
+def snapshot_should_contain_element(locator, message=None):
+    """Fails unless ``locator`` matches at least one element of the snapshot."""
+    if not _current().find(locator):
+        raise AssertionError(message or f"Page snapshot should have contained element '{locator}' but did not.")
+
+
+@keyword("Snapshot Element Text Should Be")
+def snapshot_element_text_should_be(locator, expected, message=None):
+    """Same as SeleniumLibrary's Element Text Should Be, against the snapshot."""
+    text = get_snapshot_text(locator)
+    if text != expected:
+        raise AssertionError(message or f"The text of element '{locator}' should have been '{expected}' "
+                                        f"but it was '{text}'.")
+
+
+@keyword("Snapshot Elements Should Match")
+def snapshot_elements_should_match(locators, expected=None, contains=False):
+    """
+    Checks a locator list or locators.yaml subtree against expected texts/visibility (same pairing and diff as
+    batch_assertions' Elements Should Match), against the snapshot. Fails with every mismatch; returns the diff.
+    """
+    snapshot = _current()
+    checks = pair_checks(locators, expected)
+    diff = diff_states(checks, [snapshot.state(locator) for _, locator, _ in checks],
+                       BuiltIn().convert_to_boolean(contains))
+    if not diff["passed"]:
+        raise AssertionError(f"Page snapshot of {snapshot.url}: {describe_diff(diff)}")
+    return diff
@@ -0,0 +1,152 @@
+# utils/smart_waits.py
+"""
+Condition-based waits for SeleniumLibrary, to replace fixed Sleep calls in page objects.
+
+    Wait For Page Stable        document.readyState is 'complete', no XHR/fetch (or jQuery.ajax) request
+                                is pending and the DOM has not changed for a quiet period
+    Wait For Any Of Elements    first of several locators to become visible (or present)
+
+Polling is adaptive: it starts at 50 ms, so a ready page returns almost immediately, and backs
+off towards 500 ms while the page is busy, so long waits do not flood the browser with scripts.
+
+Usage (Robot):
+    Library    ../utils/smart_waits.py
+
+    Click Element             ${continue_button}
+    Wait For Page Stable
+    ${found}    Wait For Any Of Elements    ${success_alert}    ${warning_text}    timeout=10s
+"""
+import time
+
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import timestr_to_secs, secs_to_timestr
+from selenium.common.exceptions import StaleElementReferenceException
+
+# Only the @keyword functions below are keywords
+ROBOT_AUTO_KEYWORDS = False
+
+MIN_POLL = 0.05
+MAX_POLL = 0.5
+POLL_BACKOFF = 1.5
+
+# Instruments the page once: counts in-flight XHR/fetch requests and records the last DOM mutation.
+# Requests started before the instrumentation are covered by jQuery.active on jQuery pages (OpenCart).
+_INSTRUMENT_PAGE = """
+if (!window.__smartWaits) {
+    var state = window.__smartWaits = {pending: 0, lastMutation: Date.now()};
+    var done = function () { state.pending = Math.max(state.pending - 1, 0); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    new MutationObserver(function () { state.lastMutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+"""
+
+_PAGE_STATE = """
+var state = window.__smartWaits || {pending: 0, lastMutation: 0};
+return {
+    readyState: document.readyState,
+    pending: state.pending + (window.jQuery && window.jQuery.active ? window.jQuery.active : 0),
+    quietMs: Date.now() - state.lastMutation,
+    instrumented: !!window.__smartWaits
+};
+"""
+
+
+def _selenium():
+    return BuiltIn().get_library_instance("SeleniumLibrary")
+
+
+# resolve_timeout() and poll_until() are helpers (not keywords) shared with the other wait/check libraries
+def resolve_timeout(timeout):
+    """Seconds for a Robot time string; None means SeleniumLibrary's configured timeout."""
+    return timestr_to_secs(timeout) if timeout else _selenium().timeout
+
+
+def poll_until(condition, timeout, describe):
+    """
+    Call condition() with adaptive polling until it returns a truthy value, then return it.
+    Raises AssertionError with describe(last value) when the timeout expires.
+    """
+    deadline = time.monotonic() + timeout
+    interval = MIN_POLL
+    while True:
+        value = condition()
+        if value:
+            return value
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise AssertionError(describe(value))
+        time.sleep(min(interval, remaining))
+        interval = min(interval * POLL_BACKOFF, MAX_POLL)
+
+
+@keyword("Wait For Page Stable")
+def wait_for_page_stable(timeout=None, quiet_period="300ms"):
+    """
+    Waits until the page is loaded, has no pending XHR/fetch requests and its DOM has not changed
+    for ``quiet_period``. Fails after ``timeout`` (default: SeleniumLibrary's timeout).
+
+    Returns the number of seconds waited.
+    """
+    driver = _selenium().driver
+    quiet_ms = timestr_to_secs(quiet_period) * 1000
+    started = time.monotonic()
+    last = {}
+
+    def stable():
+        # Navigation replaces window, so instrument again whenever the marker is missing
+        state = driver.execute_script(_PAGE_STATE)
+        if not state["instrumented"] and state["readyState"] != "loading":
+            driver.execute_script(_INSTRUMENT_PAGE)
+            state = driver.execute_script(_PAGE_STATE)
+        last.update(state)
+        return state["readyState"] == "complete" and not state["pending"] and state["quietMs"] >= quiet_ms
+
+    timeout = resolve_timeout(timeout)
+    poll_until(stable, timeout, lambda _: (
+        f"Page not stable after {secs_to_timestr(timeout)}: readyState={last.get('readyState')}, "
+        f"pending requests={last.get('pending')}, last DOM change {last.get('quietMs')} ms ago"))
+
+    waited = round(time.monotonic() - started, 3)
+    BuiltIn().log(f"Page stable after {waited}s")
+    return waited
+
+
+@keyword("Wait For Any Of Elements")
+def wait_for_any_of_elements(*locators, timeout=None, visible=True):
+    """
+    Waits until any of ``locators`` matches a visible element (or, with ``visible=False``, any element)
+    and returns the first locator that matched, so the caller can branch on the outcome.
+    """
+    if not locators:
+        raise ValueError("At least one locator is required.")
+    selenium = _selenium()
+    require_visible = BuiltIn().convert_to_boolean(visible)
+
+    def first_match():
+        for locator in locators:
+            for element in selenium.find_elements(locator):
+                try:
+                    if not require_visible or element.is_displayed():
+                        return locator
+                except StaleElementReferenceException:
+                    continue  # Re-rendered between lookup and check; the next poll finds the new node
+        return None
+
+    timeout = resolve_timeout(timeout)
+    return poll_until(first_match, timeout, lambda _: (
+        f"None of {len(locators)} locator(s) {'visible' if require_visible else 'present'} "
+        f"after {secs_to_timestr(timeout)}: {', '.join(map(str, locators))}"))
@@ -0,0 +1,244 @@
+# utils/suite_scheduler.py
+"""
+Duration-aware ordering for pabot.
+
+Reads previous Robot Framework output.xml files, keeps a rolling per-suite / per-test duration
+history and writes a pabot --ordering file that schedules the longest suites first
+(longest-processing-time-first), so the heavy suites start immediately instead of landing last
+on an otherwise idle worker.
+
+Usage:
+    # 1. After a run: add its timings to the history
+    python utils/suite_scheduler.py record test_results/output.xml
+
+    # 2. Before a run: write the ordering (optionally splitting suites longer than N seconds into tests)
+    python utils/suite_scheduler.py order --processes 22 [--split-over 300]
+    pabot --processes 22 --ordering runners/pabot_ordering.txt [--testlevelsplit] ...
+"""
+import os
+import sys
+import json
+import heapq
+import argparse
+import statistics
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+BASE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+HISTORY_FILE = os.path.join(BASE_DIR, '.cache', 'duration_history.json')
+ORDERING_FILE = os.path.join(BASE_DIR, 'runners', 'pabot_ordering.txt')
+TEST_LIST_FILE = os.path.join(BASE_DIR, 'runners', 'test_list.txt')
+
+# Durations kept per suite/test; the estimate is their median
+HISTORY_SIZE = 5
+
+
+# ================================
+# output.xml Parsing
+# ================================
+def _elapsed_seconds(status):
+    """Elapsed time of a <status> element (RF 7 'elapsed' or RF <= 6 'starttime'/'endtime')."""
+    if status is None:
+        return None
+    if status.get("elapsed") is not None:
+        return float(status.get("elapsed"))
+    start, end = status.get("starttime"), status.get("endtime")
+    if not start or not end or "N/A" in (start, end):
+        return None
+    fmt = "%Y%m%d %H:%M:%S.%f"
+    return (datetime.strptime(end, fmt) - datetime.strptime(start, fmt)).total_seconds()
+
+
+def parse_durations(output_xml):
+    """
+    Stream an output.xml and return the durations of its suite files and tests.
+
+    Elements are cleared as soon as they are processed, so memory stays flat for large runs.
+
+    Returns:
+        dict: {"suites": {long_name: {"seconds", "source", "tests": [test long names]}},
+               "tests": {long_name: seconds}}
+    """
+    suites, tests = {}, {}
+    suite_stack = []  # [long_name, source, [test names]] per open <suite>
+    test_name = None
+
+    for event, element in ET.iterparse(output_xml, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == "suite":
+                parent = suite_stack[-1][0] + "." if suite_stack else ""
+                suite_stack.append([parent + element.get("name", ""), element.get("source", ""), []])
+            elif tag == "test" and suite_stack:
+                test_name = f"{suite_stack[-1][0]}.{element.get('name', '')}"
+            continue
+
+        if tag == "test" and test_name:
+            seconds = _elapsed_seconds(element.find("status"))
+            if seconds is not None:
+                tests[test_name] = seconds
+                suite_stack[-1][2].append(test_name)
+            test_name = None
+            element.clear()
+        elif tag == "suite" and suite_stack:
+            long_name, source, suite_tests = suite_stack.pop()
+            # Only suite files are scheduled; directory suites are just containers
+            if suite_tests:
+                seconds = _elapsed_seconds(element.find("status"))
+                suites[long_name] = {
+                    "seconds": seconds if seconds is not None else sum(tests[name] for name in suite_tests),
+                    "source": source,
+                    "tests": suite_tests,
+                }
+            element.clear()
+
+    return {"suites": suites, "tests": tests}
+
+
+# ================================
+# Duration History
+# ================================
+class DurationHistory:
+    """Rolling duration history per suite and test, persisted as JSON."""
+
+    def __init__(self, path=HISTORY_FILE, history_size=HISTORY_SIZE):
+        self.path = path
+        self.history_size = history_size
+        self.data = {"suites": {}, "tests": {}, "recorded_outputs": {}}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.data.update(json.load(file))
+
+    def record(self, output_xml):
+        """Add the timings of one output.xml; the same unchanged file is only counted once."""
+        stat = os.stat(output_xml)
+        key = os.path.abspath(output_xml)
+        signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if self.data["recorded_outputs"].get(key) == signature:
+            print(f"Already recorded: {output_xml}")
+            return 0
+
+        parsed = parse_durations(output_xml)
+        for name, suite in parsed["suites"].items():
+            entry = self.data["suites"].setdefault(name, {"durations": [], "source": "", "tests": []})
+            entry["durations"] = (entry["durations"] + [round(suite["seconds"], 3)])[-self.history_size:]
+            entry["source"] = suite["source"]
+            entry["tests"] = suite["tests"]
+        for name, seconds in parsed["tests"].items():
+            durations = self.data["tests"].setdefault(name, [])
+            durations.append(round(seconds, 3))
+            del durations[:-self.history_size]
+
+        self.data["recorded_outputs"][key] = signature
+        print(f"Recorded {len(parsed['suites'])} suites / {len(parsed['tests'])} tests from {output_xml}")
+        return len(parsed["tests"])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.data, file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def suite_estimate(self, name):
+        durations = self.data["suites"].get(name, {}).get("durations")
+        return statistics.median(durations) if durations else None
+
+    def test_estimate(self, name):
+        durations = self.data["tests"].get(name)
+        return statistics.median(durations) if durations else None
+
+
+# ================================
+# Scheduling
+# ================================
+def _makespan(durations, processes):
+    """Wall-clock time when items are handed, in order, to the first free of `processes` workers."""
+    workers = [0.0] * max(int(processes), 1)
+    for seconds in durations:
+        heapq.heappush(workers, heapq.heappop(workers) + seconds)
+    return max(workers)
+
+
+def _static_order(history):
+    """Suite names in runners/test_list.txt order (the current static schedule)."""
+    if not os.path.exists(TEST_LIST_FILE):
+        return list(history.data["suites"])
+    with open(TEST_LIST_FILE, "r", encoding="utf-8") as file:
+        paths = [line.strip().replace("\\", "/") for line in file if line.strip() and not line.startswith("#")]
+    by_source = {suite["source"].replace("\\", "/"): name for name, suite in history.data["suites"].items()}
+    ordered = []
+    for path in paths:
+        ordered += [name for source, name in by_source.items() if source.endswith(path) and name not in ordered]
+    return ordered + [name for name in history.data["suites"] if name not in ordered]
+
+
+def build_ordering(history, split_over=None):
+    """
+    Longest-first schedule of (kind, name, estimated seconds) items.
+
+    Suites estimated above `split_over` seconds are replaced by their individual tests,
+    which pabot can spread over several workers when run with --testlevelsplit.
+    """
+    items = []
+    for name, suite in history.data["suites"].items():
+        estimate = history.suite_estimate(name)
+        if estimate is None:
+            continue
+        test_estimates = [(test, history.test_estimate(test)) for test in suite.get("tests", [])]
+        if split_over and estimate > split_over and len(test_estimates) > 1 \
+                and all(seconds is not None for _, seconds in test_estimates):
+            items += [("test", test, seconds) for test, seconds in test_estimates]
+        else:
+            items.append(("suite", name, estimate))
+    return sorted(items, key=lambda item: item[2], reverse=True)
+
+
+def write_ordering(items, path=ORDERING_FILE):
+    with open(path, "w", encoding="utf-8") as file:
+        for kind, name, _ in items:
+            file.write(f"--{kind} {name}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Duration-aware pabot ordering from output.xml history.")
+    parser.add_argument("--history", default=HISTORY_FILE, help="Duration history JSON file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Add output.xml timings to the history")
+    record.add_argument("outputs", nargs="+", help="output.xml files")
+
+    order = commands.add_parser("order", help="Write a longest-first pabot ordering file")
+    order.add_argument("--processes", type=int, default=22, help="pabot --processes, for the estimate")
+    order.add_argument("--split-over", type=float, metavar="SECONDS",
+                       help="Split suites longer than this into tests (run pabot with --testlevelsplit)")
+    order.add_argument("--output", default=ORDERING_FILE, help="Ordering file to write")
+
+    options = parser.parse_args(argv)
+    history = DurationHistory(options.history)
+
+    if options.command == "record":
+        for output_xml in options.outputs:
+            if os.path.exists(output_xml) and os.path.getsize(output_xml):
+                history.record(output_xml)
+            else:
+                print(f"[WARNING] Skipping missing or empty output: {output_xml}")
+        history.save()
+        return 0
+
+    items = build_ordering(history, options.split_over)
+    write_ordering(items, options.output)
+    if not items:
+        print("No duration history yet; wrote an empty ordering (pabot keeps its default order).")
+        return 0
+
+    static = [history.suite_estimate(name) for name in _static_order(history)]
+    print(f"Wrote {len(items)} items to {options.output}")
+    print(f"Estimated wall clock with {options.processes} processes: "
+          f"static order {_makespan([s for s in static if s], options.processes):.1f}s, "
+          f"longest-first {_makespan([item[2] for item in items], options.processes):.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())